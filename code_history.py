@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Per-lesson submission history.
+
+progress["user_code"] only holds the latest submission per lesson. This store
+keeps every submission, one file per lesson under <user data>/code_history/,
+so nothing is read at startup: a lesson's file is loaded the first time its
+history is asked for.
+
+Each file is a sequence of records:
+    kind (1 byte: K = keyframe, D = delta) | length (uint32 LE) | zlib payload
+
+A keyframe is the full text; a delta is a JSON op list against the previous
+version's lines: [n] copies n lines, ["text", ...] inserts lines, [-n] skips
+n old lines. Every KEYFRAME_EVERY-th record is a keyframe. A file may hold up
+to MAX_VERSIONS + KEYFRAME_EVERY versions; past that, whole keyframe segments
+are cut from its head (raw bytes, no re-encoding), so retention costs one
+rewrite per KEYFRAME_EVERY submissions instead of one per submission.
+
+Writes (compression, diffing, file I/O) run on a background thread: record()
+and clear() only queue work. Readers wait for queued writes first.
+"""
+import os
+import json
+import zlib
+import struct
+import difflib
+import logging
+import threading
+
+import config
+import progress_store
+
+_RECORD = struct.Struct('<cI')
+KEYFRAME = b'K'
+DELTA = b'D'
+
+
+def make_delta(old_lines, new_lines):
+    """Line-level edit script turning old_lines into new_lines."""
+    ops = []
+    matcher = difflib.SequenceMatcher(a=old_lines, b=new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append(i2 - i1)
+            continue
+        if i2 > i1:
+            ops.append(-(i2 - i1))
+        if j2 > j1:
+            ops.append(new_lines[j1:j2])
+    return ops
+
+
+def apply_delta(old_lines, ops):
+    new_lines = []
+    pos = 0
+    for op in ops:
+        if isinstance(op, list):
+            new_lines.extend(op)
+        elif op >= 0:
+            new_lines.extend(old_lines[pos:pos + op])
+            pos += op
+        else:
+            pos -= op
+    return new_lines
+
+
+class CodeHistory:
+    """Lazily loaded, delta-compressed submission history for all lessons."""
+    
+    def __init__(self, root_dir, max_versions=None, keyframe_every=None):
+        self.root_dir = root_dir
+        self.max_versions = max_versions or config.CodeHistory.MAX_VERSIONS_PER_LESSON
+        self.keyframe_every = keyframe_every or config.CodeHistory.KEYFRAME_EVERY
+        self._cache = {} # lesson uuid -> versions in the file (oldest first)
+        self._torn = {} # lesson uuid -> end of the last good record, if garbage follows it
+        self._lock = threading.Lock() # Guards _cache and the files
+        
+        # Write queue, drained by a worker thread started on first use
+        self._cond = threading.Condition()
+        self._jobs = []
+        self._submitted = 0
+        self._done = 0
+        self._closing = False
+        self._thread = None
+        progress_store.register_writer(self)
+    
+    def _path(self, lesson_uuid):
+        # UUIDs are filename-safe; anything else is neutralised
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(lesson_uuid))
+        return os.path.join(self.root_dir, f"{safe}.hist")
+    
+    # --- Reading ---
+    
+    def _read_file(self, path):
+        """Returns (versions, end of the last good record, file size)."""
+        versions = []
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return versions, 0, 0
+        
+        pos = 0
+        lines = []
+        while pos + _RECORD.size <= len(data):
+            kind, length = _RECORD.unpack_from(data, pos)
+            payload = data[pos + _RECORD.size:pos + _RECORD.size + length]
+            if len(payload) < length:
+                break # Torn tail
+            try:
+                raw = zlib.decompress(payload).decode('utf-8')
+                if kind == KEYFRAME:
+                    lines = raw.split('\n')
+                elif kind == DELTA and versions:
+                    lines = apply_delta(lines, json.loads(raw))
+                else:
+                    break
+            except (zlib.error, ValueError, UnicodeDecodeError):
+                logging.warning(f"Corrupt code history record in {path}")
+                break
+            versions.append('\n'.join(lines))
+            pos += _RECORD.size + length
+        return versions, pos, len(data)
+    
+    def _load(self, lesson_uuid):
+        versions = self._cache.get(lesson_uuid)
+        if versions is None:
+            versions, good_offset, size = self._read_file(self._path(lesson_uuid))
+            if good_offset < size:
+                self._torn[lesson_uuid] = good_offset
+            self._cache[lesson_uuid] = versions
+        return versions
+    
+    def versions(self, lesson_uuid):
+        """The latest max_versions submissions for a lesson, oldest first (loaded on first use)."""
+        self.flush()
+        with self._lock:
+            return self._load(lesson_uuid)[-self.max_versions:]
+    
+    def previous(self, lesson_uuid, depth=1):
+        """The depth-th most recent submission (1 = latest), or None."""
+        versions = self.versions(lesson_uuid)
+        if 1 <= depth <= len(versions):
+            return versions[-depth]
+        return None
+    
+    # --- Writing ---
+    
+    @staticmethod
+    def _encode(kind, text):
+        payload = zlib.compress(text.encode('utf-8'), 9)
+        return _RECORD.pack(kind, len(payload)) + payload
+    
+    def _encode_version(self, versions, i):
+        """Record bytes for versions[i] within a file that starts at versions[0]."""
+        if i % self.keyframe_every == 0:
+            return self._encode(KEYFRAME, versions[i])
+        ops = make_delta(versions[i - 1].split('\n'), versions[i].split('\n'))
+        return self._encode(DELTA, json.dumps(ops, ensure_ascii=False, separators=(',', ':')))
+    
+    def record(self, lesson_uuid, code):
+        """Queues a submission (dropped if identical to the latest one)."""
+        self._submit((self._append, lesson_uuid, code))
+    
+    def clear(self):
+        """Queues deletion of all history (progress reset)."""
+        self._submit((self._clear,))
+    
+    def _append(self, lesson_uuid, code):
+        versions = self._load(lesson_uuid)
+        if versions and versions[-1] == code:
+            return
+        versions.append(code)
+        
+        path = self._path(lesson_uuid)
+        try:
+            os.makedirs(self.root_dir, exist_ok=True)
+            good_offset = self._torn.pop(lesson_uuid, None)
+            if good_offset is not None:
+                # Drop a torn/corrupt tail so new records are not appended after it
+                logging.warning(f"Code history {path} truncated at byte {good_offset}")
+                with open(path, 'r+b') as f:
+                    f.truncate(good_offset)
+            with open(path, 'ab') as f:
+                f.write(self._encode_version(versions, len(versions) - 1))
+            if len(versions) > self.max_versions + self.keyframe_every:
+                self._trim(path, versions)
+        except OSError as e:
+            logging.error(f"Failed to write code history for {lesson_uuid}: {e}")
+    
+    def _trim(self, path, versions):
+        """Cuts whole keyframe segments from the head of the file, keeping >= max_versions."""
+        drop = (len(versions) - self.max_versions) // self.keyframe_every * self.keyframe_every
+        with open(path, 'rb') as f:
+            data = f.read()
+        pos = 0
+        for _ in range(drop):
+            _, length = _RECORD.unpack_from(data, pos)
+            pos += _RECORD.size + length
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data[pos:]) # Starts at a keyframe: drop is a multiple of keyframe_every
+        os.replace(tmp_path, path)
+        del versions[:drop]
+    
+    def _clear(self):
+        self._cache.clear()
+        self._torn.clear()
+        try:
+            names = os.listdir(self.root_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith('.hist'):
+                try:
+                    os.remove(os.path.join(self.root_dir, name))
+                except OSError: pass
+    
+    # --- Background writer ---
+    
+    def _submit(self, job):
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("CodeHistory is closed")
+            self._jobs.append(job)
+            self._submitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="CodeHistoryWriter", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._jobs or self._closing)
+                if not self._jobs:
+                    return # Closing and drained
+                jobs, self._jobs = self._jobs, []
+            
+            for func, *args in jobs:
+                try:
+                    with self._lock:
+                        func(*args)
+                except Exception as e:
+                    logging.error(f"Code history writer failed: {e}")
+            
+            with self._cond:
+                self._done += len(jobs)
+                self._cond.notify_all()
+    
+    def flush(self, timeout=None):
+        """Waits until every queued write is done. Returns False on timeout."""
+        with self._cond:
+            target = self._submitted
+            if self._done >= target:
+                return True
+            if self._thread is None or not self._thread.is_alive():
+                return False
+            return self._cond.wait_for(lambda: self._done >= target, timeout=timeout)
+    
+    def close(self, timeout=None):
+        """Finishes queued writes and stops the worker."""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
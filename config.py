@@ -88,6 +88,8 @@ class System:
     FILENAME_CURRICULUM = 'curriculum.json'
     FILENAME_PROGRESS = 'progress.json'
     FILENAME_PROGRESS_BACKUP = 'progress.backup.json'
+    FILENAME_PROGRESS_JOURNAL = 'progress.journal'
+    FILENAME_PROGRESS_DB = 'progress.db'
     FILENAME_DEV_MESSAGE = 'dev_message.txt'
     
     # Python Installer Configuration
@@ -102,6 +104,37 @@ class System:
     
     PKG_WINDOWS_CURSES = "windows-curses"
 
+class Progress:
+    """Progress storage backend selection."""
+    # 'json' (progress.json + journal, default) or 'sqlite' (shared multi-learner hosts)
+    BACKEND = os.environ.get('OCAGI_PROGRESS_BACKEND', 'json').lower()
+    DB_PATH = os.environ.get('OCAGI_PROGRESS_DB')  # Default: <user data dir>/progress.db
+    USER_ID = os.environ.get('OCAGI_PROGRESS_USER')  # Default: OS login name
+    BUSY_TIMEOUT_MS = 5000
+
+class CodeHistory:
+    """Per-lesson submission history (code_history.py)."""
+    DIRNAME = 'code_history'  # Inside the user data dir
+    MAX_VERSIONS_PER_LESSON = int(os.environ.get('OCAGI_CODE_HISTORY_MAX', '50'))
+    KEYFRAME_EVERY = 10  # Full copy every N submissions bounds delta replay
+
+class Server:
+    """Grading HTTP service (server.py, `main.py --serve`)."""
+    HOST = os.environ.get('OCAGI_SERVER_HOST', '127.0.0.1')
+    PORT = int(os.environ.get('OCAGI_SERVER_PORT', '8765'))
+    WORKERS = int(os.environ.get('OCAGI_SERVER_WORKERS', '0'))  # 0 -> CPU count
+    QUEUE_SIZE = int(os.environ.get('OCAGI_SERVER_QUEUE', '64'))  # Full queue -> 429
+    MAX_BODY_BYTES = 64 * 1024
+    LATENCY_WINDOW = 1024  # Recent submissions kept for /metrics percentiles
+    READ_TIMEOUT_SEC = 10.0
+
+class Scheduler:
+    """Fair sharing of sandbox workers between learners (sandbox/scheduler.py)."""
+    PER_LEARNER_CONCURRENCY = 1  # Sandbox workers one learner may hold at once
+    MAX_PENDING_PER_LEARNER = 4  # Further submissions are refused immediately
+    COOLDOWN_AFTER_LIMIT_HITS = 3  # Consecutive timeouts/limit errors...
+    COOLDOWN_SEC = 10.0  # ...park the learner's queue for this long
+
 class Layout:
     """Screen dimensions and layout constants."""
     MIN_WIDTH = 60
@@ -118,6 +151,14 @@ class Layout:
     
     # Scroll/Text wrap limits
     BOTTOM_MARGIN = 5 
+    # Columns the code view jumps ahead when the cursor reaches its edge
+    HSCROLL_STEP = 8
+    
+    # Highlighted line runs kept in memory before the cache is dropped
+    HIGHLIGHT_CACHE_SIZE = 2048
+    # OCAGI_REGEX_TOKENIZER=1 -> highlight with RegexTokenizer (see tools/bench_tokenizer.py);
+    # the reference Tokenizer is the default
+    REGEX_TOKENIZER = os.environ.get('OCAGI_REGEX_TOKENIZER') == '1'
 
 class Timing:
     """Timeouts and delays (seconds or ms)."""
@@ -127,6 +168,10 @@ class Timing:
     ACTION_WAIT_SUCCESS = 1.5
     ACTION_WAIT_DEFAULT = 2.0
     EXECUTION_TIMEOUT = 5.0
+    PROGRESS_FSYNC_INTERVAL_SEC = 0.5  # Journal fsync batching window
+    PROGRESS_DEBOUNCE_SEC = 0.2  # Background writer coalescing window
+    RESIZE_SETTLE_SEC = 0.05  # Redraw once a burst of resize events has settled
+    RESIZE_POLL_SEC = 0.25  # Select-based input without a SIGWINCH handler: KEY_RESIZE poll interval
     
     # Milliseconds
     ESCDELAY_ENV = '25'
@@ -168,6 +213,17 @@ class UI:
     LABEL_HINT = "💡 İPUCU:"
     LABEL_HINT_SHORT = "İPUCU"
     
+    # Lesson Search Palette
+    SEARCH_PROMPT = "🔎 Ders Ara: "
+    SEARCH_NO_RESULTS = "Sonuç bulunamadı."
+    SEARCH_FOOTER = "↑↓ Seç · Enter Git · ESC Kapat"
+    MSG_LESSON_LOCKED = "Bu göreve geçmek için önce önceki görevi tamamlayın veya atlayın."
+    MSG_LESSON_RELOADED = "♻️ Ders dosyaları yeniden yüklendi."
+    MSG_RECALL_LOADED = "⏪ Önceki deneme yüklendi ({depth}. en son gönderim). Tekrar F2: daha eski."
+    MSG_RECALL_NONE = "Bu görev için daha eski bir deneme yok."
+    MSG_NOTHING_TO_UNDO = "Geri alınacak değişiklik yok."
+    MSG_NOTHING_TO_REDO = "Yinelenecek değişiklik yok."
+    
     # Badges
     BADGE_SUCCESS = " - BAŞARILDI"
     BADGE_SKIPPED = " - ATLANDI"
@@ -216,4 +272,31 @@ class Keys:
     BACKSPACE_2 = 127
     DELETE = 330
     CTRL_C = 3
+    CTRL_P = 16
     CTRL_R = 18
+    # Undo / redo. Ctrl+Z and Ctrl+Y can be taken by the tty as job-control
+    # keys on POSIX, so Ctrl+U and Ctrl+G do the same.
+    CTRL_Z = 26
+    CTRL_U = 21
+    CTRL_Y = 25
+    CTRL_G = 7
+
+class Input:
+    """Input driver tuning."""
+    # Ask the terminal to wrap pastes in ESC[200~ ... ESC[201~ (POSIX ttys)
+    BRACKETED_PASTE = True
+    PASTE_MODE_ON = '\x1b[?2004h'
+    PASTE_MODE_OFF = '\x1b[?2004l'
+    # Without bracketed paste: this many printable keys already queued at
+    # once is taken as a paste (no one types faster than a redraw)
+    PASTE_BURST_MIN = 16
+    PASTE_READ_TIMEOUT = 100  # ms; rest of a bracketed paste still arriving
+
+class Dev:
+    """Lesson authoring helpers (off for learners)."""
+    # OCAGI_HOT_RELOAD=1 -> edited lesson files are picked up while the editor is open
+    HOT_RELOAD = os.environ.get('OCAGI_HOT_RELOAD') == '1'
+    # OCAGI_CHECK_PACK=1 -> curriculum.pack is ignored if curriculum/ no longer matches it
+    # (reads every lesson file on start; learners' installs trust the pack)
+    CHECK_PACK = os.environ.get('OCAGI_CHECK_PACK') == '1'
+    RELOAD_POLL_SEC = 1.0
@@ -3,10 +3,11 @@ import sys
 import curses
 import engine
 import config
+import progress_store
 from ui.editor import run_editor_session
 from ui.utils import OSUtils, suspend_curses
 
-def handle_action(stdscr, action):
+def handle_action(stdscr, action, simulation=None):
     """Executes non-render actions (Messages, Custom Views, Exit)."""
     if not action:
         return
@@ -55,6 +56,11 @@ def handle_action(stdscr, action):
                      show_developer_message(stdscr)
                  except Exception:
                      pass
+        elif action.view_name == "lesson_search" and simulation is not None:
+            from ui.search_palette import show_lesson_search
+            lesson_uuid = show_lesson_search(stdscr, simulation.get_search_index())
+            if lesson_uuid:
+                handle_action(stdscr, simulation.process_input(f"GOTO_LESSON:{lesson_uuid}"), simulation)
 
     elif isinstance(action, engine.ActionExit):
         raise KeyboardInterrupt
@@ -81,40 +87,46 @@ def run_loop(stdscr):
     
     simulation = engine.SimulationEngine()
     
-    while True:
-        # Determine what to show on main UI
-        action = simulation.get_next_action()
+    try:
+        while True:
+            # Determine what to show on main UI
+            action = simulation.get_next_action()
         
-        if isinstance(action, engine.ActionExit):
-            raise KeyboardInterrupt
+            if isinstance(action, engine.ActionExit):
+                raise KeyboardInterrupt
             
-        elif isinstance(action, engine.ActionRenderEditor):
-             user_code = run_editor_session(
-                stdscr,
-                task_info=action.task_info,
-                hint_text=action.hint_text,
-                initial_code=action.initial_code,
-                task_status=action.task_status,
-                completed_count=action.completed_count,
-                skipped_count=action.skipped_count
-             )
-             # Process input (Code or Command)
-             result_action = simulation.process_input(user_code)
-             handle_action(stdscr, result_action)
+            elif isinstance(action, engine.ActionRenderEditor):
+                 user_code = run_editor_session(
+                    stdscr,
+                    task_info=action.task_info,
+                    hint_text=action.hint_text,
+                    initial_code=action.initial_code,
+                    task_status=action.task_status,
+                    completed_count=action.completed_count,
+                    skipped_count=action.skipped_count,
+                    reload_check=simulation.check_curriculum_reload if config.Dev.HOT_RELOAD else None,
+                    history_recall=simulation.get_previous_attempt
+                 )
+                 # Process input (Code or Command)
+                 result_action = simulation.process_input(user_code)
+                 handle_action(stdscr, result_action, simulation)
 
-        elif isinstance(action, engine.ActionRenderCelebration):
-             user_code = run_editor_session(
-                stdscr,
-                task_info="",
-                hint_text="",
-                initial_code="",
-                task_status="celebration",
-                completed_count=action.completed_count,
-                skipped_count=action.skipped_count,
-                has_skipped=action.has_skipped
-             )
-             result_action = simulation.process_input(user_code)
-             handle_action(stdscr, result_action)
+            elif isinstance(action, engine.ActionRenderCelebration):
+                 user_code = run_editor_session(
+                    stdscr,
+                    task_info="",
+                    hint_text="",
+                    initial_code="",
+                    task_status="celebration",
+                    completed_count=action.completed_count,
+                    skipped_count=action.skipped_count,
+                    has_skipped=action.has_skipped
+                 )
+                 result_action = simulation.process_input(user_code)
+                 handle_action(stdscr, result_action, simulation)
+    finally:
+        # Compact the progress journal into a snapshot
+        simulation.close()
 
 def check_exit_key():
     import os, sys
@@ -163,7 +175,8 @@ def run_controller():
         input(f"\n{config.UI.PROMPT_EXIT}")
         sys.exit(1)
     except KeyboardInterrupt:
-        # Ctrl+C Clean exit
+        # Ctrl+C Clean exit: persist queued progress before the countdown
+        progress_store.flush_all()
         OSUtils.clear_screen()
         
         # ANSI Renk Kodları
@@ -3,11 +3,15 @@ import os
 import json
 import importlib.util
 import logging
+import copy
+import marshal
+import threading
+import types
 import config
 
 # Data classes for structured access
 class Lesson:
-    def __init__(self, data, path, numeric_id):
+    def __init__(self, data, path, numeric_id, pack=None, pack_record=None):
         self.slug = data.get('id') # String ID (e.g. 'basics_vars')
         self.uuid = data.get('uuid') # Stable UUID
         self.numeric_id = numeric_id # Integer ID for UI order
@@ -18,11 +22,15 @@ class Lesson:
         self.xp = data.get('xp', 10)
         self.tags = data.get('tags', [])
         
+        # Position in the ordered curriculum (set by CurriculumManager.load)
+        self.index = None # 0-based ordinal in CurriculumManager.lessons
+        self.chapter_slug = None
+        
         # Validation Logic
         self.test_cases = data.get('test_cases', []) # For I/O validation
         self.type = data.get('type', 'code') # code, quiz, etc.
         
-        # file system paths
+        # file system paths (virtual when loaded from a curriculum pack)
         self.dir_path = os.path.dirname(path)
         self.task_file = path
         
@@ -30,93 +38,397 @@ class Lesson:
         self.validator_script = os.path.join(self.dir_path, 'validation.py')
         self.solution_script = os.path.join(self.dir_path, 'solution.py')
         
-        # Custom Solution
-        self.solution_code = "" 
-        if os.path.exists(self.solution_script):
-             try:
-                 with open(self.solution_script, 'r', encoding='utf-8') as f:
-                     self.solution_code = f.read()
-             except OSError: pass
+        # Packed lessons read their scripts from the mmap'd archive on demand
+        self._pack = pack
+        self._pack_record = pack_record
+        self._solution_code = None # Loaded lazily by the solution_code property
+        
+    @property
+    def is_packed(self):
+        return self._pack is not None
+    
+    @property
+    def solution_code(self):
+        """Custom solution source ("" if the lesson has none), read on first access."""
+        if self._solution_code is None:
+            code = None
+            if self._pack is not None:
+                code = self._pack.read_text(self._pack_record.get('solution'))
+            elif os.path.exists(self.solution_script):
+                try:
+                    with open(self.solution_script, 'r', encoding='utf-8') as f:
+                        code = f.read()
+                except OSError: pass
+            self._solution_code = code or ""
+        return self._solution_code
              
     def has_custom_validator(self):
+        if self._pack is not None:
+            return self._pack_record.get('validator_code') is not None
         return os.path.exists(self.validator_script)
+    
+    def get_validator_code(self):
+        """Marshalled validator code for packed lessons (None for directory lessons)."""
+        if self._pack is None:
+            return None
+        return self._pack.validator_code(self._pack_record, self.validator_script)
 
-class CurriculumManager:
-    def __init__(self, root_dir):
-        self.root_dir = root_dir
+class Chapter:
+    """A manifest chapter and its precomputed [start, end) range in CurriculumManager.lessons."""
+    def __init__(self, slug, title, start, end):
+        self.slug = slug
+        self.title = title
+        self.start = start # Index of the first lesson
+        self.end = end # One past the last lesson
+        self.lessons = ()
+        
+    def __len__(self):
+        return self.end - self.start
+        
+    def __contains__(self, lesson):
+        return lesson.index is not None and self.start <= lesson.index < self.end
+
+class CurriculumSnapshot:
+    """
+    One consistent, fully built view of the curriculum.
+    
+    load()/reload_changed() build a new snapshot off to the side and swap it in
+    with a single reference assignment, so readers never see half-updated maps.
+    """
+    __slots__ = ('lessons', 'lesson_map', 'id_map', 'uuid_map', 'chapters', 'chapter_map',
+                 'tag_index', 'category_index', 'type_index')
+    
+    def __init__(self):
         self.lessons = [] # Ordered list of Lesson objects
         self.lesson_map = {} # slug -> Lesson
         self.id_map = {} # numeric_id -> Lesson
+        self.uuid_map = {} # uuid -> Lesson
+        self.chapters = [] # Ordered list of Chapter objects
+        self.chapter_map = {} # chapter slug -> Chapter
+        self.tag_index = {} # tag -> tuple of Lessons
+        self.category_index = {} # category -> tuple of Lessons
+        self.type_index = {} # lesson type -> tuple of Lessons
+
+    def add_lesson(self, lesson):
+        lesson.index = len(self.lessons)
+        lesson.numeric_id = lesson.index + 1
+        self.lessons.append(lesson)
+        self.lesson_map[lesson.slug] = lesson
+        self.id_map[lesson.numeric_id] = lesson
+        if lesson.uuid:
+            self.uuid_map[lesson.uuid] = lesson
+
+    def add_chapter(self, slug, title, start):
+        """Registers a chapter covering lessons[start:] (everything added since start)."""
+        chapter = Chapter(slug, title, start, len(self.lessons))
+        chapter.lessons = tuple(self.lessons[start:chapter.end])
+        self.chapters.append(chapter)
+        self.chapter_map[slug] = chapter
+
+    def build_secondary_indexes(self):
+        """Builds inverted indexes (tag/category/type) over the ordered lesson list."""
+        tag_index = {}
+        category_index = {}
+        type_index = {}
+        for lesson in self.lessons:
+            for tag in lesson.tags:
+                tag_index.setdefault(tag, []).append(lesson)
+            category_index.setdefault(lesson.category, []).append(lesson)
+            type_index.setdefault(lesson.type, []).append(lesson)
+        
+        # Tuples: callers get the stored view directly, without a copy
+        self.tag_index = {k: tuple(v) for k, v in tag_index.items()}
+        self.category_index = {k: tuple(v) for k, v in category_index.items()}
+        self.type_index = {k: tuple(v) for k, v in type_index.items()}
+
+
+LESSON_FILES = ('task.json', 'validation.py', 'solution.py')
+
+
+def _file_signature(lesson_dir):
+    """(mtime_ns, size) of each lesson file, None for missing files."""
+    sig = []
+    for name in LESSON_FILES:
+        try:
+            st = os.stat(os.path.join(lesson_dir, name))
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+class CurriculumManager:
+    def __init__(self, root_dir, pack_path=None, use_pack=True, check_pack=None):
+        self.root_dir = root_dir
         self.manifest = {}
         
+        # Packed archive (tools/pack_curriculum.py), defaults to <root_dir>.pack.
+        # use_pack=False always reads the directory (authoring tools, solvability checks).
+        self.pack_path = pack_path or os.path.normpath(root_dir) + '.pack'
+        self.use_pack = use_pack
+        # Compare the pack with the files next to it (authoring); default config.Dev.CHECK_PACK
+        self.check_pack = config.Dev.CHECK_PACK if check_pack is None else check_pack
+        self.pack = None # CurriculumPack while lessons are served from the archive
+        self._snapshot = CurriculumSnapshot()
+        self._search_index = None # Built lazily by get_search_index()
+        
+        # Hot-reload bookkeeping (lesson dir -> file signature, chapter dir -> mtime)
+        self._manifest_mtime = None
+        self._lesson_signatures = {}
+        self._chapter_mtimes = {}
+        self._lock = threading.Lock()
+        self._frozen = False # Set by freeze(): shared, immutable host-mode instance
+
+    # Read-only views of the current snapshot
+    lessons = property(lambda self: self._snapshot.lessons)
+    lesson_map = property(lambda self: self._snapshot.lesson_map)
+    id_map = property(lambda self: self._snapshot.id_map)
+    uuid_map = property(lambda self: self._snapshot.uuid_map)
+    chapters = property(lambda self: self._snapshot.chapters)
+    chapter_map = property(lambda self: self._snapshot.chapter_map)
+    tag_index = property(lambda self: self._snapshot.tag_index)
+    category_index = property(lambda self: self._snapshot.category_index)
+    type_index = property(lambda self: self._snapshot.type_index)
+        
     def load(self):
-        """Loads the entire curriculum from the file system."""
-        self.lessons = []
-        self.lesson_map = {}
-        self.id_map = {}
-        self.uuid_map = {} # uuid -> Lesson
+        """
+        Loads the entire curriculum.
+        
+        Uses the packed archive when present (and, with check_pack, built from
+        the current files); the directory layout is the fallback (and is always used with
+        hot-reload, which watches the files).
+        """
+        with self._lock:
+            if self._frozen:
+                raise RuntimeError("CurriculumManager is frozen")
+            if self.use_pack and not config.Dev.HOT_RELOAD and os.path.exists(self.pack_path):
+                if self._load_pack():
+                    return
+            self._rebuild(previous={})
+
+    def _load_pack(self):
+        """Builds the snapshot from the pack index. Returns False if the pack is unusable or stale."""
+        from curriculum_pack import CurriculumPack, PackError, source_fingerprint
+        try:
+            pack = CurriculumPack(self.pack_path)
+        except PackError as e:
+            logging.warning(f"Ignoring curriculum pack, falling back to directory: {e}")
+            return False
         
+        # Installed packs are trusted as is: checking them would read every
+        # lesson file on each start, which is what the pack is there to avoid
+        if (self.check_pack and os.path.isdir(self.root_dir)
+                and pack.source_fingerprint != source_fingerprint(self.root_dir)):
+            logging.warning(f"Curriculum pack {self.pack_path} is older than {self.root_dir}, "
+                            "falling back to directory")
+            pack.close()
+            return False
+        
+        self.manifest = pack.manifest
+        manifest_chapters = {c.get('slug'): c for c in self.manifest.get('chapters', [])}
+        snapshot = CurriculumSnapshot()
+        
+        for chapter in pack.chapters:
+            chapter_slug = chapter['slug']
+            meta = manifest_chapters.get(chapter_slug, {})
+            chapter_start = len(snapshot.lessons)
+            
+            for record in chapter['lessons']:
+                task_data = dict(record['task'])
+                # Inject Category if missing
+                if 'category' not in task_data:
+                    task_data['category'] = meta.get('title', 'Genel')
+                task_file = os.path.join(self.root_dir, chapter_slug, record['entry'], 'task.json')
+                lesson = Lesson(task_data, task_file, None, pack=pack, pack_record=record)
+                lesson.chapter_slug = chapter_slug
+                snapshot.add_lesson(lesson)
+            
+            snapshot.add_chapter(chapter_slug, meta.get('title', chapter_slug), chapter_start)
+        
+        snapshot.build_secondary_indexes()
+        
+        old_pack, self.pack = self.pack, pack
+        self._swap(snapshot, {}, {})
+        if old_pack is not None:
+            old_pack.close()
+        return True
+
+    def _read_manifest(self):
         manifest_path = os.path.join(self.root_dir, 'manifest.json')
         if not os.path.exists(manifest_path):
             logging.warning("Manifest not found. Scanning directories blindly.")
             # Fallback scan (not implemented yet for simplicity, we assume manifest exists)
-            return
+            return None
 
         try:
+            self._manifest_mtime = os.stat(manifest_path).st_mtime_ns
             with open(manifest_path, 'r', encoding='utf-8') as f:
-                self.manifest = json.load(f)
+                return json.load(f)
         except Exception as e:
             logging.error(f"Failed to load manifest: {e}")
-            return
+            return None
 
-        # Iterate chapters in order
-        global_id_counter = 1
+    def _rebuild(self, previous):
+        """
+        Builds a new snapshot and swaps it in.
+        
+        Args:
+            previous: lesson_dir -> Lesson of the old snapshot. Lessons whose
+                      file signature is unchanged are reused instead of re-parsed.
+        Returns:
+            set of UUIDs that were added, removed or re-parsed.
+        """
+        manifest = self._read_manifest()
+        snapshot = CurriculumSnapshot()
+        signatures = {}
+        chapter_mtimes = {}
+        changed = set()
         
-        if 'chapters' in self.manifest:
-            for chapter in self.manifest['chapters']:
-                chapter_slug = chapter.get('slug')
-                chapter_path = os.path.join(self.root_dir, chapter_slug)
+        if manifest is None:
+            changed = {l.uuid for l in previous.values() if l.uuid}
+            self._swap(snapshot, signatures, chapter_mtimes)
+            return changed
+        self.manifest = manifest
+
+        # Iterate chapters in order
+        for chapter in self.manifest.get('chapters', []):
+            chapter_slug = chapter.get('slug')
+            chapter_path = os.path.join(self.root_dir, chapter_slug)
+            
+            if not os.path.exists(chapter_path):
+                continue
                 
-                if not os.path.exists(chapter_path):
-                    continue
-                    
-                # Scan for lessons in this chapter
-                # We look for folders that contain task.json
-                # OR we look for a 'lessons' list in meta.json if we want strict ordering
-                # For now, let's assume strict ordering via meta.json is better,
-                # but filesystem sort is easier for dev. 
-                # Let's try to read a local manifest in the chapter or sort folders.
+            # Scan for lessons in this chapter
+            # We look for folders that contain task.json
+            # OR we look for a 'lessons' list in meta.json if we want strict ordering
+            # For now, let's assume strict ordering via meta.json is better,
+            # but filesystem sort is easier for dev. 
+            # Let's try to read a local manifest in the chapter or sort folders.
+            
+            # Sorting folders alphabetically (e.g. 01_lesson, 02_lesson)
+            try:
+                chapter_mtimes[chapter_path] = os.stat(chapter_path).st_mtime_ns
+                entries = sorted(os.listdir(chapter_path))
+            except OSError:
+                continue
+            
+            chapter_start = len(snapshot.lessons)
                 
-                # Sorting folders alphabetically (e.g. 01_lesson, 02_lesson)
-                try:
-                    entries = sorted(os.listdir(chapter_path))
-                except OSError:
+            for entry in entries:
+                lesson_dir = os.path.join(chapter_path, entry)
+                task_file = os.path.join(lesson_dir, 'task.json')
+                
+                if not (os.path.isdir(lesson_dir) and os.path.exists(task_file)):
                     continue
-                    
-                for entry in entries:
-                    lesson_dir = os.path.join(chapter_path, entry)
-                    task_file = os.path.join(lesson_dir, 'task.json')
-                    
-                    if os.path.isdir(lesson_dir) and os.path.exists(task_file):
-                        try:
-                            with open(task_file, 'r', encoding='utf-8') as f:
-                                task_data = json.load(f)
-                            
-                            # Inject Category if missing
-                            if 'category' not in task_data:
-                                task_data['category'] = chapter.get('title', 'Genel')
-                                
-                            lesson = Lesson(task_data, task_file, global_id_counter)
-                            
-                            self.lessons.append(lesson)
-                            self.lesson_map[lesson.slug] = lesson
-                            self.id_map[global_id_counter] = lesson
-                            if lesson.uuid:
-                                self.uuid_map[lesson.uuid] = lesson
-                            
-                            global_id_counter += 1
-                        except Exception as e:
-                            logging.error(f"Error loading lesson {entry}: {e}")
+                
+                signature = _file_signature(lesson_dir)
+                signatures[lesson_dir] = signature
+                old = previous.get(lesson_dir)
+                
+                if old is not None and self._lesson_signatures.get(lesson_dir) == signature:
+                    # Unchanged on disk: reuse as-is. The old snapshot may still be
+                    # read, so a lesson whose position or chapter moved is copied
+                    # instead of being updated in place.
+                    lesson = old
+                    if old.index != len(snapshot.lessons) or old.chapter_slug != chapter_slug:
+                        lesson = copy.copy(old)
+                        lesson.chapter_slug = chapter_slug
+                else:
+                    lesson = self._parse_lesson(chapter, task_file, entry)
+                    if lesson is None:
+                        continue
+                    lesson.chapter_slug = chapter_slug
+                    changed.add(lesson.uuid)
+                    if old is not None:
+                        changed.add(old.uuid)
+                
+                snapshot.add_lesson(lesson)
+            
+            snapshot.add_chapter(chapter_slug, chapter.get('title', chapter_slug), chapter_start)
+        
+        snapshot.build_secondary_indexes()
+        
+        # Removed lessons
+        for lesson_dir, old in previous.items():
+            if lesson_dir not in signatures:
+                changed.add(old.uuid)
+        changed.discard(None)
+        
+        self._swap(snapshot, signatures, chapter_mtimes)
+        return changed
+
+    def _parse_lesson(self, chapter, task_file, entry):
+        try:
+            with open(task_file, 'r', encoding='utf-8') as f:
+                task_data = json.load(f)
+            
+            # Inject Category if missing
+            if 'category' not in task_data:
+                task_data['category'] = chapter.get('title', 'Genel')
+                
+            return Lesson(task_data, task_file, None)
+        except Exception as e:
+            logging.error(f"Error loading lesson {entry}: {e}")
+            return None
+
+    def _swap(self, snapshot, signatures, chapter_mtimes):
+        """Publishes a new snapshot and drops caches derived from the old one."""
+        self._snapshot = snapshot
+        self._lesson_signatures = signatures
+        self._chapter_mtimes = chapter_mtimes
+        self._search_index = None
+
+    def has_changes_on_disk(self):
+        """Cheap stat-only check: manifest, chapter folders and lesson files."""
+        manifest_path = os.path.join(self.root_dir, 'manifest.json')
+        try:
+            if os.stat(manifest_path).st_mtime_ns != self._manifest_mtime:
+                return True
+        except OSError:
+            return self._manifest_mtime is not None
+        
+        for chapter_path, mtime in self._chapter_mtimes.items():
+            try:
+                # Directory mtime changes when lesson folders are added/removed
+                if os.stat(chapter_path).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        
+        for lesson_dir, signature in self._lesson_signatures.items():
+            if _file_signature(lesson_dir) != signature:
+                return True
+        return False
+
+    def reload_changed(self):
+        """
+        Hot-reload for lesson authors.
+        
+        Polls the mtimes of the lesson folders and re-parses only the lessons
+        whose task.json / validation.py / solution.py changed (plus added and
+        removed folders). The rebuilt maps are swapped in atomically.
+        
+        Returns:
+            set of affected lesson UUIDs (empty if nothing changed).
+        """
+        with self._lock:
+            if self._frozen or self.pack is not None or not self.has_changes_on_disk():
+                return set()
+            previous = {l.dir_path: l for l in self._snapshot.lessons}
+            return self._rebuild(previous)
+
+    def freeze(self):
+        """
+        Makes this instance safe to share between many sessions/threads:
+        no further load() or hot-reload, and lazily built caches are built now.
+        """
+        with self._lock:
+            self._frozen = True
+        self.get_search_index()
+
+    @property
+    def frozen(self):
+        return self._frozen
 
     def get_lesson_by_id(self, numeric_id):
         # Legacy support: ID map is still populated but we should prefer UUIDs
@@ -129,36 +441,61 @@ class CurriculumManager:
     def get_lesson_by_slug(self, slug):
         return self.lesson_map.get(slug)
     
+    def get_lesson_position(self, uuid_str):
+        """Returns the 0-based ordinal of the lesson, or None if unknown."""
+        lesson = self.uuid_map.get(uuid_str)
+        return lesson.index if lesson else None
+    
     def get_next_lesson(self, current_uuid):
         """Returns the next lesson in the ordered list after the given UUID."""
-        if current_uuid not in self.uuid_map:
+        current_lesson = self.uuid_map.get(current_uuid)
+        if current_lesson is None:
             return None
             
-        current_lesson = self.uuid_map[current_uuid]
-        # Find index in the ordered list
-        # Optimization: We could store index in Lesson but that duplicates state
-        try:
-            idx = self.lessons.index(current_lesson)
-            if idx + 1 < len(self.lessons):
-                return self.lessons[idx + 1]
-        except ValueError:
-            pass
+        # O(1): ordinal is stored on the lesson at load time
+        idx = current_lesson.index
+        if idx + 1 < len(self.lessons):
+            return self.lessons[idx + 1]
         return None
 
     def get_prev_lesson(self, current_uuid):
         """Returns the previous lesson in the ordered list."""
-        if current_uuid not in self.uuid_map:
+        current_lesson = self.uuid_map.get(current_uuid)
+        if current_lesson is None:
             return None
             
-        current_lesson = self.uuid_map[current_uuid]
-        try:
-            idx = self.lessons.index(current_lesson)
-            if idx > 0:
-                return self.lessons[idx - 1]
-        except ValueError:
-            pass
+        idx = current_lesson.index
+        if idx > 0:
+            return self.lessons[idx - 1]
         return None
 
+    # --- Chapter / filtered views ---
+
+    def get_chapter(self, chapter_slug):
+        """Returns the Chapter for the given slug (or None)."""
+        return self.chapter_map.get(chapter_slug)
+
+    def get_lesson_chapter(self, lesson):
+        """Returns the Chapter a lesson belongs to (or None)."""
+        return self.chapter_map.get(lesson.chapter_slug)
+
+    def get_chapter_lessons(self, chapter_slug):
+        """Returns the lessons of a chapter as a tuple (empty if unknown)."""
+        chapter = self.chapter_map.get(chapter_slug)
+        return chapter.lessons if chapter else ()
+
+    def get_lessons_by_tag(self, tag):
+        """Returns all lessons carrying the tag, in curriculum order."""
+        return self.tag_index.get(tag, ())
+
+    def get_lessons_by_category(self, category):
+        """Returns all lessons in the category, in curriculum order."""
+        return self.category_index.get(category, ())
+
+    def get_lessons_by_type(self, lesson_type):
+        """Returns all lessons of the given type (code, quiz, ...), in curriculum order."""
+        return self.type_index.get(lesson_type, ())
+
     def get_first_lesson(self):
         if self.lessons:
             return self.lessons[0]
@@ -167,6 +504,14 @@ class CurriculumManager:
     def get_total_lessons(self):
         return len(self.lessons)
 
+    def get_search_index(self):
+        """Returns the full-text LessonSearchIndex, building it on first use."""
+        index = self._search_index
+        if index is None:
+            from lesson_search import LessonSearchIndex
+            index = self._search_index = LessonSearchIndex(self.lessons)
+        return index
+
     def get_validator_function(self, lesson):
         """
         Dynamically loads the validation function for a lesson.
@@ -176,9 +521,14 @@ class CurriculumManager:
             return None
             
         try:
-            spec = importlib.util.spec_from_file_location("validation", lesson.validator_script)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            validator_code = lesson.get_validator_code()
+            if validator_code is not None:
+                module = types.ModuleType("validation")
+                exec(marshal.loads(validator_code), module.__dict__)
+            else:
+                spec = importlib.util.spec_from_file_location("validation", lesson.validator_script)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
             
             # Expecting a 'Validator' class or 'validate' function
             if hasattr(module, 'validate'):
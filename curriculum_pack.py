@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Packed curriculum archive.
+
+Hundreds of tiny lesson files are slow to install and to scan on cold start
+(Windows, network home directories). tools/pack_curriculum.py writes the whole
+curriculum/ tree into one indexed file; CurriculumManager maps it with mmap and
+reads solutions and validators on demand.
+
+Layout:
+    MAGIC (8 bytes) | index length (uint32 LE) | index (UTF-8 JSON) | data blob
+
+The index holds the manifest and every task.json; solutions, validator sources
+and marshalled validator code live in the blob as [offset, length] spans. It
+also records a content hash of the source tree; lesson authors can have a pack
+that no longer matches the files next to it ignored (config.Dev.CHECK_PACK).
+"""
+import os
+import json
+import hashlib
+import mmap
+import marshal
+import struct
+import importlib.util
+
+PACK_MAGIC = b'OCGPACK1'
+PACK_FORMAT = 1
+_HEADER = struct.Struct('<I')
+
+# Filenames inside a lesson folder
+TASK_FILE = 'task.json'
+VALIDATOR_FILE = 'validation.py'
+SOLUTION_FILE = 'solution.py'
+
+
+class PackError(Exception):
+    """Raised when a pack file is missing, corrupt or from another format."""
+
+
+def _lesson_entries(chapter_path):
+    """Lesson folder names of a chapter, in load order (folders with a task.json)."""
+    try:
+        names = sorted(os.listdir(chapter_path))
+    except OSError:
+        return []
+    return [name for name in names
+            if os.path.exists(os.path.join(chapter_path, name, TASK_FILE))]
+
+
+def _read_bytes(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def source_fingerprint(root_dir, manifest=None):
+    """
+    Content hash of a curriculum directory.
+    
+    Hashes the manifest and every lesson's task, solution and validator file
+    by path and contents, so editing, adding or removing a lesson changes it
+    while a fresh clone or copy of the same files does not. Reads the whole
+    tree: only used when checking a pack against its sources. Returns None if
+    the manifest cannot be read.
+    """
+    manifest_path = os.path.join(root_dir, 'manifest.json')
+    raw_manifest = _read_bytes(manifest_path)
+    if raw_manifest is None:
+        return None
+    try:
+        if manifest is None:
+            manifest = json.loads(raw_manifest.decode('utf-8'))
+    except ValueError:
+        return None
+    
+    digest = hashlib.sha1(b"manifest.json\0" + raw_manifest)
+    for chapter in manifest.get('chapters', []):
+        chapter_slug = chapter.get('slug')
+        if not chapter_slug:
+            continue
+        chapter_path = os.path.join(root_dir, chapter_slug)
+        for entry in _lesson_entries(chapter_path):
+            for name in (TASK_FILE, SOLUTION_FILE, VALIDATOR_FILE):
+                data = _read_bytes(os.path.join(chapter_path, entry, name))
+                stamp = "-" if data is None else f"{len(data)}"
+                digest.update(f"\0{chapter_slug}/{entry}/{name}:{stamp}\0".encode('utf-8'))
+                digest.update(data or b"")
+    return digest.hexdigest()
+
+
+def write_pack(root_dir, output_path):
+    """
+    Packs a curriculum directory into a single archive.
+    
+    Chapters follow manifest order and lessons are sorted by folder name,
+    same as CurriculumManager's directory loader.
+    
+    Returns: number of packed lessons.
+    """
+    with open(os.path.join(root_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    # Taken before reading the files: an edit made while packing makes the pack stale
+    fingerprint = source_fingerprint(root_dir, manifest)
+    
+    blob = bytearray()
+    
+    def add(data):
+        span = [len(blob), len(data)]
+        blob.extend(data)
+        return span
+    
+    chapters = []
+    total = 0
+    for chapter in manifest.get('chapters', []):
+        chapter_slug = chapter.get('slug')
+        chapter_path = os.path.join(root_dir, chapter_slug)
+        if not os.path.isdir(chapter_path):
+            continue
+        
+        lessons = []
+        for entry in _lesson_entries(chapter_path):
+            lesson_dir = os.path.join(chapter_path, entry)
+            task_path = os.path.join(lesson_dir, TASK_FILE)
+            
+            with open(task_path, 'r', encoding='utf-8') as f:
+                record = {'entry': entry, 'task': json.load(f)}
+            
+            solution = _read_bytes(os.path.join(lesson_dir, SOLUTION_FILE))
+            record['solution'] = add(solution) if solution is not None else None
+            
+            validator = _read_bytes(os.path.join(lesson_dir, VALIDATOR_FILE))
+            if validator is not None:
+                code = compile(validator, f"{chapter_slug}/{entry}/{VALIDATOR_FILE}", 'exec')
+                record['validator_source'] = add(validator)
+                record['validator_code'] = add(marshal.dumps(code))
+            else:
+                record['validator_source'] = record['validator_code'] = None
+            
+            lessons.append(record)
+            total += 1
+        
+        chapters.append({'slug': chapter_slug, 'lessons': lessons})
+    
+    index = json.dumps({
+        'format': PACK_FORMAT,
+        # marshal output is only valid for the interpreter version that wrote it
+        'python_magic': importlib.util.MAGIC_NUMBER.hex(),
+        'source_fingerprint': fingerprint,
+        'manifest': manifest,
+        'chapters': chapters,
+    }, ensure_ascii=False).encode('utf-8')
+    
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(PACK_MAGIC)
+        f.write(_HEADER.pack(len(index)))
+        f.write(index)
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, output_path)
+    return total
+
+
+class CurriculumPack:
+    """Read-only, memory-mapped view of a pack file."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            self._file = open(path, 'rb')
+        except OSError as e:
+            raise PackError(f"Cannot open pack {path}: {e}") from e
+        
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mm[:len(PACK_MAGIC)] != PACK_MAGIC:
+                raise PackError(f"Not a curriculum pack: {path}")
+            header_end = len(PACK_MAGIC) + _HEADER.size
+            (index_len,) = _HEADER.unpack_from(self._mm, len(PACK_MAGIC))
+            index = json.loads(self._mm[header_end:header_end + index_len].decode('utf-8'))
+            if index.get('format') != PACK_FORMAT:
+                raise PackError(f"Unsupported pack format: {index.get('format')}")
+        except PackError:
+            self.close()
+            raise
+        except (ValueError, struct.error, OSError) as e:
+            self.close()
+            raise PackError(f"Corrupt curriculum pack {path}: {e}") from e
+        
+        self._data_start = header_end + index_len
+        self.manifest = index.get('manifest', {})
+        self.chapters = index.get('chapters', [])
+        self.code_compatible = index.get('python_magic') == importlib.util.MAGIC_NUMBER.hex()
+        self.source_fingerprint = index.get('source_fingerprint')
+
+    def read(self, span):
+        """Returns the bytes of an [offset, length] span (None for a missing file)."""
+        if span is None:
+            return None
+        offset, length = span
+        start = self._data_start + offset
+        return self._mm[start:start + length]
+
+    def read_text(self, span):
+        data = self.read(span)
+        return data.decode('utf-8') if data is not None else None
+
+    def validator_code(self, record, filename='validation.py'):
+        """
+        Marshalled validator code for a lesson record.
+        Recompiles from the packed source if the pack was built by another Python.
+        """
+        if record.get('validator_code') is None:
+            return None
+        if self.code_compatible:
+            return self.read(record['validator_code'])
+        return marshal.dumps(compile(self.read(record['validator_source']), filename, 'exec'))
+
+    def close(self):
+        mm = getattr(self, '_mm', None)
+        if mm is not None:
+            mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
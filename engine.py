@@ -2,6 +2,9 @@ import json
 import os
 import time
 import dataclasses
+import functools
+import logging
+import threading
 from typing import Optional, List, Dict, Any, Union
 import config
 
@@ -45,87 +48,94 @@ class ActionCustomView:
     view_name: str
 
 # --- DATA HELPERS ---
+# Progress schema helpers live with the store; re-exported here for callers/tests.
+from progress_store import (get_default_progress, validate_progress_data, apply_event,
+                            JournalProgressStore, ProgressWriter, ProgressState,
+                            create_progress_backend)
 
-def get_default_progress():
-    return {
-        "current_step": None, # Now stores UUID (str) or None (for first start)
-        "completed_tasks": [], # List of UUIDs
-        "skipped_tasks": [], # List of UUIDs
-        "user_code": {}, # Map UUID -> Code
-    }
+# --- SIMULATION ENGINE ---
 
-def validate_progress_data(data):
-    """Ensures progress data has the correct schema, migrating if necessary."""
-    default = get_default_progress()
-    if not isinstance(data, dict): return default
-    
-    # 1. Ensure keys exist
-    for key, value in default.items():
-        if key not in data:
-            data[key] = value
-            
-    # 2. Schema Migration (completed -> completed_tasks)
-    if "completed" in data and "completed_tasks" not in data:
-        data["completed_tasks"] = data.pop("completed")
-    if "skipped" in data and "skipped_tasks" not in data:
-        data["skipped_tasks"] = data.pop("skipped")
-        
-    # 3. Type checks
-    if not isinstance(data.get("completed_tasks"), list): data["completed_tasks"] = []
-    if not isinstance(data.get("skipped_tasks"), list): data["skipped_tasks"] = []
-    if not isinstance(data.get("user_code"), dict): data["user_code"] = {}
-    
-    return data
+def _synchronized(method):
+    """Serializes a public engine method on the session lock (host mode shares threads)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
-# --- SIMULATION ENGINE ---
 
 class SimulationEngine:
-    def __init__(self):
+    def __init__(self, curriculum=None, user_data_dir=None, user_id=None, executor=None,
+                 progress_db=None):
+        """
+        Args:
+            curriculum: shared, already loaded CurriculumManager (host mode);
+                        by default this engine loads its own.
+            user_data_dir: where this learner's progress lives (default: get_user_data_dir()).
+            user_id: learner id for shared progress backends (SQLite).
+            executor: callable(user_code, validator_path, validator_code=None) -> result
+                      dict; defaults to sandbox.executor.run_safe.
+            progress_db: shared SQLite database when OCAGI_PROGRESS_DB is unset (host mode).
+        """
         # Define base directory
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
+        self._lock = threading.RLock()
+        self._executor = executor
         
         # User data stored in platform-specific location
-        from config import get_user_data_dir
-        user_data_dir = get_user_data_dir()
+        if user_data_dir is None:
+            from config import get_user_data_dir
+            user_data_dir = get_user_data_dir()
+        self.user_data_dir = user_data_dir
         self.progress_file = os.path.join(user_data_dir, 'progress.json')
         self.progress_backup = os.path.join(user_data_dir, 'progress.backup.json')
+        self.progress_store = create_progress_backend(user_data_dir, user_id=user_id, db_path=progress_db)
+        
+        # Every submission, delta-compressed per lesson (loaded lazily)
+        from code_history import CodeHistory
+        self.code_history = CodeHistory(os.path.join(user_data_dir, config.CodeHistory.DIRNAME))
         
         # Initialize Curriculum Manager
-        from curriculum_manager import CurriculumManager
-        self.cm = CurriculumManager(os.path.join(self.base_dir, 'curriculum'))
-        self.cm.load()
+        if curriculum is None:
+            from curriculum_manager import CurriculumManager
+            curriculum = CurriculumManager(os.path.join(self.base_dir, 'curriculum'))
+            curriculum.load()
+        self.cm = curriculum
         
-        self.progress = self._load_progress()
+        # Set-indexed state with per-chapter counters (lists kept for the on-disk format)
+        self.progress = ProgressState.from_dict(self._load_progress(), chapter_of=self._chapter_of)
         self.last_run_result = None
+        
+        # Disk writes happen on a background thread, off the UI thread
+        self.progress_writer = ProgressWriter(self.progress_store, self.progress)
+
+    def _chapter_of(self, uuid_str):
+        lesson = self.cm.get_lesson_by_uuid(uuid_str)
+        return lesson.chapter_slug if lesson else None
+
+    @_synchronized
+    def get_chapter_progress(self, chapter_slug):
+        """(completed, skipped, total) for a chapter, from incrementally kept counters."""
+        chapter = self.cm.get_chapter(chapter_slug)
+        return (self.progress.chapter_completed.get(chapter_slug, 0),
+                self.progress.chapter_skipped.get(chapter_slug, 0),
+                len(chapter) if chapter else 0)
 
     def _load_progress(self) -> Dict:
-        data = get_default_progress()
-        if os.path.exists(self.progress_file):
-            try:
-                with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                if os.path.exists(self.progress_backup):
-                    try:
-                        with open(self.progress_backup, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                    except (FileNotFoundError, json.JSONDecodeError): pass
-        
-        return validate_progress_data(data)
+        """Snapshot + replayed journal (see progress_store)."""
+        return self.progress_store.load()
 
-    def _save_progress(self):
-        # Backup
-        if os.path.exists(self.progress_file):
-            try:
-                import shutil
-                shutil.copy2(self.progress_file, self.progress_backup)
-            except OSError: pass
-            
-        try:
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(self.progress, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            pass
+    def _record(self, op: str, **fields):
+        """Applies a small progress event in memory and queues it for the journal."""
+        event = dict(fields, op=op)
+        apply_event(self.progress, event)
+        self.progress_writer.submit(event)
+
+    @_synchronized
+    def close(self):
+        """Flushes pending progress and code history, compacts the journal into a snapshot."""
+        self.progress_writer.close()
+        self.code_history.close()
 
     def _get_current_state_info(self):
         current_step_id = self.progress.get("current_step")
@@ -149,6 +159,40 @@ class SimulationEngine:
         
         return self.progress, current_step_id, completed, skipped, step
 
+    def _is_lesson_unlocked(self, lesson, completed, skipped):
+        """Same rule as NEXT_TASK: reachable if done/skipped, or if its predecessor is."""
+        if lesson.uuid in completed or lesson.uuid in skipped:
+            return True
+        prev_lesson = self.cm.get_prev_lesson(lesson.uuid)
+        return prev_lesson is None or prev_lesson.uuid in completed or prev_lesson.uuid in skipped
+
+    @_synchronized
+    def get_previous_attempt(self, depth=1):
+        """The depth-th most recent submission for the current lesson (F2 recall)."""
+        current_step_id = self.progress.get("current_step")
+        if not current_step_id:
+            return None
+        return self.code_history.previous(current_step_id, depth)
+
+    def get_search_index(self):
+        """Returns the curriculum's full-text search index (for the jump palette)."""
+        return self.cm.get_search_index()
+
+    @_synchronized
+    def check_curriculum_reload(self) -> Optional[ActionRenderEditor]:
+        """
+        Hot-reload hook polled by the editor (config.Dev.HOT_RELOAD).
+        Returns a fresh ActionRenderEditor if lesson files changed on disk, else None.
+        """
+        changed = self.cm.reload_changed()
+        if not changed:
+            return None
+        self.progress.recount()  # Lessons may have moved between chapters
+        logging.info(f"Curriculum hot-reload: {len(changed)} lesson(s) changed")
+        action = self.get_next_action()
+        return action if isinstance(action, ActionRenderEditor) else None
+
+    @_synchronized
     def get_next_action(self) -> Union[ActionRenderEditor, ActionRenderCelebration, ActionExit, ActionShowMessage]:
         progress, current_step_id, completed, skipped, step = self._get_current_state_info()
         
@@ -185,6 +229,7 @@ class SimulationEngine:
             task_id=current_step_id
         )
 
+    @_synchronized
     def process_input(self, user_input: Optional[str]) -> Any:
         progress, current_step_id, completed, skipped, step = self._get_current_state_info()
         
@@ -192,26 +237,36 @@ class SimulationEngine:
         
         # 1. RESET
         if user_input == "RESET_ALL":
-            self.progress = get_default_progress()
-            self._save_progress()
+            self._record("reset")
+            self.code_history.clear()
             return ActionShowMessage("İLERLEME SIFIRLANDI", "Tüm ilerleme silindi.", "reset", wait_for_enter=False)
         
         # 2. DEV MESSAGE
         if user_input == "DEV_MESSAGE":
             return ActionCustomView("dev_message")
 
+        # 2b. LESSON SEARCH (Palette UI returns "GOTO_LESSON:<uuid>")
+        if user_input == "LESSON_SEARCH":
+            return ActionCustomView("lesson_search")
+
+        if isinstance(user_input, str) and user_input.startswith("GOTO_LESSON:"):
+            target = self.cm.get_lesson_by_uuid(user_input[len("GOTO_LESSON:"):])
+            if target and target.uuid != current_step_id:
+                if not self._is_lesson_unlocked(target, completed, skipped):
+                    return ActionShowMessage("🔒 KİLİTLİ GÖREV", config.UI.MSG_LESSON_LOCKED, "info", wait_for_enter=False)
+                self._record("nav", step=target.uuid)
+            return self.get_next_action()
+
         # 3. NAVIGATION (PREV/NEXT)
         if user_input == "PREV_TASK":
             if current_step_id is None:
                 # From celebration, go to last lesson
                 if self.cm.lessons:
-                    self.progress["current_step"] = self.cm.lessons[-1].uuid
-                    self._save_progress()
+                    self._record("nav", step=self.cm.lessons[-1].uuid)
             else:
                 prev_lesson = self.cm.get_prev_lesson(current_step_id)
                 if prev_lesson:
-                    self.progress["current_step"] = prev_lesson.uuid
-                    self._save_progress()
+                    self._record("nav", step=prev_lesson.uuid)
             return self.get_next_action()
             
         if user_input == "NEXT_TASK":
@@ -227,22 +282,19 @@ class SimulationEngine:
                     can_advance = True
                     
                 if can_advance:
-                    self.progress["current_step"] = next_lesson.uuid
-                    self._save_progress()
+                    self._record("nav", step=next_lesson.uuid)
             else:
                 # No next lesson = we're on the last one
                 # If current is done/skipped, go to celebration
                 if current_step_id in completed or current_step_id in skipped:
-                    self.progress["current_step"] = None
-                    self._save_progress()
+                    self._record("nav", step=None)
             return self.get_next_action()
 
         if user_input == "GOTO_FIRST_SKIPPED":
             if skipped:
                 first_skipped_uuid = skipped[0]
                 if self.cm.get_lesson_by_uuid(first_skipped_uuid):
-                    self.progress["current_step"] = first_skipped_uuid
-                    self._save_progress()
+                    self._record("nav", step=first_skipped_uuid)
             return self.get_next_action()
             
         if user_input == "SHOW_SOLUTION":
@@ -259,15 +311,11 @@ class SimulationEngine:
             
             # Mark as skipped if not already
             if not is_skipped:
-                self.progress["skipped_tasks"].append(current_step_id)
+                self._record("skip", uuid=current_step_id)
             
-            # ALWAYS advance to next lesson or celebration
+            # ALWAYS advance to next lesson or celebration (None triggers celebration)
             next_l = self.cm.get_next_lesson(current_step_id)
-            if next_l:
-                self.progress["current_step"] = next_l.uuid
-            else:
-                self.progress["current_step"] = None  # Trigger celebration
-            self._save_progress()
+            self._record("nav", step=next_l.uuid if next_l else None)
             
             return ActionShowMessage(
                 title=msg_title,
@@ -283,15 +331,17 @@ class SimulationEngine:
             return ActionShowMessage("HATA", "Geçersiz görev.", "error")
 
         # Save User Code
-        self.progress["user_code"][str(current_step_id)] = user_input
-        self._save_progress()
+        self._record("code", uuid=current_step_id, code=user_input)
+        self.code_history.record(current_step_id, user_input)
         
         # Execute Code
-        from sandbox.executor import run_safe
+        run_safe = self._executor
+        if run_safe is None:
+            from sandbox.executor import run_safe
         
         validator_path = step.validator_script if step.validator_script and os.path.exists(step.validator_script) else None
         
-        result = run_safe(user_input, validator_path)
+        result = run_safe(user_input, validator_path, validator_code=step.get_validator_code())
         self.last_run_result = result
         
         stdout_val = result["stdout"]
@@ -299,17 +349,10 @@ class SimulationEngine:
         error_message = result["error_message"]
         
         if is_valid:
-            if current_step_id not in completed:
-                self.progress["completed_tasks"].append(current_step_id)
-            if current_step_id in skipped:
-                self.progress["skipped_tasks"].remove(current_step_id)
+            self._record("complete", uuid=current_step_id)
             
             next_l = self.cm.get_next_lesson(current_step_id)
-            if next_l:
-                self.progress["current_step"] = next_l.uuid
-            else:
-                self.progress["current_step"] = None  # Trigger celebration
-            self._save_progress()
+            self._record("nav", step=next_l.uuid if next_l else None)  # None triggers celebration
             
             msg = "Görev başarıyla tamamlandı."
             if stdout_val:
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Headless driver: a JSON-lines protocol over stdin/stdout.
+
+controller.run_loop renders SimulationEngine actions with curses; this module
+serializes the same actions to JSON instead, so graders, alternative
+frontends and load tests can drive the engine without a terminal.
+
+Every request is one JSON object per line; every request gets exactly one
+response line:
+
+    -> {"id": 1, "cmd": "state"}
+    <- {"id": 1, "ok": true, "action": {"action": "editor", "task_info": ..., ...}}
+    -> {"id": 2, "cmd": "submit", "code": "print('Merhaba')"}
+    <- {"id": 2, "ok": true, "action": {"action": "message", "type": "success", ...}}
+
+Commands: state, submit(code), next, prev, skip, reset, solution,
+first_skipped, goto(uuid), recall(depth), search(query, limit), close, quit.
+
+With an EngineHost, requests may carry "session": "<user id>" and are routed
+to that learner's engine; without one a single SimulationEngine is used.
+"""
+import sys
+import json
+import logging
+import dataclasses
+
+import engine
+
+PROTOCOL_VERSION = 1
+
+ACTION_NAMES = {
+    engine.ActionRenderEditor: "editor",
+    engine.ActionRenderCelebration: "celebration",
+    engine.ActionShowMessage: "message",
+    engine.ActionCustomView: "view",
+    engine.ActionExit: "exit",
+}
+
+# Commands that map 1:1 onto SimulationEngine.process_input inputs
+ENGINE_INPUTS = {
+    "next": "NEXT_TASK",
+    "prev": "PREV_TASK",
+    "skip": None,  # Double Enter in the editor
+    "reset": "RESET_ALL",
+    "solution": "SHOW_SOLUTION",
+    "first_skipped": "GOTO_FIRST_SKIPPED",
+}
+
+
+class ProtocolError(Exception):
+    """A malformed request; reported back to the client, never fatal."""
+
+
+def action_to_dict(action):
+    """Serializes an engine action dataclass (None stays None)."""
+    if action is None:
+        return None
+    data = dataclasses.asdict(action)
+    data["action"] = ACTION_NAMES[type(action)]
+    return data
+
+
+class HeadlessServer:
+    """Dispatches protocol requests to one engine, or to EngineHost sessions."""
+
+    def __init__(self, simulation=None, host=None):
+        if simulation is None and host is None:
+            simulation = engine.SimulationEngine()
+        self.simulation = simulation
+        self.host = host
+
+    def _engine_for(self, request):
+        session = request.get("session")
+        if session is None:
+            if self.simulation is None:
+                raise ProtocolError("'session' is required in multi-session mode")
+            return self.simulation
+        if self.host is None:
+            raise ProtocolError("'session' requires multi-session mode (--sessions)")
+        return self.host.open_session(str(session))
+
+    def handle(self, request):
+        """Executes one request dict and returns the response dict."""
+        response = {"id": request.get("id") if isinstance(request, dict) else None}
+        try:
+            if not isinstance(request, dict):
+                raise ProtocolError("request must be a JSON object")
+            response.update(self._dispatch(request))
+            response["ok"] = True
+        except ProtocolError as e:
+            response.update(ok=False, error=str(e))
+        except Exception as e:
+            logging.exception("Headless request failed")
+            response.update(ok=False, error=f"internal error: {e}")
+        return response
+
+    def _dispatch(self, request):
+        cmd = request.get("cmd")
+        if not isinstance(cmd, str):
+            raise ProtocolError("'cmd' must be a string")
+        if cmd == "quit":
+            return {"bye": True}
+        if cmd == "hello":
+            return {"protocol": PROTOCOL_VERSION, "multi_session": self.host is not None}
+        if cmd == "close":
+            if self.host is None or request.get("session") is None:
+                raise ProtocolError("'close' needs a session in multi-session mode")
+            return {"closed": self.host.close_session(str(request["session"]))}
+        if cmd == "search":
+            # Curriculum-wide; needs no session
+            curriculum = self.host.curriculum if self.host else self.simulation.cm
+            limit = request.get("limit", 20)
+            if not isinstance(limit, int) or limit < 1:
+                raise ProtocolError("'limit' must be a positive integer")
+            lessons = curriculum.get_search_index().search(str(request.get("query", "")), limit=limit)
+            return {"lessons": [{"uuid": l.uuid, "title": l.title, "chapter": l.chapter_slug}
+                                for l in lessons]}
+
+        simulation = self._engine_for(request)
+
+        if cmd == "state":
+            return {"action": action_to_dict(simulation.get_next_action())}
+        if cmd in ENGINE_INPUTS:
+            return {"action": action_to_dict(simulation.process_input(ENGINE_INPUTS[cmd]))}
+        if cmd == "submit":
+            code = request.get("code")
+            if not isinstance(code, str):
+                raise ProtocolError("'submit' needs a string 'code'")
+            return {"action": action_to_dict(simulation.process_input(code))}
+        if cmd == "goto":
+            uuid = request.get("uuid")
+            if not isinstance(uuid, str):
+                raise ProtocolError("'goto' needs a string 'uuid'")
+            return {"action": action_to_dict(simulation.process_input(f"GOTO_LESSON:{uuid}"))}
+        if cmd == "recall":
+            depth = request.get("depth", 1)
+            if not isinstance(depth, int) or depth < 1:
+                raise ProtocolError("'depth' must be a positive integer")
+            return {"code": simulation.get_previous_attempt(depth)}
+        raise ProtocolError(f"unknown command: {cmd!r}")
+
+    def serve(self, stdin=None, stdout=None):
+        """Reads requests until EOF or 'quit'. Returns the process exit code."""
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {"id": None, "ok": False, "error": f"invalid JSON: {e}"}
+            else:
+                response = self.handle(request)
+            stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+            stdout.flush()
+            if response.get("bye"):
+                break
+        return 0
+
+    def close(self):
+        if self.simulation is not None:
+            self.simulation.close()
+        if self.host is not None:
+            self.host.close()
+
+
+def run_headless(sessions_dir=None):
+    """Entry point for `main.py --headless [--sessions DIR]`."""
+    import multiprocessing
+    try:
+        multiprocessing.set_start_method('spawn', force=True)
+    except RuntimeError:
+        pass
+
+    if sys.stdout.encoding.lower() != 'utf-8':
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    host = None
+    if sessions_dir:
+        from host import EngineHost
+        host = EngineHost(data_root=sessions_dir)
+    server = HeadlessServer(host=host) if host else HeadlessServer()
+    try:
+        return server.serve()
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        server.close()
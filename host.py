@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Host mode: one process, one curriculum, many learner sessions.
+
+Normally every learner process builds its own SimulationEngine, which loads
+and parses the whole curriculum. EngineHost loads the curriculum once,
+freezes it (no reloads, caches built up front) and hands the same instance to
+every session, so memory grows with the number of sessions rather than with
+curriculum copies.
+
+Each session is an ordinary SimulationEngine with its own progress directory
+(<data_root>/<user id>/) and its own lock; with the SQLite progress backend all
+sessions share one database (OCAGI_PROGRESS_DB, default <data_root>/progress.db); all sessions submit code through
+one shared SandboxPool, behind a FairScheduler that gives every learner its
+own queue so one learner's infinite loops cannot starve the others.
+"""
+import os
+import re
+import hashlib
+import logging
+import threading
+import multiprocessing
+
+import config
+from curriculum_manager import CurriculumManager
+from engine import SimulationEngine
+from sandbox.scheduler import FairScheduler
+
+_UNSAFE_ID_CHARS = re.compile(r'[^A-Za-z0-9_.-]')
+_HASH_SUFFIX = re.compile(r'-[0-9a-f]{10}$')
+
+
+def safe_user_dirname(user_id):
+    """
+    Maps a learner id to a directory name that cannot escape data_root.
+
+    Ids that are already safe are used as is. Any other id gets a short hash
+    of the raw id appended, so ids that only differ in replaced characters
+    ("ali veli" / "ali_veli") never share a progress directory.
+    """
+    raw = str(user_id)
+    name = _UNSAFE_ID_CHARS.sub('_', raw).strip('.')
+    if not name:
+        raise ValueError(f"Invalid user id: {user_id!r}")
+    # A safe id that already looks hashed is hashed too, so it cannot clash
+    # with the directory of some other, sanitized id
+    if name != raw or _HASH_SUFFIX.search(name):
+        digest = hashlib.sha1(raw.encode('utf-8', 'surrogatepass')).hexdigest()[:10]
+        name = f"{name}-{digest}"
+    return name
+
+
+class EngineHost:
+    """
+    Serves many independent SimulationEngine sessions from one process.
+
+    Thread-safe: sessions may be opened, used and closed from any thread.
+    """
+
+    def __init__(self, curriculum_root=None, data_root=None, pool_size=None,
+                 curriculum=None, executor=None, scheduler=None):
+        """
+        Args:
+            curriculum_root: curriculum directory (default: ./curriculum).
+            data_root: parent directory of per-learner progress directories
+                       (default: <user data dir>/sessions).
+            pool_size: shared sandbox pool size (default: CPU count).
+            curriculum: an already loaded CurriculumManager to share instead.
+            executor: callable(user_code, validator_path, validator_code=None);
+                      replaces the shared SandboxPool (tests, custom backends).
+            scheduler: FairScheduler options (dict), e.g. {"per_learner": 2}.
+        """
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        if curriculum is None:
+            curriculum = CurriculumManager(curriculum_root or os.path.join(base_dir, 'curriculum'))
+            curriculum.load()
+        curriculum.freeze()
+        self.curriculum = curriculum
+
+        if data_root is None:
+            data_root = os.path.join(config.get_user_data_dir(), 'sessions')
+        self.data_root = data_root
+        # One SQLite file for every learner, so lesson_stats sees the whole class
+        self.progress_db = config.Progress.DB_PATH or os.path.join(data_root, config.System.FILENAME_PROGRESS_DB)
+
+        self.pool = None
+        if executor is None:
+            from sandbox.pool import SandboxPool
+            # Sessions run writer threads in this process; fork would hand their
+            # malloc arenas to the sandbox children and trip RLIMIT_AS.
+            self.pool = SandboxPool(pool_size, context=multiprocessing.get_context('spawn'))
+            executor = self._run_in_pool
+        workers = self.pool.size if self.pool else (pool_size or multiprocessing.cpu_count())
+        self.scheduler = FairScheduler(executor, workers, **(scheduler or {}))
+
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _run_in_pool(self, user_code, validator_path, validator_code=None):
+        return self.pool.run(user_code, validator_path, validator_code=validator_code)
+
+    def open_session(self, user_id):
+        """Returns the learner's session, creating it on first use."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EngineHost is closed")
+            session = self._sessions.get(user_id)
+            if session is None:
+                user_dir = os.path.join(self.data_root, safe_user_dirname(user_id))
+                os.makedirs(user_dir, exist_ok=True)
+                session = SimulationEngine(curriculum=self.curriculum, user_data_dir=user_dir,
+                                           user_id=str(user_id),
+                                           executor=self.scheduler.executor_for(user_id),
+                                           progress_db=self.progress_db)
+                self._sessions[user_id] = session
+            return session
+
+    def get_session(self, user_id):
+        """Returns an open session or None."""
+        with self._lock:
+            return self._sessions.get(user_id)
+
+    def close_session(self, user_id):
+        """Flushes and drops a learner's session. Returns False if it was not open."""
+        with self._lock:
+            session = self._sessions.pop(user_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    @property
+    def session_count(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def close(self):
+        """Closes every session, then the shared sandbox pool."""
+        with self._lock:
+            self._closed = True
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                logging.exception("Failed to close session")
+        if self.pool is not None:
+            self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
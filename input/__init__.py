@@ -5,6 +5,7 @@ Input Paketi - Kullanıcı girdisi işleme.
 from input.api import EventType, InputEvent, InputDriver
 from input.curses_driver import CursesInputDriver
 from input.threaded import InputCollector
+from input.select_collector import SelectInputCollector
 
 __all__ = [
     'EventType',
@@ -12,4 +13,5 @@ __all__ = [
     'InputDriver',
     'CursesInputDriver',
     'InputCollector',
+    'SelectInputCollector',
 ]
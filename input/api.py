@@ -16,11 +16,16 @@ class EventType(Enum):
     ENTER = auto()
     TAB = auto()
     CHAR = auto() # Has value
+    PASTE = auto() # Has value (whole pasted text, newlines as '\n')
     
     # System/App
     EXIT = auto() # Ctrl+C
     RESIZE = auto()
     RESET_ALL = auto() # Ctrl+R
+    SEARCH = auto() # Ctrl+P (Ders arama paleti)
+    RECALL_PREVIOUS = auto() # F2 (Önceki deneme)
+    UNDO = auto() # Ctrl+Z / Ctrl+U
+    REDO = auto() # Ctrl+Y / Ctrl+G
     
     # Navigation Actions
     PREV_TASK = auto()
@@ -45,7 +50,7 @@ class InputEvent:
     
     @property
     def is_editing(self):
-        return self.type in (EventType.BACKSPACE, EventType.DELETE, EventType.ENTER, EventType.TAB, EventType.CHAR)
+        return self.type in (EventType.BACKSPACE, EventType.DELETE, EventType.ENTER, EventType.TAB, EventType.CHAR, EventType.PASTE)
 
 class InputDriver:
     """Abstract base class for input drivers."""
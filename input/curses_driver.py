@@ -1,26 +1,44 @@
 # -*- coding: utf-8 -*-
+import sys
 import curses
 import config
 from input.api import InputDriver, InputEvent, EventType
 from input.threaded import InputCollector
+from input.select_collector import SelectInputCollector
 
 class CursesInputDriver(InputDriver):
     """
-    Curses implementation of the InputDriver using Threaded InputCollector.
+    Curses implementation of the InputDriver.
+    On POSIX ttys input is read through SelectInputCollector (waits on the
+    terminal fd, no thread); elsewhere through the threaded InputCollector.
     Handles platform-specific keycodes (Windows Numpad),
     ESC sequences for navigation (Alt+Arrows), and basic key mapping.
+    Pastes are delivered as a single PASTE event: from bracketed-paste
+    sequences where the terminal supports them, otherwise from a burst of
+    printable keys that are already queued together.
     """
     
-    def __init__(self, stdscr, lock=None):
+    def __init__(self, stdscr, lock=None, collector=None):
         self.stdscr = stdscr
         self._setup_numpad_map()
         
-        # Initialize Threaded Input Collector with Lock
-        self.collector = InputCollector(stdscr, lock=lock)
+        # Initialize Input Collector with Lock
+        if collector is None:
+            if SelectInputCollector.supported(stdscr):
+                collector = SelectInputCollector(stdscr, lock=lock)
+            else:
+                collector = InputCollector(stdscr, lock=lock)
+        self.collector = collector
         self.collector.start()
         
         # Local pushback buffer (replaces curses.ungetch)
         self.pushback_buffer = []
+        
+        # Bracketed paste: only on a real POSIX terminal we own
+        self.bracketed_paste = (config.Input.BRACKETED_PASTE
+                                and SelectInputCollector.supported(stdscr))
+        if self.bracketed_paste:
+            self._write_terminal(config.Input.PASTE_MODE_ON)
 
     def _normalize_key_code(self, char) -> int:
         """
@@ -35,9 +53,21 @@ class CursesInputDriver(InputDriver):
         
     def close(self):
         """Stops the input collector thread."""
+        if self.bracketed_paste:
+            self._write_terminal(config.Input.PASTE_MODE_OFF)
+            self.bracketed_paste = False
         if self.collector:
             self.collector.stop()
 
+    @staticmethod
+    def _write_terminal(sequence):
+        """Sends a mode sequence straight to the terminal (bypasses curses)."""
+        try:
+            sys.stdout.write(sequence)
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
+
     def _setup_numpad_map(self):
         """Maps Windows specific Numpad keycodes to standard characters."""
         self.numpad_map = {
@@ -71,10 +101,79 @@ class CursesInputDriver(InputDriver):
         
         return self.collector.get_input(block=block, timeout=timeout)
 
+    def _drain_resizes(self):
+        """Collapses KEY_RESIZE codes already queued behind this one."""
+        while True:
+            char = self._get_raw_input(0)
+            if char is None:
+                return
+            if self._normalize_key_code(char) != curses.KEY_RESIZE:
+                self._unget_raw_input(char)
+                return
+
     def _unget_raw_input(self, char):
         """Pushes char back to the front of the local buffer."""
         self.pushback_buffer.insert(0, char)
 
+    def _input_pending(self):
+        """True if more raw input can be read without waiting."""
+        return bool(self.pushback_buffer) or not self.collector.empty()
+
+    @staticmethod
+    def _is_paste_char(char):
+        """Printable characters, newlines and tabs can be part of a paste."""
+        if not isinstance(char, str) or len(char) != 1:
+            return False
+        return char in '\n\r\t' or (ord(char) >= 32 and char != '\x7f')
+
+    @staticmethod
+    def _normalize_paste(text):
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def _read_burst(self, first):
+        """
+        Collects the printable keys queued behind `first`.
+        Returns the text if it is long enough to be a paste; otherwise the
+        keys are pushed back and handled one by one as typing.
+        """
+        chars = [first]
+        while True:
+            char = self._get_raw_input(0)
+            if char is None:
+                break
+            if not self._is_paste_char(char):
+                self._unget_raw_input(char)
+                break
+            chars.append(char)
+        
+        if len(chars) >= config.Input.PASTE_BURST_MIN:
+            return ''.join(chars)
+        
+        for char in reversed(chars[1:]):
+            self._unget_raw_input(char)
+        return None
+
+    def _read_bracketed_paste(self) -> InputEvent:
+        """Reads the pasted text up to the ESC[201~ terminator."""
+        end = '\x1b[201~'
+        chars = []
+        while True:
+            char = self._get_raw_input(config.Input.PASTE_READ_TIMEOUT)
+            if char is None:
+                # Terminator lost: keep what arrived
+                break
+            if isinstance(char, str):
+                chars.append(char)
+            elif char in (curses.KEY_ENTER, config.Keys.ENTER, config.Keys.RETURN):
+                chars.append('\n')
+            else:
+                # Function keys / KEY_RESIZE are not part of the text
+                continue
+            if char == '~' and ''.join(chars[-len(end):]) == end:
+                del chars[-len(end):]
+                break
+        return InputEvent(EventType.PASTE, self._normalize_paste(''.join(chars)))
+
     def get_event(self, timeout_ms: int = -1) -> InputEvent:
         """
         Waits for and returns the next semantic InputEvent.
@@ -103,6 +202,12 @@ class CursesInputDriver(InputDriver):
             return InputEvent(EventType.EXIT)
         elif char_code == config.Keys.CTRL_R:
             return InputEvent(EventType.RESET_ALL)
+        elif char_code == config.Keys.CTRL_P:
+            return InputEvent(EventType.SEARCH)
+        elif char_code in (config.Keys.CTRL_Z, config.Keys.CTRL_U):
+            return InputEvent(EventType.UNDO)
+        elif char_code in (config.Keys.CTRL_Y, config.Keys.CTRL_G):
+            return InputEvent(EventType.REDO)
             
         # 4. Windows Numpad Normalization
         if not is_char_str and char_code in self.numpad_map:
@@ -113,11 +218,20 @@ class CursesInputDriver(InputDriver):
         if char_code == config.Keys.ESC:
             return self._handle_esc_sequence()
             
-        # 6. Standard Key Mapping
+        # 6. Paste burst (terminals without bracketed paste)
+        if self._is_paste_char(char) and self._input_pending():
+            burst = self._read_burst(char)
+            if burst is not None:
+                return InputEvent(EventType.PASTE, self._normalize_paste(burst))
+            
+        # 7. Standard Key Mapping
         if char_code == curses.KEY_RESIZE:
+            self._drain_resizes()
             return InputEvent(EventType.RESIZE)
         elif char_code == curses.KEY_F1:
             return InputEvent(EventType.SHOW_HINT)
+        elif char_code == curses.KEY_F2:
+            return InputEvent(EventType.RECALL_PREVIOUS)
             
         if char_code == curses.KEY_UP:
             return InputEvent(EventType.UP)
@@ -141,7 +255,7 @@ class CursesInputDriver(InputDriver):
         elif char_code == 9: # ASCII TAB
             return InputEvent(EventType.TAB)
             
-        # 7. Character Input
+        # 8. Character Input
         if is_char_str:
             if len(char) == 1 and ord(char) >= 32:
                  return InputEvent(EventType.CHAR, char)
@@ -175,8 +289,14 @@ class CursesInputDriver(InputDriver):
             if seq_char is None: 
                 return InputEvent(EventType.UNKNOWN)
                 
+            # Bracketed paste start: ESC[200~
+            if seq_code == 50: # '2'
+                rest = [self._get_raw_input(config.Timing.TIMEOUT_QUICK) for _ in range(3)]
+                if rest == ['0', '0', '~']:
+                    return self._read_bracketed_paste()
+                
             # Handle Alt+Arrows (xterm style: 1;3D or just 1;3)
-            if seq_code == 49: # '1'
+            elif seq_code == 49: # '1'
                 # Expect ';3D' or similar
                 self._get_raw_input(100) # swallow ';'
                 mod = self._get_raw_input(100) # modifier (3 = Alt)
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import time
+import curses
+import signal
+import selectors
+import threading
+import collections
+
+import config
+
+
+class SelectInputCollector:
+    """
+    Thread-free input collector for POSIX terminals.
+
+    Instead of a background thread polling get_wch() every 10 ms, the caller
+    waits on the terminal file descriptor with `selectors` and curses is read
+    only when bytes are ready. Everything curses has buffered is drained in
+    one go, so the rest of an escape sequence is already queued when the
+    driver peeks for it and no extra sleeps are needed.
+
+    Terminal resizes arrive as SIGWINCH, which does not make the tty
+    readable. On the main thread a handler is installed and the signal is
+    routed to a self-pipe via signal.set_wakeup_fd, so an idle editor sleeps
+    in select() until a key, a resize or the caller's deadline; only when no
+    handler can be installed does it fall back to polling every
+    resize_poll_sec.
+
+    Same interface as InputCollector (start/stop/get_input/empty).
+    """
+
+    def __init__(self, stdscr, lock=None, fd=None, resize_poll_sec=None):
+        self.stdscr = stdscr
+        self.lock = lock if lock else threading.Lock()
+        self.fd = sys.stdin.fileno() if fd is None else fd
+        # Only used when no SIGWINCH handler could be installed
+        self.resize_poll_sec = (config.Timing.RESIZE_POLL_SEC
+                                if resize_poll_sec is None else resize_poll_sec)
+        self.pending = collections.deque()
+        self.selector = None
+        self._wake_r = None
+        self._wake_w = None
+        self._old_handler = None
+        self._old_wakeup_fd = -1
+        self._watching_resize = False
+
+    @staticmethod
+    def supported(stdscr):
+        """True for a real curses window on a POSIX tty."""
+        if os.name != 'posix' or type(stdscr).__module__ != '_curses':
+            return False
+        try:
+            return os.isatty(sys.stdin.fileno())
+        except (OSError, ValueError, AttributeError):
+            return False
+
+    def start(self):
+        if self.selector is not None:
+            return
+        with self.lock:
+            try:
+                self.stdscr.nodelay(True)
+            except curses.error:
+                pass
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.fd, selectors.EVENT_READ)
+        self._watch_resize()
+
+    def stop(self):
+        if self.selector is None:
+            return
+        self._unwatch_resize()
+        self.selector.close()
+        self.selector = None
+        with self.lock:
+            try:
+                self.stdscr.nodelay(False)
+            except curses.error:
+                pass
+
+    def _watch_resize(self):
+        """Routes SIGWINCH into a self-pipe registered in the selector."""
+        if (not hasattr(signal, 'SIGWINCH')
+                or threading.current_thread() is not threading.main_thread()):
+            return
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        try:
+            # The C-level handler writes the signal number to the wakeup fd
+            # from whichever thread receives it, so select() returns even when
+            # the main thread is not the one interrupted.
+            self._old_wakeup_fd = signal.set_wakeup_fd(self._wake_w, warn_on_full_buffer=False)
+            self._old_handler = signal.signal(signal.SIGWINCH, self._on_sigwinch)
+        except (ValueError, OSError):
+            self._close_wake_pipe()
+            return
+        self.selector.register(self._wake_r, selectors.EVENT_READ)
+        self._watching_resize = True
+
+    def _unwatch_resize(self):
+        if not self._watching_resize:
+            return
+        self._watching_resize = False
+        # ncurses' own handler is a C function and cannot be reinstalled from
+        # Python; the default disposition (ignore) is the closest match.
+        previous = self._old_handler if self._old_handler is not None else signal.SIG_DFL
+        signal.signal(signal.SIGWINCH, previous)
+        signal.set_wakeup_fd(self._old_wakeup_fd)
+        self._old_handler = None
+        self._old_wakeup_fd = -1
+        self.selector.unregister(self._wake_r)
+        self._close_wake_pipe()
+
+    def _close_wake_pipe(self):
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
+
+    @staticmethod
+    def _on_sigwinch(signum, frame):
+        # The wakeup fd does the work; a Python handler is still needed for
+        # the interpreter to catch the signal at all.
+        pass
+
+    def _take_resize(self):
+        """Empties the wake pipe and queues KEY_RESIZE if it held a SIGWINCH."""
+        resized = False
+        while True:
+            try:
+                data = os.read(self._wake_r, 512)
+            except (BlockingIOError, InterruptedError):
+                break
+            if not data:
+                break
+            resized = resized or signal.SIGWINCH in data
+        if not resized:
+            return
+        # Our handler replaced ncurses' one, so tell curses the new size
+        # ourselves; resizeterm also queues KEY_RESIZE on most builds.
+        with self.lock:
+            try:
+                size = os.get_terminal_size(self.fd)
+                curses.resizeterm(size.lines, size.columns)
+            except (OSError, ValueError, AttributeError, curses.error):
+                pass
+        self._drain()
+        if curses.KEY_RESIZE not in self.pending:
+            self.pending.append(curses.KEY_RESIZE)
+
+    def _poll(self, wait):
+        """Waits up to `wait` seconds (None: forever) and queues what arrived."""
+        if self.selector is None:
+            self._drain()
+            return
+        ready = False
+        for key, _ in self.selector.select(wait):
+            if key.fd == self._wake_r:
+                self._take_resize()
+            else:
+                ready = True
+        # Without the signal pipe a pending KEY_RESIZE only shows up through
+        # get_wch(), so every wake has to read.
+        if ready or not self._watching_resize:
+            self._drain()
+
+    def _drain(self):
+        """Moves everything curses can return without blocking into `pending`."""
+        with self.lock:
+            while True:
+                try:
+                    try:
+                        char = self.stdscr.get_wch()
+                    except AttributeError:
+                        char = self.stdscr.getch()
+                except curses.error:
+                    return
+                if char is None or char == -1:
+                    return
+                self.pending.append(char)
+
+    def get_input(self, block=False, timeout=None):
+        """
+        Returns the next raw key (str or int) or None.
+        block=False: do not wait; timeout=None with block=True: wait forever.
+        """
+        if self.pending:
+            return self.pending.popleft()
+
+        deadline = None
+        if block and timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        while True:
+            if not block:
+                wait = 0
+            elif deadline is None:
+                wait = None if self._watching_resize else self.resize_poll_sec
+            else:
+                wait = max(0.0, deadline - time.monotonic())
+                if not self._watching_resize:
+                    wait = min(self.resize_poll_sec, wait)
+
+            self._poll(wait)
+            if self.pending:
+                return self.pending.popleft()
+
+            if not block or (deadline is not None and time.monotonic() >= deadline):
+                return None
+
+    def empty(self):
+        if self.pending:
+            return False
+        if self.selector is not None:
+            self._poll(0)
+        return not self.pending
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Ders Arama İndeksi
+Başlık, açıklama, ipucu ve etiketler üzerinde bellek içi ters indeks.
+Türkçe karakterleri katlar (ı/i, ş/s, ğ/g ...) ve önek eşleşmesi yapar.
+"""
+import bisect
+import re
+
+# Türkçe harfleri ASCII karşılıklarına katla.
+# 'I' -> 'i' ve 'İ' -> 'i' açıkça eşlenir; str.lower() 'İ' için birleşik nokta üretir.
+_FOLD_TABLE = str.maketrans({
+    'ı': 'i', 'I': 'i', 'İ': 'i', 'î': 'i', 'Î': 'i',
+    'ş': 's', 'Ş': 's',
+    'ğ': 'g', 'Ğ': 'g',
+    'ü': 'u', 'Ü': 'u', 'û': 'u', 'Û': 'u',
+    'ö': 'o', 'Ö': 'o',
+    'ç': 'c', 'Ç': 'c',
+    'â': 'a', 'Â': 'a',
+})
+
+_WORD_RE = re.compile(r"\w+")
+
+# Alan ağırlıkları: başlık eşleşmesi açıklama eşleşmesinden daha değerli
+FIELD_WEIGHTS = (
+    ('title', 4),
+    ('tags', 3),
+    ('category', 2),
+    ('description', 1),
+    ('hint', 1),
+)
+
+
+def normalize_text(text):
+    """Metni Türkçe duyarlı şekilde katlar ve küçük harfe çevirir."""
+    return text.translate(_FOLD_TABLE).lower()
+
+
+def tokenize_text(text):
+    """Katlanmış metni kelime listesine ayırır."""
+    return _WORD_RE.findall(normalize_text(text))
+
+
+class LessonSearchIndex:
+    """
+    Dersler üzerinde ters indeks.
+
+    term -> {lesson.index: skor} eşlemesi ve önek araması için
+    sıralı terim listesi tutar. Sorgudaki her kelime bir önek olarak
+    değerlendirilir; sonuç tüm kelimelerin kesişimidir (AND).
+    """
+
+    def __init__(self, lessons):
+        self.lessons = list(lessons)
+        self.postings = {}  # term -> {lesson_idx: score}
+
+        for idx, lesson in enumerate(self.lessons):
+            self._add_lesson(idx, lesson)
+
+        self.terms = sorted(self.postings)
+
+    def _add_lesson(self, idx, lesson):
+        for field, weight in FIELD_WEIGHTS:
+            value = getattr(lesson, field, '')
+            if isinstance(value, (list, tuple)):
+                value = ' '.join(str(v) for v in value)
+            for term in tokenize_text(str(value or '')):
+                scores = self.postings.setdefault(term, {})
+                scores[idx] = scores.get(idx, 0) + weight
+
+        # "12" yazınca GÖREV 12 bulunabilsin
+        if lesson.numeric_id is not None:
+            scores = self.postings.setdefault(str(lesson.numeric_id), {})
+            scores[idx] = scores.get(idx, 0) + 5
+
+    def _prefix_scores(self, prefix):
+        """Öneki paylaşan tüm terimlerin skorlarını birleştirir."""
+        merged = {}
+        start = bisect.bisect_left(self.terms, prefix)
+        for i in range(start, len(self.terms)):
+            term = self.terms[i]
+            if not term.startswith(prefix):
+                break
+            # Tam eşleşme önek eşleşmesinden biraz daha değerli
+            bonus = 1 if term == prefix else 0
+            for idx, score in self.postings[term].items():
+                merged[idx] = max(merged.get(idx, 0), score + bonus)
+        return merged
+
+    def search(self, query, limit=20):
+        """
+        Sorguya uyan dersleri skor sırasına göre döndürür.
+
+        Boş sorgu müfredat sırasındaki ilk `limit` dersi döndürür.
+        """
+        words = tokenize_text(query)
+        if not words:
+            return self.lessons[:limit]
+
+        result = None
+        for word in words:
+            scores = self._prefix_scores(word)
+            if result is None:
+                result = scores
+            else:
+                result = {idx: result[idx] + s for idx, s in scores.items() if idx in result}
+            if not result:
+                return []
+
+        ranked = sorted(result.items(), key=lambda item: (-item[1], item[0]))
+        return [self.lessons[idx] for idx, _ in ranked[:limit]]
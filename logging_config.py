@@ -76,6 +76,13 @@ def handle_uncaught_exception(exc_type, exc_value, exc_traceback):
     # If the traceback comes from a file that is NOT part of our known source, we could mask it.
     
     logger.critical(f"Uncaught exception:\n{tb_text}")
+    
+    # Persist queued learner progress before the process dies
+    try:
+        import progress_store
+        progress_store.flush_all()
+    except Exception:
+        logger.exception("Failed to flush progress after uncaught exception")
 
     # Don't call original excepthook if we want to suppress stderr output 
     # (which would corrupt curses).
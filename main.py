@@ -372,12 +372,39 @@ def ensure_curses():
         return False
 
 
+def parse_args(argv=None):
+    """Komut satırı seçenekleri (tanınmayanlar yok sayılır)."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Python Ocağı")
+    parser.add_argument('--headless', action='store_true',
+                        help="curses yerine stdin/stdout üzerinden JSON-lines protokolü")
+    parser.add_argument('--sessions', metavar='DIR',
+                        help="headless: çok oturumlu mod, öğrenci ilerlemeleri DIR altında")
+    parser.add_argument('--serve', action='store_true',
+                        help="HTTP değerlendirme servisini başlat (server.py)")
+    parser.add_argument('--host', help="--serve: dinlenecek adres")
+    parser.add_argument('--port', type=int, help="--serve: dinlenecek port")
+    parser.add_argument('--workers', type=int, help="--serve: eşzamanlı değerlendirme sayısı")
+    parser.add_argument('--queue', type=int, help="--serve: bekleme kuyruğu boyu (dolunca 429)")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
 def main():
     # Setup logging first
     logging_config.setup_logging()
     logging.info("Application starting...")
     logging.info(f"Running on Python {sys.version}")
 
+    args = parse_args()
+    if args.headless:
+        # Terminal yok: curses kurulumu ve ekran temizliği atlanır
+        import headless
+        sys.exit(headless.run_headless(args.sessions))
+    if args.serve:
+        import server
+        sys.exit(server.run_server(args.host, args.port, args.workers, args.queue))
+
     # Windows'ta curses modülünü kontrol et ve gerekirse yükle
     if not ensure_curses():
         logging.critical("Ensure curses failed. Exiting.")
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite progress backend for shared hosts.
+
+One database holds every learner's progress, indexed per user and per lesson
+so instructors can query it directly (see lesson_stats). WAL mode lets many
+SimulationEngine sessions write concurrently; each batch of events is one
+BEGIN IMMEDIATE transaction, and busy_timeout absorbs lock contention.
+
+Lesson rows keep completed/skipped as separate ordinals (a lesson can be in
+both lists, exactly like the JSON format), so load() reproduces list order.
+"""
+import time
+import sqlite3
+import logging
+import threading
+
+import config
+from progress_store import ProgressBackend, apply_event, get_default_progress
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS learners (
+    user_id      TEXT PRIMARY KEY,
+    current_step TEXT,
+    updated_at   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lesson_progress (
+    user_id         TEXT NOT NULL,
+    lesson_uuid     TEXT NOT NULL,
+    completed_order INTEGER,
+    skipped_order   INTEGER,
+    code            TEXT,
+    updated_at      REAL NOT NULL,
+    PRIMARY KEY (user_id, lesson_uuid)
+);
+CREATE INDEX IF NOT EXISTS idx_lesson_progress_lesson
+    ON lesson_progress (lesson_uuid, completed_order, skipped_order);
+"""
+
+
+def connect(db_path):
+    """Opens a connection configured for concurrent use (WAL + busy timeout)."""
+    conn = sqlite3.connect(db_path, timeout=config.Progress.BUSY_TIMEOUT_MS / 1000,
+                           isolation_level=None, check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout = {int(config.Progress.BUSY_TIMEOUT_MS)}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class SqliteProgressBackend(ProgressBackend):
+    """Progress of one learner (user_id) inside a shared SQLite database."""
+    
+    def __init__(self, db_path, user_id, seed=None):
+        """
+        Args:
+            seed: backend whose data is imported on the learner's first load
+                  (e.g. their existing progress.json).
+        """
+        self.db_path = db_path
+        self.user_id = user_id
+        self.seed = seed
+        self._conn = connect(db_path)
+        self._lock = threading.Lock() # Engine thread loads, writer thread appends
+    
+    # --- Reading ---
+    
+    def load(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT current_step FROM learners WHERE user_id = ?", (self.user_id,)
+            ).fetchone()
+        
+        if row is None:
+            progress = self.seed.load() if self.seed is not None else get_default_progress()
+            self._import(progress)
+            return progress
+        
+        progress = get_default_progress()
+        progress["current_step"] = row[0]
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT lesson_uuid, completed_order, skipped_order, code "
+                "FROM lesson_progress WHERE user_id = ?", (self.user_id,)
+            ).fetchall()
+        
+        completed = sorted((r[1], r[0]) for r in rows if r[1] is not None)
+        skipped = sorted((r[2], r[0]) for r in rows if r[2] is not None)
+        progress["completed_tasks"] = [uuid for _, uuid in completed]
+        progress["skipped_tasks"] = [uuid for _, uuid in skipped]
+        progress["user_code"] = {r[0]: r[3] for r in rows if r[3] is not None}
+        return progress
+    
+    def _import(self, progress):
+        """Writes a whole progress dict as the learner's initial rows."""
+        events = [{"op": "nav", "step": progress.get("current_step")}]
+        events += [{"op": "complete", "uuid": u} for u in progress.get("completed_tasks", [])]
+        events += [{"op": "skip", "uuid": u} for u in progress.get("skipped_tasks", [])]
+        events += [{"op": "code", "uuid": u, "code": c} for u, c in progress.get("user_code", {}).items()]
+        self._write_events(events)
+    
+    # --- Writing ---
+    
+    def _next_order(self, column):
+        (value,) = self._conn.execute(
+            f"SELECT COALESCE(MAX({column}), 0) + 1 FROM lesson_progress WHERE user_id = ?",
+            (self.user_id,)
+        ).fetchone()
+        return value
+    
+    def _upsert_lesson(self, lesson_uuid, now, **columns):
+        names = ", ".join(columns)
+        marks = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in columns)
+        self._conn.execute(
+            f"INSERT INTO lesson_progress (user_id, lesson_uuid, {names}, updated_at) "
+            f"VALUES (?, ?, {marks}, ?) "
+            f"ON CONFLICT (user_id, lesson_uuid) DO UPDATE SET {updates}, updated_at = excluded.updated_at",
+            (self.user_id, lesson_uuid, *columns.values(), now)
+        )
+    
+    def _apply_sql(self, event, now):
+        op = event.get("op")
+        uuid = event.get("uuid")
+        conn = self._conn
+        
+        if op == "nav":
+            conn.execute(
+                "INSERT INTO learners (user_id, current_step, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET current_step = excluded.current_step, "
+                "updated_at = excluded.updated_at",
+                (self.user_id, event.get("step"), now)
+            )
+        elif op == "complete":
+            row = conn.execute(
+                "SELECT completed_order FROM lesson_progress WHERE user_id = ? AND lesson_uuid = ?",
+                (self.user_id, uuid)
+            ).fetchone()
+            order = row[0] if row and row[0] is not None else self._next_order("completed_order")
+            self._upsert_lesson(uuid, now, completed_order=order, skipped_order=None)
+        elif op == "skip":
+            row = conn.execute(
+                "SELECT skipped_order FROM lesson_progress WHERE user_id = ? AND lesson_uuid = ?",
+                (self.user_id, uuid)
+            ).fetchone()
+            if not (row and row[0] is not None):
+                self._upsert_lesson(uuid, now, skipped_order=self._next_order("skipped_order"))
+        elif op == "code":
+            self._upsert_lesson(str(uuid), now, code=event.get("code", ""))
+        elif op == "reset":
+            conn.execute("DELETE FROM lesson_progress WHERE user_id = ?", (self.user_id,))
+            conn.execute(
+                "INSERT INTO learners (user_id, current_step, updated_at) VALUES (?, NULL, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET current_step = NULL, updated_at = excluded.updated_at",
+                (self.user_id, now)
+            )
+        else:
+            logging.warning(f"Unknown progress event ignored: {op!r}")
+    
+    def _write_events(self, events):
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front: no deadlock-prone upgrades
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Learner row first, so a learner always exists once anything is written
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO learners (user_id, current_step, updated_at) VALUES (?, NULL, ?)",
+                    (self.user_id, now)
+                )
+                for event in events:
+                    self._apply_sql(event, now)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def append(self, event, progress=None):
+        self._write_events([event])
+    
+    def write_batch(self, events, state):
+        """One transaction per writer batch."""
+        events = list(events)
+        for event in events:
+            apply_event(state, event)
+        try:
+            self._write_events(events)
+        except sqlite3.Error as e:
+            logging.error(f"Failed to write progress to {self.db_path}: {e}")
+    
+    def close(self, progress=None):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def lesson_stats(db_path):
+    """
+    Per-lesson totals across all learners, for instructors:
+    {lesson_uuid: {"completed": n, "skipped": n, "attempted": n}}
+    """
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT lesson_uuid, COUNT(completed_order), COUNT(skipped_order), COUNT(code) "
+            "FROM lesson_progress GROUP BY lesson_uuid"
+        ).fetchall()
+    finally:
+        conn.close()
+    return {r[0]: {"completed": r[1], "skipped": r[2], "attempted": r[3]} for r in rows}
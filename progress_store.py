@@ -0,0 +1,644 @@
+# -*- coding: utf-8 -*-
+"""
+Journaled progress storage.
+
+progress.json used to be rewritten in full (plus a backup copy) on every
+navigation keypress and submission, and it carries every lesson's saved code.
+Now the snapshot is written rarely; each change is appended to progress.journal
+as one small JSON line:
+
+    {"seq": 12, "op": "nav", "step": "<uuid>"}
+
+On load the snapshot is read (falling back to the backup) and journal events
+with a seq newer than the snapshot's are replayed. Compaction writes a new
+snapshot via tmp file + fsync + os.replace and then truncates the journal; a
+crash between the two is harmless because replay skips already-applied seqs.
+"""
+import os
+import copy
+import json
+import time
+import atexit
+import shutil
+import logging
+import weakref
+import threading
+
+import config
+
+# Key under which the snapshot records the last journal seq it includes
+SNAPSHOT_SEQ_KEY = "journal_seq"
+
+
+def get_default_progress():
+    return {
+        "current_step": None, # Now stores UUID (str) or None (for first start)
+        "completed_tasks": [], # List of UUIDs
+        "skipped_tasks": [], # List of UUIDs
+        "user_code": {}, # Map UUID -> Code
+    }
+
+
+def validate_progress_data(data):
+    """Ensures progress data has the correct schema, migrating if necessary."""
+    default = get_default_progress()
+    if not isinstance(data, dict): return default
+    
+    # 1. Ensure keys exist
+    for key, value in default.items():
+        if key not in data:
+            data[key] = value
+            
+    # 2. Schema Migration (completed -> completed_tasks)
+    if "completed" in data and "completed_tasks" not in data:
+        data["completed_tasks"] = data.pop("completed")
+    if "skipped" in data and "skipped_tasks" not in data:
+        data["skipped_tasks"] = data.pop("skipped")
+        
+    # 3. Type checks
+    if not isinstance(data.get("completed_tasks"), list): data["completed_tasks"] = []
+    if not isinstance(data.get("skipped_tasks"), list): data["skipped_tasks"] = []
+    if not isinstance(data.get("user_code"), dict): data["user_code"] = {}
+    
+    return data
+
+
+class UuidList(list):
+    """
+    Ordered list of lesson UUIDs (what goes to disk) with a set index so
+    `uuid in lst` is O(1). Duplicates are dropped. Mutations report
+    (uuid, +1/-1) to on_change so owners can keep counters incrementally.
+    """
+    __slots__ = ('_index', '_on_change')
+    
+    def __init__(self, items=(), on_change=None):
+        super().__init__()
+        self._index = set()
+        self._on_change = on_change
+        for item in items:
+            self.append(item)
+    
+    def __contains__(self, item):
+        return item in self._index
+    
+    def _added(self, item):
+        self._index.add(item)
+        if self._on_change:
+            self._on_change(item, 1)
+    
+    def _removed(self, item):
+        self._index.discard(item)
+        if self._on_change:
+            self._on_change(item, -1)
+    
+    def append(self, item):
+        if item in self._index:
+            return
+        super().append(item)
+        self._added(item)
+    
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+    
+    def remove(self, item):
+        if item not in self._index:
+            raise ValueError(f"{item!r} not in list")
+        super().remove(item)
+        self._removed(item)
+    
+    def discard(self, item):
+        if item in self._index:
+            self.remove(item)
+    
+    def pop(self, i=-1):
+        item = super().pop(i)
+        self._removed(item)
+        return item
+    
+    def clear(self):
+        items = list(self)
+        super().clear()
+        for item in items:
+            self._removed(item)
+    
+    def _unsupported(self, *args, **kwargs):
+        raise TypeError("UuidList only supports append/extend/remove/discard/pop/clear")
+    
+    insert = __setitem__ = __delitem__ = __iadd__ = __imul__ = sort = reverse = _unsupported
+    
+    def __deepcopy__(self, memo):
+        return list(self)
+    
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+class ProgressState:
+    """
+    In-memory learner progress.
+    
+    Keeps the on-disk schema (ordered UUID lists, code map) but with O(1)
+    membership and per-chapter completed/skipped counters that are updated
+    incrementally. Supports the dict-style access the engine has always used
+    (progress["completed_tasks"], progress.get(...)).
+    
+    Args:
+        chapter_of: callable uuid -> chapter slug (or None); drives the counters.
+    """
+    __slots__ = ('current_step', 'completed_tasks', 'skipped_tasks', 'user_code', 'extra',
+                 '_chapter_of', 'chapter_completed', 'chapter_skipped')
+    
+    FIELDS = ('current_step', 'completed_tasks', 'skipped_tasks', 'user_code')
+    
+    def __init__(self, chapter_of=None):
+        self._chapter_of = chapter_of
+        self.chapter_completed = {} # chapter slug -> count
+        self.chapter_skipped = {} # chapter slug -> count
+        self.current_step = None
+        self.completed_tasks = UuidList(on_change=self._counter(self.chapter_completed))
+        self.skipped_tasks = UuidList(on_change=self._counter(self.chapter_skipped))
+        self.user_code = {}
+        self.extra = {} # Unknown keys, preserved round-trip
+    
+    def _counter(self, counts):
+        def on_change(uuid, delta):
+            chapter = self._chapter_of(uuid) if self._chapter_of else None
+            if chapter is not None:
+                counts[chapter] = counts.get(chapter, 0) + delta
+        return on_change
+    
+    @classmethod
+    def from_dict(cls, data, chapter_of=None):
+        data = validate_progress_data(data)
+        state = cls(chapter_of)
+        state.current_step = data.get("current_step")
+        state.completed_tasks.extend(data["completed_tasks"])
+        state.skipped_tasks.extend(data["skipped_tasks"])
+        state.user_code = data["user_code"]
+        state.extra = {k: v for k, v in data.items() if k not in cls.FIELDS}
+        return state
+    
+    def to_dict(self):
+        data = dict(self.extra)
+        data.update({
+            "current_step": self.current_step,
+            "completed_tasks": list(self.completed_tasks),
+            "skipped_tasks": list(self.skipped_tasks),
+            "user_code": self.user_code,
+        })
+        return data
+    
+    def reset(self):
+        self.current_step = None
+        self.completed_tasks.clear()
+        self.skipped_tasks.clear()
+        self.user_code = {}
+        self.extra = {}
+    
+    def recount(self, chapter_of=None):
+        """Rebuilds the per-chapter counters (e.g. after a curriculum reload)."""
+        if chapter_of is not None:
+            self._chapter_of = chapter_of
+        for counts, uuids in ((self.chapter_completed, self.completed_tasks),
+                              (self.chapter_skipped, self.skipped_tasks)):
+            counts.clear()
+            for uuid in uuids:
+                chapter = self._chapter_of(uuid) if self._chapter_of else None
+                if chapter is not None:
+                    counts[chapter] = counts.get(chapter, 0) + 1
+    
+    # --- dict-style access (engine/tests compatibility) ---
+    
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+    
+    def __setitem__(self, key, value):
+        if key == "completed_tasks" or key == "skipped_tasks":
+            target = getattr(self, key)
+            target.clear()
+            target.extend(value)
+        elif key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+    
+    def __contains__(self, key):
+        return key in self.FIELDS or key in self.extra
+    
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+    
+    def __eq__(self, other):
+        if isinstance(other, ProgressState):
+            other = other.to_dict()
+        return isinstance(other, dict) and self.to_dict() == other
+    
+    __hash__ = None
+
+
+def apply_event(progress, event):
+    """
+    Applies one journal event to a progress dict (in place).
+    Shared by the engine (live updates) and journal replay, so both agree.
+    """
+    op = event.get("op")
+    uuid = event.get("uuid")
+    
+    if op == "nav":
+        progress["current_step"] = event.get("step")
+    elif op == "complete":
+        if uuid not in progress["completed_tasks"]:
+            progress["completed_tasks"].append(uuid)
+        if uuid in progress["skipped_tasks"]:
+            progress["skipped_tasks"].remove(uuid)
+    elif op == "skip":
+        if uuid not in progress["skipped_tasks"]:
+            progress["skipped_tasks"].append(uuid)
+    elif op == "code":
+        progress["user_code"][str(uuid)] = event.get("code", "")
+    elif op == "reset":
+        if isinstance(progress, ProgressState):
+            progress.reset()
+        else:
+            progress.clear()
+            progress.update(get_default_progress())
+    else:
+        logging.warning(f"Unknown progress event ignored: {op!r}")
+
+
+class ProgressBackend:
+    """
+    Where a learner's progress lives.
+    
+    Backends persist the small events produced by the engine (see apply_event).
+    JournalProgressStore (progress.json + journal) is the default;
+    progress_sqlite.SqliteProgressBackend serves shared multi-learner hosts.
+    """
+    
+    def load(self):
+        """Returns the learner's progress as a dict (get_default_progress schema)."""
+        raise NotImplementedError
+    
+    def append(self, event, progress=None):
+        """Persists one event. `progress` is the state after the event."""
+        raise NotImplementedError
+    
+    def write_batch(self, events, state):
+        """
+        Applies each event to `state` and persists it. Called from ProgressWriter,
+        which calls sync() itself once the batch must become durable.
+        """
+        for event in events:
+            apply_event(state, event)
+            self.append(event, state)
+    
+    def sync(self):
+        """Makes previously appended events durable."""
+    
+    def compact(self, progress):
+        """Optional housekeeping with the full current state."""
+    
+    def close(self, progress=None):
+        """Flushes and releases resources."""
+
+
+class JournalProgressStore(ProgressBackend):
+    """Snapshot file + append-only event journal with batched fsync."""
+    
+    def __init__(self, snapshot_path, backup_path=None, journal_path=None,
+                 fsync_interval=None, compact_every=256, compact_bytes=256 * 1024):
+        self.snapshot_path = snapshot_path
+        self.backup_path = backup_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + '.journal'
+        self.fsync_interval = (config.Timing.PROGRESS_FSYNC_INTERVAL_SEC
+                               if fsync_interval is None else fsync_interval)
+        self.compact_every = compact_every
+        self.compact_bytes = compact_bytes
+        
+        self._seq = 0 # Last seq written (or replayed)
+        self._journal = None # Open append handle
+        self._pending_events = 0 # Events since the last compaction
+        self._unsynced = False
+        self._last_fsync = 0.0
+    
+    # --- Loading ---
+    
+    def _read_snapshot(self):
+        for path in (self.snapshot_path, self.backup_path):
+            if path and os.path.exists(path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        return json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    continue
+        return get_default_progress()
+    
+    def load(self):
+        """Returns the progress dict: last good snapshot + replayed journal."""
+        data = self._read_snapshot()
+        snapshot_seq = data.pop(SNAPSHOT_SEQ_KEY, 0) if isinstance(data, dict) else 0
+        progress = validate_progress_data(data)
+        
+        self._seq = snapshot_seq if isinstance(snapshot_seq, int) else 0
+        self._pending_events = 0
+        good_offset = 0
+        
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'rb') as f:
+                for raw in f:
+                    try:
+                        if not raw.endswith(b'\n'):
+                            raise ValueError("torn write")
+                        event = json.loads(raw)
+                        seq = event["seq"]
+                    except (ValueError, KeyError, TypeError):
+                        # Torn / corrupt tail from a crash: stop replay here
+                        logging.warning(f"Progress journal truncated at byte {good_offset}")
+                        break
+                    good_offset += len(raw)
+                    self._pending_events += 1
+                    if seq <= self._seq:
+                        continue # Already in the snapshot (crash during compaction)
+                    apply_event(progress, event)
+                    self._seq = seq
+            
+            # Drop the bad tail so new events are not appended after garbage
+            if good_offset != os.path.getsize(self.journal_path):
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(good_offset)
+        
+        return progress
+    
+    # --- Writing ---
+    
+    def _open_journal(self):
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        return self._journal
+    
+    def append(self, event, progress=None):
+        """
+        Appends one event. The line reaches the OS immediately; fsync is
+        batched to at most once per fsync_interval.
+        
+        Args:
+            progress: current progress dict; if given, the journal is compacted
+                      into a snapshot once it grows past the thresholds.
+        """
+        self._seq += 1
+        line = json.dumps(dict(event, seq=self._seq), ensure_ascii=False)
+        try:
+            journal = self._open_journal()
+            journal.write(line + '\n')
+            journal.flush()
+            self._unsynced = True
+            self._pending_events += 1
+            
+            if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self.sync()
+            
+            if progress is not None and (self._pending_events >= self.compact_every or
+                                         journal.tell() >= self.compact_bytes):
+                self.compact(progress)
+        except OSError as e:
+            logging.error(f"Failed to append progress event: {e}")
+    
+    def sync(self):
+        """fsyncs pending journal writes."""
+        if self._journal is not None and self._unsynced:
+            try:
+                os.fsync(self._journal.fileno())
+            except OSError as e:
+                logging.error(f"Failed to fsync progress journal: {e}")
+        self._unsynced = False
+        self._last_fsync = time.monotonic()
+    
+    def compact(self, progress):
+        """Writes a full snapshot atomically and empties the journal."""
+        data = progress.to_dict() if isinstance(progress, ProgressState) else dict(progress)
+        data[SNAPSHOT_SEQ_KEY] = self._seq
+        tmp_path = self.snapshot_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            # Keep the previous snapshot as a backup (rare: only on compaction)
+            if self.backup_path and os.path.exists(self.snapshot_path):
+                try:
+                    shutil.copy2(self.snapshot_path, self.backup_path)
+                except OSError: pass
+            
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logging.error(f"Failed to write progress snapshot: {e}")
+            return
+        
+        # Snapshot now covers every journaled seq
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        try:
+            open(self.journal_path, 'w').close()
+        except OSError: pass
+        self._pending_events = 0
+        self._unsynced = False
+    
+    def close(self, progress=None):
+        """Flushes the journal (and compacts it if progress is given)."""
+        if progress is not None and self._pending_events:
+            self.compact(progress)
+        self.sync()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+def coalesce_events(events):
+    """
+    Drops events made redundant by a later one in the same batch:
+    earlier "nav" events, and earlier "code" saves for the same lesson.
+    A "reset" is a barrier; nothing is merged across it.
+    """
+    kept = []
+    seen_nav = False
+    seen_code = set()
+    for event in reversed(events):
+        op = event.get("op")
+        if op == "reset":
+            seen_nav = False
+            seen_code = set()
+        elif op == "nav":
+            if seen_nav:
+                continue
+            seen_nav = True
+        elif op == "code":
+            key = str(event.get("uuid"))
+            if key in seen_code:
+                continue
+            seen_code.add(key)
+        kept.append(event)
+    kept.reverse()
+    return kept
+
+
+def create_progress_backend(user_data_dir, user_id=None, db_path=None):
+    """
+    Builds the configured backend (config.Progress / OCAGI_PROGRESS_* env vars).
+    JSON files in the user data dir are the default.
+    
+    Args:
+        user_id: learner id for the SQLite backend (default: OCAGI_PROGRESS_USER
+                 or the OS login name).
+        db_path: SQLite database to use when DB_PATH is unset (host mode passes
+                 one path shared by every learner; default: <user data dir>/progress.db).
+    """
+    journal = JournalProgressStore(
+        os.path.join(user_data_dir, config.System.FILENAME_PROGRESS),
+        backup_path=os.path.join(user_data_dir, config.System.FILENAME_PROGRESS_BACKUP),
+        journal_path=os.path.join(user_data_dir, config.System.FILENAME_PROGRESS_JOURNAL)
+    )
+    if config.Progress.BACKEND == "json":
+        return journal
+    if config.Progress.BACKEND == "sqlite":
+        import getpass
+        from progress_sqlite import SqliteProgressBackend
+        db_path = (config.Progress.DB_PATH or db_path or
+                   os.path.join(user_data_dir, config.System.FILENAME_PROGRESS_DB))
+        user_id = user_id or config.Progress.USER_ID or getpass.getuser()
+        # Existing JSON progress seeds the learner's first SQLite load
+        return SqliteProgressBackend(db_path, user_id, seed=journal)
+    raise ValueError(f"Unknown progress backend: {config.Progress.BACKEND!r}")
+
+
+# Live writers, flushed by flush_all() (exit paths and the crash hook)
+_active_writers = weakref.WeakSet()
+
+
+def flush_all(timeout=2.0):
+    """Blocks until every live ProgressWriter has persisted its queued events."""
+    for writer in list(_active_writers):
+        try:
+            writer.flush(timeout)
+        except Exception as e:
+            logging.error(f"Progress flush failed: {e}")
+
+
+def register_writer(writer):
+    """Adds another background writer (anything with flush(timeout)) to flush_all()."""
+    _active_writers.add(writer)
+
+
+atexit.register(flush_all)
+
+
+class ProgressWriter:
+    """
+    Persists progress events on a background thread.
+    
+    The UI thread only queues events (submit never touches the disk). The
+    worker waits a short debounce window so key-repeat navigation collapses
+    into one journal write. Written events are synced at most sync_delay
+    after the first of them was written (at once when flushing or closing),
+    so a quiet period never leaves acknowledged progress un-fsynced. It keeps
+    its own copy of the progress state for compaction, so it never reads the
+    dict the UI thread mutates.
+    """
+    
+    def __init__(self, store, progress, debounce=None, sync_delay=None):
+        self.store = store
+        self.debounce = config.Timing.PROGRESS_DEBOUNCE_SEC if debounce is None else debounce
+        self.sync_delay = config.Timing.PROGRESS_FSYNC_INTERVAL_SEC if sync_delay is None else sync_delay
+        # Plain-dict copy: the worker needs no indexes or counters
+        self._state = copy.deepcopy(progress.to_dict() if isinstance(progress, ProgressState) else progress)
+        
+        self._cond = threading.Condition()
+        self._pending = []
+        self._submitted = 0
+        self._written = 0
+        self._flush_requested = False
+        self._closing = False
+        
+        self._thread = threading.Thread(target=self._run, name="ProgressWriter", daemon=True)
+        self._thread.start()
+        _active_writers.add(self)
+    
+    def submit(self, event):
+        """Queues an event; returns immediately."""
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("ProgressWriter is closed")
+            self._pending.append(event)
+            self._submitted += 1
+            self._cond.notify_all()
+    
+    def _run(self):
+        unsynced = 0 # Events written to the store but not synced yet
+        sync_deadline = None
+        while True:
+            with self._cond:
+                timeout = None if sync_deadline is None else max(0.0, sync_deadline - time.monotonic())
+                self._cond.wait_for(lambda: self._pending or self._closing or self._flush_requested,
+                                    timeout=timeout)
+                if self._closing and not self._pending and not unsynced:
+                    return # Closing and drained
+                batch = []
+                if self._pending:
+                    # Debounce: gather follow-up events unless someone is waiting on us
+                    self._cond.wait_for(lambda: self._flush_requested or self._closing,
+                                        timeout=self.debounce)
+                    batch, self._pending = self._pending, []
+                urgent = self._flush_requested or self._closing
+            
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    logging.error(f"Progress writer failed: {e}")
+                unsynced += len(batch)
+                if sync_deadline is None:
+                    sync_deadline = time.monotonic() + self.sync_delay
+            
+            if unsynced and (urgent or time.monotonic() >= sync_deadline):
+                try:
+                    self.store.sync()
+                except Exception as e:
+                    logging.error(f"Progress sync failed: {e}")
+                with self._cond:
+                    self._written += unsynced
+                    if self._written >= self._submitted:
+                        self._flush_requested = False
+                    self._cond.notify_all()
+                unsynced, sync_deadline = 0, None
+    
+    def _write(self, batch):
+        # Coalesced events yield the same final state; each is applied before it
+        # is persisted so a compaction snapshot never runs ahead of the journal.
+        self.store.write_batch(coalesce_events(batch), self._state)
+    
+    def flush(self, timeout=None):
+        """Waits until everything submitted so far is synced to disk. Returns False on timeout."""
+        with self._cond:
+            target = self._submitted
+            if self._written >= target:
+                return True
+            self._flush_requested = True
+            self._cond.notify_all()
+            if not self._thread.is_alive():
+                return False
+            return self._cond.wait_for(lambda: self._written >= target, timeout=timeout)
+    
+    def close(self, timeout=None):
+        """Flushes, stops the worker and compacts the journal into a snapshot."""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        _active_writers.discard(self)
+        self.store.close(self._state)
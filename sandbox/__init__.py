@@ -3,6 +3,8 @@
 Sandbox Paketi - Güvenli kod çalıştırma ortamı.
 """
 from sandbox.executor import run_safe
+from sandbox.pool import SandboxPool
+from sandbox.scheduler import FairScheduler
 from sandbox.security import (
     SandboxSecurityError,
     get_safe_builtins,
@@ -26,6 +28,8 @@ from sandbox.vfs import MockFileSystem, MockFileHandle
 __all__ = [
     # Executor
     'run_safe',
+    'SandboxPool',
+    'FairScheduler',
     # Security
     'SandboxSecurityError',
     'get_safe_builtins',
@@ -3,15 +3,45 @@ import sys
 import io
 import contextlib
 
-def _worker_process(user_code, validator_script_path, result_queue):
+def _worker_process(user_code, validator_script_path, result_queue, validator_code=None,
+                    relative_memory_limit=False):
     """
     Bu fonksiyon ayrı bir işlemde (process) çalışır.
     """
+    result_queue.put(_execute_job(user_code, validator_script_path, validator_code,
+                                  relative_memory_limit))
+
+
+def _load_validator_module(validator_script_path, validator_code=None):
+    """Doğrulama modülünü paketlenmiş (marshal) koddan ya da dosyadan yükler."""
+    import importlib.util
+    import marshal
+    import types
+    
+    if validator_code is not None:
+        module = types.ModuleType("validation_mod")
+        exec(marshal.loads(validator_code), module.__dict__)
+        return module
+    
+    spec = importlib.util.spec_from_file_location("validation_mod", validator_script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _execute_job(user_code, validator_script_path, validator_code=None,
+                 relative_memory_limit=False):
+    """
+    Kodu korumalı scope'ta çalıştırır ve doğrular. Sonuç sözlüğünü döndürür.
+    
+    Kaynak limitleri (rlimit) işlemin tamamına uygulanır; bu yüzden yalnızca
+    tek kullanımlık bir alt işlemde çağrılmalıdır (run_safe / SandboxPool).
+    relative_memory_limit yalnızca fork ile açılan işlemlerde açılır (bkz. MemoryGuard).
+    """
     # 1. Güvenli Scope Hazırla (sandbox modülü ile)
     from sandbox.security import get_sandbox_scope
     from sandbox.guards import ResourceGuardian, ResourceLimitError
     from sandbox.vfs import MockFileSystem
-    import importlib.util
     import os
     
     fs = MockFileSystem()
@@ -23,6 +53,7 @@ def _worker_process(user_code, validator_script_path, result_queue):
     error_message = ""
     is_valid = False
     stdout_val = ""
+    limit_hit = False
 
     try:
         # 2. Kodu Çalıştır
@@ -30,7 +61,8 @@ def _worker_process(user_code, validator_script_path, result_queue):
             memory_limit_mb=100,
             cpu_time_limit_s=5,
             max_operations=2_000_000,
-            recursion_limit=500
+            recursion_limit=500,
+            relative_memory_limit=relative_memory_limit
         ):
             import contextlib
             with contextlib.redirect_stdout(output_capture):
@@ -47,15 +79,14 @@ def _worker_process(user_code, validator_script_path, result_queue):
              error_message = f"Yazım Hatası: {e.msg} Line {e.lineno}"
         elif isinstance(e, ResourceLimitError):
              error_message = str(e)
+             limit_hit = True
 
     # 3. Doğrulama
     if success:
-        if validator_script_path and os.path.exists(validator_script_path):
+        if validator_code is not None or (validator_script_path and os.path.exists(validator_script_path)):
             try:
                 # Load Validator Module Dynamically
-                spec = importlib.util.spec_from_file_location("validation_mod", validator_script_path)
-                val_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(val_module)
+                val_module = _load_validator_module(validator_script_path, validator_code)
                 
                 if hasattr(val_module, 'validate'):
                     # Validator scope üzerinde çalışır
@@ -73,20 +104,43 @@ def _worker_process(user_code, validator_script_path, result_queue):
             is_valid = False
             error_message = "SİSTEM HATASI: Doğrulama (validation.py) dosyası bulunamadı."
 
-    # Sonucu kuyruğa at
-    result_queue.put({
+    return {
         "success": success,
         "stdout": stdout_val,
         "is_valid": is_valid,
-        "error_message": error_message
-    })
+        "error_message": error_message,
+        "limit_hit": limit_hit  # Kaynak limitine takıldı (zamanlayıcı için)
+    }
+
+
+def _timeout_result(timeout):
+    return {
+        "success": False,
+        "stdout": "",
+        "is_valid": False,
+        "error_message": f"⏳ Zaman Aşımı ({timeout}s)",
+        "limit_hit": True
+    }
+
+
+def _crash_result():
+    # Alt işlemin ölmesi çoğunlukla bellek limitidir (RLIMIT_AS / OOM)
+    return {
+        "success": False,
+        "stdout": "",
+        "is_valid": False,
+        "error_message": "⚠️ Kritik İşlem Hatası",
+        "limit_hit": True
+    }
 
 
-def run_safe(user_code, validator_script_path, timeout=None):
+def run_safe(user_code, validator_script_path, timeout=None, validator_code=None):
     """
     Args:
         user_code: Kod stringi
         validator_script_path: Validator dosyasının tam yolu (str)
+        validator_code: Paketlenmiş müfredattan marshal edilmiş validator kodu (bytes);
+                        verilirse dosya yerine bu kullanılır
     """
     import config
     if timeout is None:
@@ -94,9 +148,11 @@ def run_safe(user_code, validator_script_path, timeout=None):
     import multiprocessing
     queue = multiprocessing.Queue()
     
+    # fork ile açılan işlem, ebeveynin thread arenalarını miras alır (bkz. MemoryGuard)
+    relative_memory_limit = multiprocessing.get_start_method() == 'fork'
     process = multiprocessing.Process(
         target=_worker_process,
-        args=(user_code, validator_script_path, queue)
+        args=(user_code, validator_script_path, queue, validator_code, relative_memory_limit)
     )
     process.start()
     process.join(timeout)
@@ -104,19 +160,9 @@ def run_safe(user_code, validator_script_path, timeout=None):
     if process.is_alive():
         process.terminate()
         process.join()
-        return {
-            "success": False,
-            "stdout": "",
-            "is_valid": False,
-            "error_message": f"⏳ Zaman Aşımı ({timeout}s)"
-        }
+        return _timeout_result(timeout)
     
     if not queue.empty():
         return queue.get()
     else:
-        return {
-            "success": False,
-            "stdout": "",
-            "is_valid": False,
-            "error_message": "⚠️ Kritik İşlem Hatası"
-        }
+        return _crash_result()
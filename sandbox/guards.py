@@ -112,16 +112,43 @@ class LoopGuard:
 # MEMORY GUARD - TRACEMALLOC İLE BELLEK TAKİBİ
 # =============================================================================
 
+def _current_address_space() -> Optional[int]:
+    """Sürecin o anki sanal bellek boyutu (byte); ölçülemezse None (/proc yok)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
 class MemoryGuard:
     """
     tracemalloc kullanarak bellek kullanımını takip eder.
     Unix sistemlerde resource.setrlimit ile hard limit koyar.
+    
+    Varsayılan olarak RLIMIT_AS mutlak bir sınırdır (memory_limit_mb).
+    
+    relative=True yalnızca fork ile açılan işlemler içindir (run_safe /
+    SandboxPool bunu başlatma yönteminden belirler): RLIMIT_AS sürecin tüm
+    adres alanını sayar ve böyle bir işlem ebeveyndeki thread'lerin ayırdığı
+    (kullanılmayan) malloc arenalarını da miras alır; bu durumda bütçe mevcut
+    adres alanının ÜZERİNE eklenir. Adres alanı ölçülemezse mutlak sınır
+    kullanılır.
     """
     
-    def __init__(self, memory_limit_mb: int = 50):
+    def __init__(self, memory_limit_mb: int = 50, relative: bool = False):
         self.memory_limit_bytes = memory_limit_mb * 1024 * 1024
+        self.relative = relative
         self._original_limit = None
     
+    def _address_space_limit(self) -> int:
+        """Uygulanacak RLIMIT_AS değeri (byte)."""
+        if self.relative:
+            current = _current_address_space()
+            if current is not None:
+                return current + self.memory_limit_bytes
+        return self.memory_limit_bytes
+    
     def enable(self):
         """Bellek takibini başlatır ve limitleri uygular."""
         # tracemalloc başlat (cross-platform)
@@ -134,10 +161,8 @@ class MemoryGuard:
                 # Mevcut limiti sakla
                 self._original_limit = resource.getrlimit(resource.RLIMIT_AS)
                 # Yeni limit uygula
-                resource.setrlimit(
-                    resource.RLIMIT_AS, 
-                    (self.memory_limit_bytes, self.memory_limit_bytes)
-                )
+                limit = self._address_space_limit()
+                resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
             except (ValueError, resource.error):
                 # Limit uygulanamadıysa devam et (bazı sistemlerde izin olmayabilir)
                 self._original_limit = None
@@ -255,6 +280,8 @@ class ResourceGuardian:
         max_operations: Maksimum işlem sayısı (döngü kontrolü)
         recursion_limit: Maksimum özyineleme derinliği
         enable_loop_guard: LoopGuard'ı aktif et (performans etkisi var)
+        relative_memory_limit: Bellek bütçesini mevcut adres alanının üzerine
+            ekle (yalnızca fork ile açılan işlemler; bkz. MemoryGuard)
     """
     
     def __init__(
@@ -263,9 +290,10 @@ class ResourceGuardian:
         cpu_time_limit_s: int = 5,
         max_operations: int = 2_000_000,  # 2M işlem - geniş tutuldu
         recursion_limit: int = 500,
-        enable_loop_guard: bool = True
+        enable_loop_guard: bool = True,
+        relative_memory_limit: bool = False
     ):
-        self.memory_guard = MemoryGuard(memory_limit_mb)
+        self.memory_guard = MemoryGuard(memory_limit_mb, relative=relative_memory_limit)
         self.cpu_guard = CPUGuard(cpu_time_limit_s)
         self.loop_guard = LoopGuard(max_operations) if enable_loop_guard else None
         self.recursion_guard = RecursionGuard(recursion_limit)
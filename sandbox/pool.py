@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Sandbox İşlem Havuzu
+run_safe her iş için yeni bir işlem başlatır ve bitmesini bekler. Toplu
+çalıştırmalarda (müfredat doğrulama vb.) bu maliyet, işlemleri önceden
+başlatıp hazır bekleterek gizlenir.
+
+ResourceGuardian rlimit'leri geri alınamaz şekilde uygular; bu yüzden her
+işlem TEK KULLANIMLIKTIR: iş alındığı anda yerine yenisi başlatılır.
+
+Not: Havuz arka plan thread'i kullanmaz. Thread'ler glibc'de büyük sanal
+bellek alanları (arena) ayırır ve fork ile açılan işlemler bunu miras alır;
+bu da sandbox'taki RLIMIT_AS sınırını daha kod çalışmadan aşar.
+"""
+import collections
+import multiprocessing
+import threading
+import time
+from multiprocessing.connection import wait
+
+from sandbox.executor import _execute_job, _timeout_result, _crash_result
+
+
+def _pool_worker(conn, relative_memory_limit=False):
+    """Hazır bekleyen işlem: tek bir iş alır, sonucu yollar ve çıkar."""
+    try:
+        job = conn.recv()
+    except (EOFError, OSError):
+        return
+    if job is None:
+        return
+    conn.send(_execute_job(*job, relative_memory_limit=relative_memory_limit))
+    conn.close()
+
+
+class SandboxPool:
+    """
+    Önceden başlatılmış tek kullanımlık sandbox işlemleri havuzu.
+    
+    Sonuç sözlükleri run_safe ile aynı biçimdedir; ek olarak işin çalışma
+    süresini 'elapsed' (saniye) anahtarında taşır.
+    
+    Havuz birden çok thread'den aynı anda kullanılabilir (bkz. host.py);
+    toplam eşzamanlı iş sayısı tüm çağıranlar için `size` ile sınırlıdır.
+    """
+
+    def __init__(self, size=None, timeout=None, context=None):
+        """
+        Args:
+            context: multiprocessing bağlamı (ör. get_context('spawn')). Thread
+                     çalıştıran süreçlerde fork yerine spawn kullanılmalıdır.
+        """
+        import config
+        self.size = max(1, size or multiprocessing.cpu_count())
+        self.timeout = timeout if timeout is not None else config.Timing.EXECUTION_TIMEOUT
+        self._ctx = context or multiprocessing
+        # fork ile açılan işlemler ebeveynin thread arenalarını miras alır (bkz. MemoryGuard)
+        self._relative_memory_limit = self._ctx.get_start_method() == 'fork'
+        self._closed = False
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle = collections.deque(self._spawn() for _ in range(self.size))
+
+    def _spawn(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_pool_worker, args=(child_conn, self._relative_memory_limit),
+                                    daemon=True)
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def _start_job(self, user_code, validator_script_path, validator_code=None):
+        """Hazır bir işleme işi yollar; havuzu hemen yeni bir işlemle tamamlar."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("SandboxPool kapatıldı")
+            worker = self._idle.popleft() if self._idle else self._spawn()
+        process, conn = worker
+        try:
+            conn.send((user_code, validator_script_path, validator_code))
+        except OSError:
+            pass  # İşlem ölmüş; _finish_job çökme olarak raporlar
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(self._spawn())
+        return process, conn
+
+    def _finish_job(self, process, conn, timed_out, timeout):
+        try:
+            result = _timeout_result(timeout) if timed_out else conn.recv()
+        except (EOFError, OSError):
+            result = _crash_result()
+        finally:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            conn.close()
+            self._slots.release()
+        return result
+
+    def imap_unordered(self, jobs, timeout=None):
+        """
+        (etiket, kod, validator_yolu[, validator_kodu]) işlerini en fazla `size`
+        paralel işlemde çalıştırır; (etiket, sonuç) çiftlerini bitiş sırasıyla üretir.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        jobs = iter(jobs)
+        running = {}  # conn -> (etiket, process, son_tarih, başlangıç)
+        exhausted = False
+        
+        try:
+            while True:
+                while not exhausted and len(running) < self.size:
+                    # Diğer thread'lerle paylaşılan kota: elinde iş varken bloklanmaz,
+                    # kendi işlerini beklemeye döner (kilitlenmeyi önler)
+                    if not self._slots.acquire(blocking=not running):
+                        break
+                    job = next(jobs, None)
+                    if job is None:
+                        self._slots.release()
+                        exhausted = True
+                        break
+                    tag, *job_args = job
+                    started = time.perf_counter()
+                    try:
+                        process, conn = self._start_job(*job_args)
+                    except BaseException:
+                        self._slots.release()
+                        raise
+                    running[conn] = (tag, process, time.monotonic() + timeout, started)
+            
+                if not running:
+                    return
+            
+                # poll() gibi wait() de işlem ölünce (EOF) döner
+                next_deadline = min(entry[2] for entry in running.values())
+                ready = set(wait(list(running), max(0.0, next_deadline - time.monotonic())))
+                now = time.monotonic()
+            
+                for conn in list(running):
+                    tag, process, deadline, started = running[conn]
+                    if conn not in ready and now < deadline:
+                        continue
+                    del running[conn]
+                    result = self._finish_job(process, conn, conn not in ready, timeout)
+                    result["elapsed"] = time.perf_counter() - started
+                    yield tag, result
+        finally:
+            # Tüketici erken bıraktıysa yarım kalan işleri sonlandır, kotayı geri ver
+            for conn, (tag, process, deadline, started) in running.items():
+                self._finish_job(process, conn, True, timeout)
+
+    def run(self, user_code, validator_script_path, timeout=None, validator_code=None):
+        """Tek bir işi çalıştırır (run_safe ile aynı imza)."""
+        job = (None, user_code, validator_script_path, validator_code)
+        for _, result in self.imap_unordered([job], timeout):
+            return result
+
+    def close(self):
+        """Boştaki işlemleri kapatır."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            idle, self._idle = list(self._idle), collections.deque()
+        for process, conn in idle:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            process.join(1.0)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
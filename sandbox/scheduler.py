@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Adil Paylaşımlı Sandbox Zamanlayıcısı
+
+Birçok öğrenci aynı sandbox işçilerini paylaştığında (host.py, server.py),
+sonsuz döngü gönderen tek bir öğrenci her işte bir işçiyi 5 saniye boyunca
+tutarak herkesi bekletebilir. FairScheduler çalıştırıcının önüne geçer:
+
+- Her öğrencinin kendi kuyruğu vardır; işçiler boşaldıkça kuyruklar arasında
+  ağırlıklı round-robin ile iş dağıtılır (ağırlık w: turda w iş).
+- Bir öğrenci aynı anda en fazla `per_learner` işçi tutabilir.
+- Art arda `cooldown_after` işi limite takılan (zaman aşımı, bellek...)
+  öğrencinin kuyruğu `cooldown_sec` boyunca bekletilir.
+
+Ayrı bir dağıtıcı thread yoktur: run() çağıran thread sırası gelene kadar
+bekler, işi kendisi çalıştırır ve çıkarken sıradaki işleri uyandırır.
+"""
+import time
+import logging
+import threading
+import collections
+
+import config
+
+
+def _busy_result():
+    return {
+        "success": False,
+        "stdout": "",
+        "is_valid": False,
+        "error_message": "⏳ Çok fazla bekleyen gönderiniz var, biraz bekleyip tekrar deneyin.",
+        "limit_hit": False
+    }
+
+
+class _Job:
+    __slots__ = ('granted',)
+
+    def __init__(self):
+        self.granted = False
+
+
+class FairScheduler:
+    """
+    Öğrenciler arası adil iş dağıtımı.
+
+    `execute(user_code, validator_path, validator_code=None)` çağrısı (run_safe,
+    SandboxPool.run...) en fazla `workers` eşzamanlı işle sınırlanır.
+    """
+
+    def __init__(self, execute, workers, per_learner=None, weights=None,
+                 cooldown_after=None, cooldown_sec=None, max_pending=None,
+                 clock=time.monotonic):
+        self._execute = execute
+        self.workers = max(1, workers)
+        self.per_learner = per_learner or config.Scheduler.PER_LEARNER_CONCURRENCY
+        self.cooldown_after = cooldown_after or config.Scheduler.COOLDOWN_AFTER_LIMIT_HITS
+        self.cooldown_sec = cooldown_sec if cooldown_sec is not None else config.Scheduler.COOLDOWN_SEC
+        self.max_pending = max_pending or config.Scheduler.MAX_PENDING_PER_LEARNER
+        self._clock = clock
+        self._weights = dict(weights or {})
+
+        self._cond = threading.Condition()
+        self._queues = {}  # öğrenci -> deque[_Job]
+        self._ring = collections.deque()  # bekleyen işi olan öğrenciler, tur sırasıyla
+        self._turns = {}  # öğrenci -> bu turda kalan hak
+        self._running = collections.Counter()
+        self._recent = {}  # öğrenci -> son işlerin limit bayrakları
+        self._cooldown_until = {}
+        self.active = 0
+        self.waiting = 0
+        self.counters = collections.Counter()
+
+    def set_weight(self, learner, weight):
+        with self._cond:
+            self._weights[learner] = max(1, int(weight))
+
+    def _weight(self, learner):
+        return self._weights.get(learner, 1)
+
+    def cooling_down(self, learner):
+        with self._cond:
+            return self._cooldown_until.get(learner, 0) > self._clock()
+
+    # --- dağıtım (kilit altında) ---
+
+    def _eligible(self, learner, now):
+        return (self._running[learner] < self.per_learner
+                and self._cooldown_until.get(learner, 0) <= now)
+
+    def _pick(self, now):
+        """Ağırlıklı round-robin: sıradaki uygun öğrenciyi seçer."""
+        for _ in range(len(self._ring)):
+            learner = self._ring[0]
+            if self._eligible(learner, now):
+                turns = self._turns.get(learner, self._weight(learner)) - 1
+                if turns <= 0:
+                    self._ring.rotate(-1)
+                    turns = self._weight(learner)
+                self._turns[learner] = turns
+                return learner
+            self._ring.rotate(-1)
+        return None
+
+    def _dispatch(self):
+        now = self._clock()
+        granted = False
+        while self.active < self.workers and self._ring:
+            learner = self._pick(now)
+            if learner is None:
+                break
+            queue = self._queues[learner]
+            queue.popleft().granted = True
+            if not queue:
+                del self._queues[learner]
+                self._ring.remove(learner)
+                self._turns.pop(learner, None)
+            self.active += 1
+            self.waiting -= 1
+            self._running[learner] += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _wake_timeout(self):
+        """Bekleyen bir öğrencinin cezası bitene kadar kalan süre (yoksa None)."""
+        now = self._clock()
+        ends = [self._cooldown_until[l] - now for l in self._ring
+                if self._cooldown_until.get(l, 0) > now]
+        return max(0.0, min(ends)) if ends else None
+
+    def _note_result(self, learner, result):
+        hit = result is None or bool(result.get("limit_hit"))
+        self.counters["limit_hits" if hit else "completed"] += 1
+        recent = self._recent.get(learner)
+        if recent is None:
+            recent = self._recent[learner] = collections.deque(maxlen=self.cooldown_after)
+        recent.append(hit)
+        if len(recent) == self.cooldown_after and all(recent):
+            recent.clear()
+            self._cooldown_until[learner] = self._clock() + self.cooldown_sec
+            self.counters["cooldowns"] += 1
+            logging.info(f"Sandbox scheduler: learner {learner!r} cooling down for {self.cooldown_sec}s")
+
+    # --- genel API ---
+
+    def run(self, learner, user_code, validator_script_path, validator_code=None):
+        """İşi öğrencinin kuyruğuna koyar, sırası gelince çalıştırır ve sonucu döndürür."""
+        job = _Job()
+        with self._cond:
+            queue = self._queues.get(learner)
+            if queue is not None and len(queue) >= self.max_pending:
+                self.counters["rejected"] += 1
+                return _busy_result()
+            if queue is None:
+                queue = self._queues[learner] = collections.deque()
+                self._ring.append(learner)
+            queue.append(job)
+            self.waiting += 1
+            while True:
+                self._dispatch()
+                if job.granted:
+                    break
+                self._cond.wait(self._wake_timeout())
+
+        result = None
+        try:
+            result = self._execute(user_code, validator_script_path, validator_code=validator_code)
+            return result
+        finally:
+            with self._cond:
+                self.active -= 1
+                self._running[learner] -= 1
+                if not self._running[learner]:
+                    del self._running[learner]
+                self._note_result(learner, result)
+                self._dispatch()
+                self._cond.notify_all()
+
+    def executor_for(self, learner):
+        """Tek öğrenciye bağlı, run_safe imzalı çalıştırıcı (SimulationEngine için)."""
+        def execute(user_code, validator_script_path, validator_code=None):
+            return self.run(learner, user_code, validator_script_path, validator_code)
+        return execute
+
+    def stats(self):
+        with self._cond:
+            now = self._clock()
+            return {
+                "active": self.active,
+                "waiting": self.waiting,
+                "learners_waiting": len(self._ring),
+                "cooling_down": sum(1 for until in self._cooldown_until.values() if until > now),
+                **{key: self.counters[key]
+                   for key in ("completed", "limit_hits", "rejected", "cooldowns")},
+            }
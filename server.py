@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+Grading HTTP service (stdlib only).
+
+Serves lesson listings and code grading over HTTP so a classroom can run from
+one machine: `python3 main.py --serve`.
+
+    GET  /lessons            -> lesson list (no solutions)
+    GET  /lessons/<uuid>     -> one lesson's task text and hint
+    POST /submit             -> {"lesson": "<uuid>", "code": "..."} -> grading result
+    GET  /metrics            -> queue depth, counters, latency percentiles
+    GET  /health             -> {"status": "ok"}
+
+At most `workers + queue_size` submissions are admitted at once; the rest
+are refused immediately with 429 and a Retry-After estimate instead of piling
+up behind the sandbox. Admitted submissions wait in a FairScheduler (one queue
+per learner, see sandbox/scheduler.py) for one of `workers` warm SandboxPool
+processes.
+"""
+import os
+import json
+import math
+import time
+import asyncio
+import logging
+import threading
+import collections
+import concurrent.futures
+from http import HTTPStatus
+
+import config
+
+PERCENTILES = (50, 95, 99)
+
+
+class HttpError(Exception):
+    """Turns into an HTTP error response with a JSON body."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class LatencyWindow:
+    """Latencies of the most recent submissions, for /metrics percentiles."""
+
+    def __init__(self, size=None):
+        self._samples = collections.deque(maxlen=size or config.Server.LATENCY_WINDOW)
+        self._lock = threading.Lock()  # Fed from grading threads too
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def _snapshot(self):
+        with self._lock:
+            return list(self._samples)
+
+    def mean(self):
+        samples = self._snapshot()
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def percentiles(self):
+        """Nearest-rank percentiles in milliseconds (None while empty)."""
+        ordered = sorted(self._snapshot())
+        result = {}
+        for p in PERCENTILES:
+            if ordered:
+                rank = max(1, math.ceil(p / 100 * len(ordered)))
+                result[f"p{p}"] = round(ordered[rank - 1] * 1000, 2)
+            else:
+                result[f"p{p}"] = None
+        return result
+
+
+def lesson_summary(lesson):
+    return {
+        "uuid": lesson.uuid,
+        "index": lesson.index,
+        "title": lesson.title,
+        "chapter": lesson.chapter_slug,
+        "category": lesson.category,
+        "tags": list(lesson.tags),
+    }
+
+
+async def read_request(reader):
+    """
+    Parses one HTTP/1.1 request. Returns (method, path, headers, body), or None
+    when the client closed the connection between requests.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, _version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', '0'))
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+    if length > config.Server.MAX_BODY_BYTES:
+        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target.split('?', 1)[0], headers, body
+
+
+def render_response(status, payload, headers=None, keep_alive=True):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    status = HTTPStatus(status)
+    lines = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        "Content-Type: application/json; charset=utf-8",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
+
+
+class GradingService:
+    """Bounded admission in front of a fair scheduler and a warm sandbox pool."""
+
+    def __init__(self, curriculum, executor=None, workers=None, queue_size=None, scheduler=None):
+        """
+        Args:
+            curriculum: loaded CurriculumManager (frozen: the service never reloads it).
+            executor: callable(user_code, validator_path, validator_code=None) -> result
+                      dict; defaults to a SandboxPool of `workers` processes.
+            workers: concurrent gradings (default: config.Server.WORKERS or CPU count).
+            queue_size: submissions allowed to wait; beyond that -> 429.
+            scheduler: FairScheduler options (dict), e.g. {"cooldown_sec": 30}.
+        """
+        import multiprocessing
+        from sandbox.scheduler import FairScheduler
+        curriculum.freeze()
+        self.curriculum = curriculum
+        self.workers = workers or config.Server.WORKERS or multiprocessing.cpu_count()
+        self.queue_size = queue_size or config.Server.QUEUE_SIZE
+
+        self.pool = None
+        if executor is None:
+            from sandbox.pool import SandboxPool
+            # The service runs threads; spawned workers don't inherit their arenas
+            self.pool = SandboxPool(self.workers, context=multiprocessing.get_context('spawn'))
+            executor = self._run_in_pool
+        self._execute = executor
+        # Per-learner queues so one learner's infinite loops can't starve the class
+        self.scheduler = FairScheduler(self._timed_execute, self.workers, **(scheduler or {}))
+
+        self.latency = LatencyWindow()
+        self.service_time = LatencyWindow()
+        self.counters = collections.Counter()
+        self.outstanding = 0
+        self.started_at = time.monotonic()
+        self._threads = None
+        self._server = None
+
+    def _run_in_pool(self, user_code, validator_path, validator_code=None):
+        return self.pool.run(user_code, validator_path, validator_code=validator_code)
+
+    def _timed_execute(self, user_code, validator_path, validator_code=None):
+        started = time.monotonic()
+        result = dict(self._execute(user_code, validator_path, validator_code=validator_code))
+        self.service_time.add(time.monotonic() - started)
+        result["_started"] = started
+        return result
+
+    # --- lifecycle ---
+
+    async def start(self, host=None, port=None):
+        """Starts the grading threads and the listening socket. Returns the bound port."""
+        # scheduler.run blocks while a submission waits its turn and while it runs
+        self._threads = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers + self.queue_size, thread_name_prefix='grader')
+        self._server = await asyncio.start_server(
+            self.handle_connection,
+            host if host is not None else config.Server.HOST,
+            port if port is not None else config.Server.PORT)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._threads is not None:
+            self._threads.shutdown(wait=True)
+        if self.pool is not None:
+            self.pool.close()
+
+    # --- grading ---
+
+    def retry_after(self):
+        """Seconds until the current backlog should have drained (at least 1)."""
+        per_job = self.service_time.mean() or config.Timing.EXECUTION_TIMEOUT
+        return max(1, math.ceil(self.scheduler.waiting * per_job / self.workers))
+
+    def _too_busy(self, message):
+        self.counters["rejected"] += 1
+        return HttpError(HTTPStatus.TOO_MANY_REQUESTS, message,
+                         {"Retry-After": str(self.retry_after())})
+
+    async def submit(self, lesson_uuid, code, learner):
+        lesson = self.curriculum.get_lesson_by_uuid(lesson_uuid)
+        if lesson is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"unknown lesson: {lesson_uuid}")
+        if self.outstanding >= self.workers + self.queue_size:
+            raise self._too_busy("grading queue is full")
+
+        validator_path = lesson.validator_script
+        if not (validator_path and os.path.exists(validator_path)):
+            validator_path = None
+
+        enqueued = time.monotonic()
+        self.outstanding += 1
+        self.counters["accepted"] += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._threads, self.scheduler.run,
+                learner, code, validator_path, lesson.get_validator_code())
+        finally:
+            self.outstanding -= 1
+        if "_started" not in result:
+            # Refused by the scheduler: this learner already has too much pending
+            self.counters["accepted"] -= 1
+            raise self._too_busy("too many pending submissions for this learner")
+
+        elapsed = time.monotonic() - enqueued
+        self.latency.add(elapsed)
+        self.counters["passed" if result.get("is_valid") else "failed"] += 1
+        return {
+            "lesson": lesson.uuid,
+            "is_valid": bool(result.get("is_valid")),
+            "stdout": result.get("stdout", ""),
+            "error_message": result.get("error_message"),
+            "queue_ms": round((result["_started"] - enqueued) * 1000, 2),
+            "elapsed_ms": round(elapsed * 1000, 2),
+        }
+
+    def metrics(self):
+        scheduler = self.scheduler.stats()
+        return {
+            "queue_depth": scheduler["waiting"],
+            "queue_capacity": self.queue_size,
+            "in_flight": scheduler["active"],
+            "workers": self.workers,
+            "submissions": {key: self.counters[key]
+                            for key in ("accepted", "rejected", "passed", "failed")},
+            "scheduler": {key: scheduler[key]
+                          for key in ("learners_waiting", "cooling_down", "limit_hits", "cooldowns")},
+            "latency_ms": self.latency.percentiles(),
+            "latency_samples": len(self.latency),
+            "uptime_sec": round(time.monotonic() - self.started_at, 1),
+        }
+
+    # --- HTTP ---
+
+    async def route(self, method, path, body, peer=None):
+        if path == "/health" and method == "GET":
+            return {"status": "ok"}
+        if path == "/metrics" and method == "GET":
+            return self.metrics()
+        if path == "/lessons" and method == "GET":
+            return {"lessons": [lesson_summary(l) for l in self.curriculum.lessons]}
+        if path.startswith("/lessons/") and method == "GET":
+            lesson = self.curriculum.get_lesson_by_uuid(path[len("/lessons/"):])
+            if lesson is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, "unknown lesson")
+            data = lesson_summary(lesson)
+            data.update(description=lesson.description, hint=lesson.hint)
+            return data
+        if path == "/submit":
+            if method != "POST":
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "use POST", {"Allow": "POST"})
+            try:
+                request = json.loads(body.decode('utf-8'))
+            except (ValueError, UnicodeDecodeError):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "body must be JSON")
+            if not isinstance(request, dict) or not isinstance(request.get("code"), str) \
+                    or not isinstance(request.get("lesson"), str):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "expected {\"lesson\": str, \"code\": str}")
+            # Fair-share key: explicit learner id, else the client address
+            learner = str(request.get("learner") or peer or "anonymous")
+            return await self.submit(request["lesson"], request["code"], learner)
+        raise HttpError(HTTPStatus.NOT_FOUND, "not found")
+
+    async def handle_connection(self, reader, writer):
+        peer = (writer.get_extra_info('peername') or ("anonymous",))[0]
+        try:
+            while True:
+                keep_alive = True
+                try:
+                    request = await asyncio.wait_for(read_request(reader),
+                                                     config.Server.READ_TIMEOUT_SEC)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                    response = render_response(HTTPStatus.OK, await self.route(method, path, body, peer),
+                                               keep_alive=keep_alive)
+                except HttpError as e:
+                    # Request framing may be broken after a parse error: close
+                    keep_alive = keep_alive and e.status not in (HTTPStatus.BAD_REQUEST,
+                                                                 HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    response = render_response(e.status, {"error": e.message}, e.headers, keep_alive)
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception:
+            logging.exception("HTTP connection failed")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(host=None, port=None, workers=None, queue_size=None):
+    from curriculum_manager import CurriculumManager
+    cm = CurriculumManager(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'curriculum'))
+    cm.load()
+    service = GradingService(cm, workers=workers, queue_size=queue_size)
+    bound = await service.start(host, port)
+    print(f"Python Ocağı değerlendirme servisi: http://{host or config.Server.HOST}:{bound} "
+          f"({service.workers} işçi, kuyruk {service.queue_size})", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def run_server(host=None, port=None, workers=None, queue_size=None):
+    """Entry point for `main.py --serve`."""
+    import multiprocessing
+    try:
+        multiprocessing.set_start_method('spawn', force=True)
+    except RuntimeError:
+        pass
+    try:
+        asyncio.run(serve(host, port, workers, queue_size))
+    except KeyboardInterrupt:
+        return 130
+    return 0
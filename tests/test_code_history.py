@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the delta-compressed code history store.
+"""
+import pytest
+import sys
+import os
+import random
+
+# Ensure project root is in path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_history import CodeHistory, make_delta, apply_delta
+
+
+def test_delta_round_trip():
+    rng = random.Random(7)
+    old = [f"satir {i}" for i in range(30)]
+    for _ in range(50):
+        new = list(old)
+        for _ in range(rng.randint(1, 5)):
+            i = rng.randrange(len(new) + 1)
+            action = rng.choice(("ekle", "sil", "degistir"))
+            if action == "ekle" or not new:
+                new.insert(i, f"yeni {rng.random()}")
+            elif action == "sil":
+                del new[min(i, len(new) - 1)]
+            else:
+                new[min(i, len(new) - 1)] += " # düzeltildi"
+        assert apply_delta(old, make_delta(old, new)) == new
+        old = new
+
+
+def test_history_records_and_recalls(tmp_path):
+    history = CodeHistory(str(tmp_path), keyframe_every=3)
+    versions = [f"x = {i}\nprint(x)" for i in range(7)]
+    for code in versions:
+        history.record("u-1", code)
+    history.record("u-1", versions[-1])  # Identical resubmission is not stored
+    
+    assert history.previous("u-1") == versions[-1]
+    assert history.previous("u-1", 3) == versions[-3]
+    assert history.previous("u-1", 8) is None
+    
+    # A fresh instance reads the file lazily, only for the requested lesson
+    reopened = CodeHistory(str(tmp_path), keyframe_every=3)
+    assert reopened._cache == {}
+    assert reopened.versions("u-1") == versions
+    assert list(reopened._cache) == ["u-1"]
+    assert reopened.versions("u-2") == []
+
+
+def test_retention_keeps_latest_versions(tmp_path):
+    history = CodeHistory(str(tmp_path), max_versions=4, keyframe_every=2)
+    for i in range(10):
+        history.record("u-1", f"print({i})")
+    
+    expected = [f"print({i})" for i in range(6, 10)]
+    assert history.versions("u-1") == expected
+    assert CodeHistory(str(tmp_path), max_versions=4, keyframe_every=2).versions("u-1") == expected
+
+
+def test_retention_rewrites_once_per_segment(tmp_path, monkeypatch):
+    """Past the cap, the file is rewritten once per keyframe segment, not on every submission."""
+    history = CodeHistory(str(tmp_path), max_versions=4, keyframe_every=3)
+    rewrites = []
+    real_replace = os.replace
+    monkeypatch.setattr(os, "replace", lambda *a: (rewrites.append(a), real_replace(*a)))
+    
+    for i in range(40):
+        history.record("u-1", f"print({i})")
+    history.flush()
+    
+    assert 9 <= len(rewrites) <= 12  # ~(40 - 4) / 3
+    expected = [f"print({i})" for i in range(36, 40)]
+    assert history.versions("u-1") == expected
+    assert CodeHistory(str(tmp_path), max_versions=4, keyframe_every=3).versions("u-1") == expected
+
+
+def test_torn_tail_is_cut_before_new_records(tmp_path):
+    history = CodeHistory(str(tmp_path), max_versions=3, keyframe_every=2)
+    for i in range(1, 4):
+        history.record("u-1", f"a={i}")
+    history.close()
+    path = os.path.join(tmp_path, "u-1.hist")
+    with open(path, 'r+b') as f:  # Crash mid-write: the last record is cut short
+        f.truncate(os.path.getsize(path) - 3)
+    
+    history = CodeHistory(str(tmp_path), max_versions=3, keyframe_every=2)
+    assert history.versions("u-1") == ["a=1", "a=2"]
+    for i in range(3, 8):
+        history.record("u-1", f"a={i}")
+    history.close()
+    
+    expected = [f"a={i}" for i in range(5, 8)]
+    assert CodeHistory(str(tmp_path), max_versions=3, keyframe_every=2).versions("u-1") == expected
+
+
+def test_record_does_not_write_on_caller_thread(tmp_path):
+    history = CodeHistory(str(tmp_path))
+    with history._lock:  # Worker cannot write while the test holds the lock
+        history.record("u-1", "print(1)")
+        assert os.listdir(tmp_path) == []
+    assert history.previous("u-1") == "print(1)"
+    history.close()
+    with pytest.raises(RuntimeError):
+        history.record("u-1", "print(2)")
+
+
+def test_full_course_history_stays_small(tmp_path):
+    """~100 lessons x 10 incremental attempts must stay within a few hundred KB."""
+    history = CodeHistory(str(tmp_path))
+    for lesson in range(100):
+        lines = [f"# Görev {lesson}", "sayilar = [1, 2, 3]"]
+        for attempt in range(10):
+            lines.append(f"print(sum(sayilar) * {attempt})  # deneme {attempt}")
+            history.record(f"u-{lesson}", "\n".join(lines))
+    assert history.flush(timeout=10.0)
+    
+    total = sum(os.path.getsize(os.path.join(tmp_path, name)) for name in os.listdir(tmp_path))
+    assert total < 300 * 1024
+
+
+def test_clear_removes_history(tmp_path):
+    history = CodeHistory(str(tmp_path))
+    history.record("u-1", "print(1)")
+    history.clear()
+    assert history.versions("u-1") == []
+    assert os.listdir(tmp_path) == []
@@ -200,3 +200,134 @@ class TestCurriculumManager:
         manager.load()
         
         assert manager.get_total_lessons() == 2
+    
+    def test_next_prev_navigation(self, mock_curriculum):
+        """Test next/prev navigation uses stored ordinal positions."""
+        manager = CurriculumManager(str(mock_curriculum))
+        manager.load()
+        
+        first, second = manager.lessons
+        assert first.index == 0
+        assert second.index == 1
+        assert manager.get_lesson_position("uuid-second-lesson") == 1
+        
+        assert manager.get_next_lesson("uuid-first-lesson") is second
+        assert manager.get_next_lesson("uuid-second-lesson") is None
+        assert manager.get_prev_lesson("uuid-second-lesson") is first
+        assert manager.get_prev_lesson("uuid-first-lesson") is None
+        assert manager.get_next_lesson("non-existent") is None
+    
+    def test_chapter_boundaries(self, mock_curriculum):
+        """Test chapter ranges are precomputed from the manifest."""
+        manager = CurriculumManager(str(mock_curriculum))
+        manager.load()
+        
+        # 02_stringler has no folder on disk, so only one chapter is indexed
+        assert [c.slug for c in manager.chapters] == ["01_temeller"]
+        chapter = manager.get_chapter("01_temeller")
+        assert (chapter.start, chapter.end) == (0, 2)
+        assert chapter.title == "Temeller"
+        assert len(chapter) == 2
+        assert manager.lessons[0] in chapter
+        assert manager.get_lesson_chapter(manager.lessons[1]) is chapter
+        assert manager.get_chapter_lessons("01_temeller") == tuple(manager.lessons)
+        assert manager.get_chapter_lessons("missing") == ()
+    
+    def test_secondary_indexes(self, tmp_path):
+        """Test tag, category and type inverted indexes."""
+        curriculum_dir = tmp_path / "curriculum"
+        chapter = curriculum_dir / "01_temeller"
+        chapter.mkdir(parents=True)
+        (curriculum_dir / "manifest.json").write_text(
+            json.dumps({"chapters": [{"slug": "01_temeller", "title": "Temeller"}]}),
+            encoding="utf-8"
+        )
+        lessons = [
+            {"id": "001_a", "uuid": "u-a", "category": "Temel", "tags": ["print", "cikti"]},
+            {"id": "002_b", "uuid": "u-b", "category": "Temel", "tags": ["print"], "type": "quiz"},
+            {"id": "003_c", "uuid": "u-c", "tags": ["degisken"]},
+        ]
+        for data in lessons:
+            lesson_dir = chapter / data["id"]
+            lesson_dir.mkdir()
+            (lesson_dir / "task.json").write_text(json.dumps(data), encoding="utf-8")
+        
+        manager = CurriculumManager(str(curriculum_dir))
+        manager.load()
+        
+        assert [l.uuid for l in manager.get_lessons_by_tag("print")] == ["u-a", "u-b"]
+        assert [l.uuid for l in manager.get_lessons_by_tag("cikti")] == ["u-a"]
+        assert manager.get_lessons_by_tag("yok") == ()
+        # Missing category falls back to the chapter title
+        assert [l.uuid for l in manager.get_lessons_by_category("Temeller")] == ["u-c"]
+        assert [l.uuid for l in manager.get_lessons_by_category("Temel")] == ["u-a", "u-b"]
+        assert [l.uuid for l in manager.get_lessons_by_type("quiz")] == ["u-b"]
+        assert [l.uuid for l in manager.get_lessons_by_type("code")] == ["u-a", "u-c"]
+
+    @staticmethod
+    def _touch(path):
+        """Bumps mtime explicitly; filesystem timestamp granularity may be coarse."""
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def test_reload_changed_reparses_only_edited(self, mock_curriculum):
+        """Test hot-reload re-parses edited lessons and reuses the rest."""
+        manager = CurriculumManager(str(mock_curriculum))
+        manager.load()
+        first = manager.get_lesson_by_uuid("uuid-first-lesson")
+        second = manager.get_lesson_by_uuid("uuid-second-lesson")
+        
+        assert manager.reload_changed() == set()
+        
+        task_file = mock_curriculum / "01_temeller" / "002_second_lesson" / "task.json"
+        data = json.loads(task_file.read_text(encoding="utf-8"))
+        data["title"] = "Renamed"
+        task_file.write_text(json.dumps(data), encoding="utf-8")
+        self._touch(task_file)
+        
+        assert manager.reload_changed() == {"uuid-second-lesson"}
+        assert manager.get_lesson_by_uuid("uuid-first-lesson") is first
+        reloaded = manager.get_lesson_by_uuid("uuid-second-lesson")
+        assert reloaded is not second
+        assert reloaded.title == "Renamed"
+        assert reloaded.index == 1
+        assert manager.get_chapter("01_temeller").lessons == (first, reloaded)
+
+    def test_reload_changed_added_and_removed(self, mock_curriculum):
+        """Test hot-reload picks up new and deleted lesson folders."""
+        import shutil
+        manager = CurriculumManager(str(mock_curriculum))
+        manager.load()
+        first = manager.get_lesson_by_uuid("uuid-first-lesson")
+        
+        chapter = mock_curriculum / "01_temeller"
+        new_lesson = chapter / "000_intro"
+        new_lesson.mkdir()
+        (new_lesson / "task.json").write_text(json.dumps({
+            "id": "000_intro", "uuid": "uuid-intro", "title": "Intro"
+        }), encoding="utf-8")
+        shutil.rmtree(chapter / "002_second_lesson")
+        self._touch(chapter)
+        
+        assert manager.reload_changed() == {"uuid-intro", "uuid-second-lesson"}
+        assert [l.uuid for l in manager.lessons] == ["uuid-intro", "uuid-first-lesson"]
+        assert manager.get_lesson_by_uuid("uuid-first-lesson").numeric_id == 2
+        assert manager.get_lesson_by_uuid("uuid-second-lesson") is None
+        # The moved lesson is a copy; the one held from the old snapshot is untouched
+        assert manager.get_lesson_by_uuid("uuid-first-lesson") is not first
+        assert (first.index, first.numeric_id) == (0, 1)
+
+    def test_reload_changed_picks_up_edited_validator(self, mock_curriculum):
+        """Test edited validation.py is re-imported after hot-reload."""
+        manager = CurriculumManager(str(mock_curriculum))
+        manager.load()
+        lesson = manager.get_lesson_by_uuid("uuid-first-lesson")
+        assert manager.get_validator_function(lesson)(None, "") is True
+        
+        validator_file = mock_curriculum / "01_temeller" / "001_first_lesson" / "validation.py"
+        validator_file.write_text("def validate(scope, output): return 'Hata'")
+        self._touch(validator_file)
+        
+        assert manager.reload_changed() == {"uuid-first-lesson"}
+        lesson = manager.get_lesson_by_uuid("uuid-first-lesson")
+        assert manager.get_validator_function(lesson)(None, "") == "Hata"
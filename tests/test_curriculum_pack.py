@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the packed curriculum archive (curriculum_pack + CurriculumManager).
+"""
+import pytest
+import sys
+import os
+import json
+
+# Ensure project root is in path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from curriculum_manager import CurriculumManager
+from curriculum_pack import write_pack, CurriculumPack, PackError
+
+
+@pytest.fixture
+def curriculum_dir(tmp_path):
+    """Two-chapter curriculum with one validator-less lesson."""
+    root = tmp_path / "curriculum"
+    root.mkdir()
+    (root / "manifest.json").write_text(json.dumps({
+        "chapters": [
+            {"slug": "01_temeller", "title": "Temeller"},
+            {"slug": "02_stringler", "title": "Stringler"}
+        ]
+    }), encoding="utf-8")
+    
+    lessons = [
+        ("01_temeller", "001_print", {"uuid": "u-1", "title": "Yazdır", "tags": ["print"]}, True),
+        ("01_temeller", "002_degisken", {"uuid": "u-2", "title": "Değişken", "category": "Temel"}, True),
+        ("02_stringler", "001_birlestir", {"uuid": "u-3", "title": "Birleştir"}, False),
+    ]
+    for chapter, entry, data, with_validator in lessons:
+        lesson_dir = root / chapter / entry
+        lesson_dir.mkdir(parents=True)
+        (lesson_dir / "task.json").write_text(json.dumps(dict(data, id=entry)), encoding="utf-8")
+        (lesson_dir / "solution.py").write_text(f"print('{entry}')", encoding="utf-8")
+        if with_validator:
+            (lesson_dir / "validation.py").write_text(
+                f"def validate(scope, output): return output.strip() == '{entry}'", encoding="utf-8"
+            )
+    return root
+
+
+def _describe(manager):
+    return [
+        (l.uuid, l.slug, l.title, l.category, l.chapter_slug, l.numeric_id,
+         l.solution_code, l.has_custom_validator())
+        for l in manager.lessons
+    ]
+
+
+def test_pack_matches_directory_layout(curriculum_dir, tmp_path):
+    """A packed curriculum loads the same lessons and chapters as the directory."""
+    pack_path = str(tmp_path / "curriculum.pack")
+    assert write_pack(str(curriculum_dir), pack_path) == 3
+    
+    packed = CurriculumManager(str(curriculum_dir), pack_path=pack_path)
+    packed.load()
+    directory = CurriculumManager(str(curriculum_dir), pack_path=str(tmp_path / "yok.pack"))
+    directory.load()
+    
+    assert packed.pack is not None
+    assert directory.pack is None
+    assert _describe(packed) == _describe(directory)
+    assert [(c.slug, c.title, c.start, c.end) for c in packed.chapters] == \
+        [(c.slug, c.title, c.start, c.end) for c in directory.chapters]
+
+
+def test_packed_validator_runs_without_files(curriculum_dir, tmp_path):
+    """Validators come from marshalled code; lesson files are not needed at runtime."""
+    import shutil
+    pack_path = str(tmp_path / "curriculum.pack")
+    write_pack(str(curriculum_dir), pack_path)
+    shutil.rmtree(curriculum_dir)
+    
+    manager = CurriculumManager(str(curriculum_dir), pack_path=pack_path)
+    manager.load()
+    lesson = manager.get_lesson_by_uuid("u-1")
+    
+    validate = manager.get_validator_function(lesson)
+    assert validate({}, "001_print\n") is True
+    assert validate({}, "yanlış") is False
+    assert manager.get_lesson_by_uuid("u-3").get_validator_code() is None
+
+
+def test_corrupt_pack_falls_back_to_directory(curriculum_dir, tmp_path):
+    pack_path = tmp_path / "curriculum.pack"
+    pack_path.write_bytes(b"bozuk dosya")
+    
+    with pytest.raises(PackError):
+        CurriculumPack(str(pack_path))
+    
+    manager = CurriculumManager(str(curriculum_dir), pack_path=str(pack_path))
+    manager.load()
+    assert manager.pack is None
+    assert manager.get_total_lessons() == 3
+
+
+def test_stale_pack_falls_back_to_directory(curriculum_dir, tmp_path):
+    """With check_pack, editing a lesson after packing makes the loader read the directory."""
+    pack_path = str(tmp_path / "curriculum.pack")
+    write_pack(str(curriculum_dir), pack_path)
+    
+    solution = curriculum_dir / "01_temeller" / "001_print" / "solution.py"
+    solution.write_text("print('bozuk')", encoding="utf-8")
+    
+    manager = CurriculumManager(str(curriculum_dir), pack_path=pack_path, check_pack=True)
+    manager.load()
+    assert manager.pack is None
+    assert manager.get_lesson_by_uuid("u-1").solution_code == "print('bozuk')"
+    
+    # Repacking picks the edit up and the pack is served again
+    write_pack(str(curriculum_dir), pack_path)
+    manager.load()
+    assert manager.pack is not None
+    assert manager.get_lesson_by_uuid("u-1").solution_code == "print('bozuk')"
+
+
+def test_installed_pack_is_trusted_without_reading_lessons(curriculum_dir, tmp_path, monkeypatch):
+    """Without check_pack the pack is served as is; lesson files are not opened."""
+    import builtins
+    pack_path = str(tmp_path / "curriculum.pack")
+    write_pack(str(curriculum_dir), pack_path)
+    (curriculum_dir / "01_temeller" / "001_print" / "solution.py").write_text("print('yeni')", encoding="utf-8")
+    
+    opened = []
+    real_open = builtins.open
+    monkeypatch.setattr(builtins, "open", lambda path, *a, **k: opened.append(str(path)) or real_open(path, *a, **k))
+    manager = CurriculumManager(str(curriculum_dir), pack_path=pack_path, check_pack=False)
+    manager.load()
+    monkeypatch.undo()
+    
+    assert manager.pack is not None
+    assert not [path for path in opened if path.startswith(str(curriculum_dir) + os.sep)]
+    assert manager.get_lesson_by_uuid("u-1").solution_code == "print('001_print')"
+
+
+def test_copied_tree_still_matches_its_pack(curriculum_dir, tmp_path):
+    """A fresh clone/copy (new mtimes, same contents) keeps the pack usable."""
+    import shutil
+    pack_path = str(tmp_path / "curriculum.pack")
+    write_pack(str(curriculum_dir), pack_path)
+    copy = tmp_path / "kopya"
+    shutil.copytree(curriculum_dir, copy, copy_function=shutil.copy)
+    
+    manager = CurriculumManager(str(copy), pack_path=pack_path, check_pack=True)
+    manager.load()
+    assert manager.pack is not None
+
+
+def test_use_pack_false_ignores_pack(curriculum_dir, tmp_path):
+    pack_path = str(tmp_path / "curriculum.pack")
+    write_pack(str(curriculum_dir), pack_path)
+    
+    manager = CurriculumManager(str(curriculum_dir), pack_path=pack_path, use_pack=False)
+    manager.load()
+    assert manager.pack is None
+    assert manager.get_total_lessons() == 3
@@ -12,13 +12,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from curriculum_manager import CurriculumManager
 from sandbox.executor import run_safe
+from sandbox.pool import SandboxPool
 
 
 @pytest.fixture(scope="module")
 def curriculum():
     """Load curriculum once for all tests."""
     base_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'curriculum')
-    cm = CurriculumManager(base_dir)
+    # Always grade the files on disk, never a possibly stale curriculum.pack
+    cm = CurriculumManager(base_dir, use_pack=False)
     cm.load()
     return cm
 
@@ -60,6 +62,35 @@ def test_all_solutions_pass_validation(curriculum):
         pytest.fail(f"The following lessons failed validation:\n{failure_msg}")
 
 
+@pytest.mark.slow
+def test_all_solutions_pass_validation_in_pool(curriculum):
+    """
+    Aynı kontrol, işler önceden başlatılmış işlem havuzuna dağıtılarak
+    (validate_curriculum --solvability'nin yolu).
+    """
+    jobs = [
+        (lesson.slug, lesson.solution_code, lesson.validator_script)
+        for lesson in curriculum.lessons
+        if lesson.solution_code  # Skip if no solution file
+    ]
+    
+    failed = []
+    with SandboxPool(timeout=2.0) as pool:
+        for slug, result in pool.imap_unordered(jobs):
+            if not result['is_valid']:
+                failed.append({
+                    'slug': slug,
+                    'error': result.get('error_message'),
+                    'stdout': result.get('stdout')
+                })
+    
+    if failed:
+        failure_msg = "\n".join([
+            f"- {f['slug']}: {f['error']}" for f in failed
+        ])
+        pytest.fail(f"The following lessons failed validation:\n{failure_msg}")
+
+
 def test_no_duplicate_uuids(curriculum):
     """UUID'ler benzersiz olmalı."""
     uuids = [lesson.uuid for lesson in curriculum.lessons]
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Headless JSON-lines Protocol Tests
+"""
+import io
+import json
+
+import pytest
+
+from engine import ActionShowMessage, ActionExit
+from headless import HeadlessServer, action_to_dict
+from host import EngineHost
+
+
+def _fake_executor(user_code, validator_path, validator_code=None):
+    ok = "pass" in user_code
+    return {"stdout": "", "is_valid": ok, "error_message": None if ok else "yanlış"}
+
+
+@pytest.fixture
+def server(tmp_path):
+    host = EngineHost(data_root=str(tmp_path), executor=_fake_executor)
+    srv = HeadlessServer(host=host)
+    yield srv
+    srv.close()
+
+
+def _run(server, *requests):
+    stdin = io.StringIO("".join(
+        (r if isinstance(r, str) else json.dumps(r)) + "\n" for r in requests))
+    stdout = io.StringIO()
+    assert server.serve(stdin, stdout) == 0
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def test_action_to_dict():
+    data = action_to_dict(ActionShowMessage("T", "içerik", "error"))
+    assert data["action"] == "message"
+    assert data["type"] == "error"
+    assert data["content"] == "içerik"
+    assert action_to_dict(ActionExit())["action"] == "exit"
+    assert action_to_dict(None) is None
+
+
+def test_submit_flow_per_session(server):
+    responses = _run(server,
+                     {"id": 1, "cmd": "state", "session": "ayse"},
+                     {"id": 2, "cmd": "submit", "session": "ayse", "code": "yanlis"},
+                     {"id": 3, "cmd": "submit", "session": "ayse", "code": "pass"},
+                     {"id": 4, "cmd": "state", "session": "mehmet"})
+
+    assert [r["id"] for r in responses] == [1, 2, 3, 4]
+    assert all(r["ok"] for r in responses)
+    first = responses[0]["action"]
+    assert first["action"] == "editor"
+    assert responses[1]["action"]["type"] == "error"
+    assert responses[2]["action"]["type"] == "success"
+    # mehmet kendi ilerlemesiyle ilk derste
+    assert responses[3]["action"]["task_id"] == first["task_id"]
+    assert responses[3]["action"]["completed_count"] == 0
+
+
+def test_navigation_commands(server):
+    responses = _run(server,
+                     {"id": 1, "cmd": "skip", "session": "a"},
+                     {"id": 2, "cmd": "prev", "session": "a"},
+                     {"id": 3, "cmd": "solution", "session": "a"})
+    assert responses[0]["action"]["action"] == "message"
+    assert responses[1]["action"]["task_status"] == "skipped"
+    assert responses[2]["action"]["type"] == "solution"
+
+
+def test_errors_are_reported_not_fatal(server):
+    responses = _run(server,
+                     "bozuk json",
+                     {"id": 1, "cmd": "bilinmeyen", "session": "a"},
+                     {"id": 2, "cmd": "state"},
+                     {"id": 3, "cmd": "submit", "session": "a"},
+                     [1, 2],
+                     {"id": 4, "cmd": "hello"})
+    assert [r["ok"] for r in responses] == [False, False, False, False, False, True]
+    assert "invalid JSON" in responses[0]["error"]
+    assert responses[5]["multi_session"] is True
+
+
+def test_quit_stops_reading(server):
+    responses = _run(server,
+                     {"id": 1, "cmd": "quit"},
+                     {"id": 2, "cmd": "hello"})
+    assert responses == [{"id": 1, "bye": True, "ok": True}]
+
+
+def test_search_and_close(server):
+    responses = _run(server,
+                     {"id": 1, "cmd": "search", "query": "print", "limit": 1},
+                     {"id": 2, "cmd": "state", "session": "a"},
+                     {"id": 3, "cmd": "close", "session": "a"},
+                     {"id": 4, "cmd": "close", "session": "a"})
+    assert len(responses[0]["lessons"]) == 1
+    assert responses[2]["closed"] is True
+    assert responses[3]["closed"] is False
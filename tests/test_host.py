@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Host Mode Tests
+
+Tek süreçte, tek (dondurulmuş) müfredat üzerinden çok sayıda bağımsız
+öğrenci oturumu.
+"""
+import os
+import threading
+
+import pytest
+
+from curriculum_manager import CurriculumManager
+from host import EngineHost, safe_user_dirname
+
+
+CURRICULUM_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'curriculum')
+
+
+def _fake_executor(user_code, validator_path, validator_code=None):
+    ok = "pass" in user_code
+    return {"stdout": "", "is_valid": ok, "error_message": None if ok else "yanlış"}
+
+
+@pytest.fixture(scope="module")
+def shared_curriculum():
+    cm = CurriculumManager(CURRICULUM_DIR)
+    cm.load()
+    return cm
+
+
+@pytest.fixture
+def host(tmp_path, shared_curriculum):
+    with EngineHost(data_root=str(tmp_path), curriculum=shared_curriculum,
+                    executor=_fake_executor) as h:
+        yield h
+
+
+def test_sessions_share_one_frozen_curriculum(host, shared_curriculum):
+    a = host.open_session("ayse")
+    b = host.open_session("mehmet")
+    assert a is not b
+    assert a.cm is b.cm is shared_curriculum
+    assert shared_curriculum.frozen
+    assert shared_curriculum.reload_changed() == set()
+    with pytest.raises(RuntimeError):
+        shared_curriculum.load()
+
+
+def test_sqlite_sessions_share_one_database(tmp_path, shared_curriculum, monkeypatch):
+    """Host mode keeps every learner in one SQLite file when OCAGI_PROGRESS_DB is unset."""
+    import config
+    from progress_sqlite import lesson_stats
+    monkeypatch.setattr(config.Progress, "BACKEND", "sqlite")
+    monkeypatch.setattr(config.Progress, "DB_PATH", None)
+    first = shared_curriculum.lessons[0].uuid
+
+    with EngineHost(data_root=str(tmp_path), curriculum=shared_curriculum,
+                    executor=_fake_executor) as h:
+        for user in ("ayse", "mehmet"):
+            session = h.open_session(user)
+            assert session.progress_store.db_path == os.path.join(str(tmp_path), "progress.db")
+            session.process_input(None)  # atla
+
+    assert not os.path.exists(os.path.join(str(tmp_path), "ayse", "progress.db"))
+    assert lesson_stats(os.path.join(str(tmp_path), "progress.db"))[first]["skipped"] == 2
+
+
+def test_open_session_is_idempotent(host):
+    assert host.open_session("ayse") is host.open_session("ayse")
+    assert host.session_count == 1
+    assert host.close_session("ayse") is True
+    assert host.get_session("ayse") is None
+    assert host.close_session("ayse") is False
+
+
+def test_sessions_have_independent_progress(host, tmp_path, shared_curriculum):
+    a = host.open_session("ayse")
+    b = host.open_session("mehmet")
+    first = shared_curriculum.lessons[0].uuid
+
+    a.process_input(None)  # atla
+
+    assert first in a.progress["skipped_tasks"]
+    assert b.progress["skipped_tasks"] == []
+    assert b.progress["current_step"] != a.progress["current_step"]
+    assert a.user_data_dir == os.path.join(str(tmp_path), "ayse")
+    assert b.user_data_dir == os.path.join(str(tmp_path), "mehmet")
+
+
+def test_progress_survives_reopen(host, shared_curriculum):
+    a = host.open_session("ayse")
+    first = shared_curriculum.lessons[0].uuid
+    a.process_input("pass")
+    assert first in a.progress["completed_tasks"]
+    host.close_session("ayse")
+
+    reopened = host.open_session("ayse")
+    assert first in reopened.progress["completed_tasks"]
+
+
+def test_concurrent_sessions_from_threads(host):
+    errors = []
+
+    def learner(user_id):
+        try:
+            session = host.open_session(user_id)
+            for _ in range(5):
+                session.process_input("pass")
+        except Exception as e:  # pragma: no cover - raporlama için
+            errors.append(e)
+
+    threads = [threading.Thread(target=learner, args=(f"u{i}",)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert host.session_count == 16
+    for i in range(16):
+        assert len(host.get_session(f"u{i}").progress["completed_tasks"]) == 5
+
+
+def test_concurrent_calls_on_one_session_are_serialized(host):
+    session = host.open_session("ayse")
+    threads = [threading.Thread(target=session.process_input, args=("pass",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(session.progress["completed_tasks"]) == 8
+    assert session.progress.chapter_completed  # sayaçlar listeyle tutarlı
+    assert sum(session.progress.chapter_completed.values()) == 8
+
+
+def test_safe_user_dirname():
+    assert safe_user_dirname("ayse") == "ayse"
+    assert os.sep not in safe_user_dirname("../../etc/passwd")
+    assert not safe_user_dirname("../x").startswith(".")
+    with pytest.raises(ValueError):
+        safe_user_dirname("..")
+    # Ids that only differ in replaced characters still get their own directory
+    ids = ["ali/veli", "ali veli", "ali_veli", "ayşe", "ay_e", "x.", "x"]
+    names = [safe_user_dirname(user_id) for user_id in ids]
+    assert len(set(names)) == len(ids)
+    assert safe_user_dirname("ali_veli") == "ali_veli"
+    hashed = safe_user_dirname("ali veli")
+    assert safe_user_dirname(hashed) != hashed
@@ -15,6 +15,7 @@ Güncel API:
 
 import sys
 import os
+import signal
 import pytest
 
 # Add parent directory to path
@@ -199,3 +200,165 @@ class TestInputDriver:
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
+
+
+class _PipeScreen:
+    """get_wch'i bir pipe'tan besleyen sahte stdscr (nodelay davranışı)."""
+
+    def __init__(self):
+        import curses
+        self._error = curses.error
+        self.r, self.w = os.pipe()
+        os.set_blocking(self.r, False)
+
+    def get_wch(self):
+        try:
+            data = os.read(self.r, 1)
+        except BlockingIOError:
+            raise self._error("no input")
+        return data.decode('ascii')
+
+    def nodelay(self, flag):
+        pass
+
+    def close(self):
+        os.close(self.r)
+        os.close(self.w)
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="selectors + pipe POSIX'e özgü")
+class TestSelectInputCollector:
+    """Thread'siz, fd bekleyen girdi toplayıcı testleri."""
+
+    def _collector(self, screen):
+        from input.select_collector import SelectInputCollector
+        collector = SelectInputCollector(screen, fd=screen.r, resize_poll_sec=0.05)
+        collector.start()
+        return collector
+
+    def test_reads_ready_input_without_thread(self):
+        import threading
+        screen = _PipeScreen()
+        threads = threading.active_count()
+        collector = self._collector(screen)
+        try:
+            assert collector.get_input() is None
+            os.write(screen.w, b"ab")
+            assert collector.get_input(block=True, timeout=1) == 'a'
+            assert not collector.empty()
+            assert collector.get_input() == 'b'
+            assert threading.active_count() == threads
+        finally:
+            collector.stop()
+            screen.close()
+
+    def test_timeout_and_wakeup_latency(self):
+        import threading
+        import time
+        screen = _PipeScreen()
+        collector = self._collector(screen)
+        try:
+            started = time.monotonic()
+            assert collector.get_input(block=True, timeout=0.12) is None
+            assert time.monotonic() - started >= 0.12
+
+            timer = threading.Timer(0.1, os.write, (screen.w, b"x"))
+            timer.start()
+            started = time.monotonic()
+            assert collector.get_input(block=True, timeout=None) == 'x'
+            # 10 ms'lik yoklama yok: veri geldiği anda uyanır
+            assert time.monotonic() - started < 0.1 + 0.03
+            timer.join()
+        finally:
+            collector.stop()
+            screen.close()
+
+    def test_driver_decodes_escape_sequence_without_waiting(self):
+        import time
+        from input.curses_driver import CursesInputDriver
+        screen = _PipeScreen()
+        driver = CursesInputDriver(screen, collector=self._collector(screen))
+        try:
+            os.write(screen.w, b"\x1b[1;3D")
+            started = time.monotonic()
+            assert driver.get_event(-1).type == EventType.PREV_TASK
+            assert time.monotonic() - started < 0.04
+        finally:
+            driver.close()
+            screen.close()
+
+    @pytest.mark.skipif(not hasattr(signal, 'SIGWINCH'), reason="SIGWINCH yok")
+    def test_idle_wait_does_not_poll_curses(self):
+        screen = _PipeScreen()
+        reads = []
+        get_wch = screen.get_wch
+        screen.get_wch = lambda: reads.append(1) or get_wch()
+        collector = self._collector(screen)
+        try:
+            assert collector.get_input(block=True, timeout=0.3) is None
+            # Boşta beklerken curses hiç okunmaz (0.05 sn'lik yoklama yok)
+            assert reads == []
+        finally:
+            collector.stop()
+            screen.close()
+
+    @pytest.mark.skipif(not hasattr(signal, 'SIGWINCH'), reason="SIGWINCH yok")
+    def test_sigwinch_wakes_blocking_wait(self):
+        import threading
+        import time
+        from input import select_collector
+        previous = signal.getsignal(signal.SIGWINCH)
+        screen = _PipeScreen()
+        collector = self._collector(screen)
+        try:
+            timer = threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGWINCH))
+            timer.start()
+            started = time.monotonic()
+            assert collector.get_input(block=True, timeout=None) == select_collector.curses.KEY_RESIZE
+            assert time.monotonic() - started < 0.1 + 0.05
+            timer.join()
+        finally:
+            collector.stop()
+            screen.close()
+        assert signal.getsignal(signal.SIGWINCH) == previous
+
+    def _driver(self, screen):
+        from input.curses_driver import CursesInputDriver
+        return CursesInputDriver(screen, collector=self._collector(screen))
+
+    def test_bracketed_paste_becomes_single_event(self):
+        screen = _PipeScreen()
+        driver = self._driver(screen)
+        try:
+            os.write(screen.w, b"\x1b[200~def f():\r\n    return (1)\r\n\x1b[201~x")
+            event = driver.get_event(-1)
+            assert event == InputEvent(EventType.PASTE, "def f():\n    return (1)\n")
+            assert driver.get_event(-1) == InputEvent(EventType.CHAR, 'x')
+        finally:
+            driver.close()
+            screen.close()
+
+    def test_queued_burst_without_brackets_is_a_paste(self):
+        screen = _PipeScreen()
+        driver = self._driver(screen)
+        try:
+            text = "for i in range(10):\r    print(i)\r"
+            os.write(screen.w, text.encode('ascii') + b"\x1b")
+            assert driver.get_event(-1) == InputEvent(EventType.PASTE, text.replace('\r', '\n'))
+            # Burst'ü bitiren kontrol tuşu kaybolmaz
+            assert driver.get_event(-1).type == EventType.ESCAPE
+        finally:
+            driver.close()
+            screen.close()
+
+    def test_short_queued_typing_stays_key_by_key(self):
+        screen = _PipeScreen()
+        driver = self._driver(screen)
+        try:
+            os.write(screen.w, b"ab\r")
+            events = [driver.get_event(-1) for _ in range(3)]
+            assert events == [InputEvent(EventType.CHAR, 'a'), InputEvent(EventType.CHAR, 'b'),
+                              InputEvent(EventType.ENTER)]
+        finally:
+            driver.close()
+            screen.close()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for lesson_search module (Turkish folding + prefix inverted index).
+"""
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lesson_search import LessonSearchIndex, normalize_text, tokenize_text
+from curriculum_manager import CurriculumManager
+
+
+class FakeLesson:
+    def __init__(self, numeric_id, title, description="", hint="", tags=(), category="Genel"):
+        self.uuid = f"uuid-{numeric_id}"
+        self.numeric_id = numeric_id
+        self.title = title
+        self.description = description
+        self.hint = hint
+        self.tags = list(tags)
+        self.category = category
+
+
+@pytest.fixture
+def index():
+    return LessonSearchIndex([
+        FakeLesson(1, "Print Fonksiyonu", "Ekrana yazdır.", tags=["cikti"]),
+        FakeLesson(2, "Değişken Tanımlama", "x adında bir değişken tanımla."),
+        FakeLesson(3, "Döngüler", "for döngüsü ile listeyi dolaş.", hint="range() kullan"),
+        FakeLesson(4, "Liste Sıralama", "Listeyi sırala.", tags=["liste"]),
+    ])
+
+
+class TestNormalize:
+    def test_turkish_folding(self):
+        assert normalize_text("IŞIK ığdır ŞEKER Güneş İzmir") == "isik igdir seker gunes izmir"
+
+    def test_tokenize_splits_words(self):
+        assert tokenize_text("Döngü: for/while") == ["dongu", "for", "while"]
+
+
+class TestLessonSearchIndex:
+    def test_empty_query_returns_curriculum_order(self, index):
+        assert [l.numeric_id for l in index.search("", limit=2)] == [1, 2]
+
+    def test_prefix_match(self, index):
+        assert [l.numeric_id for l in index.search("deg")] == [2]
+
+    def test_folding_matches_both_spellings(self, index):
+        assert [l.numeric_id for l in index.search("döngü")] == [3]
+        assert [l.numeric_id for l in index.search("DONGU")] == [3]
+        assert [l.numeric_id for l in index.search("sıra")] == [4]
+
+    def test_title_ranks_above_description(self, index):
+        # "liste" appears in title/tag of 4 and description of 3
+        assert [l.numeric_id for l in index.search("liste")] == [4, 3]
+
+    def test_multi_word_is_intersection(self, index):
+        assert [l.numeric_id for l in index.search("liste dolaş")] == [3]
+        assert index.search("liste yokboyle") == []
+
+    def test_hint_and_tag_fields_indexed(self, index):
+        assert [l.numeric_id for l in index.search("range")] == [3]
+        assert [l.numeric_id for l in index.search("cikti")] == [1]
+
+    def test_numeric_id_lookup(self, index):
+        assert index.search("4")[0].numeric_id == 4
+
+    def test_real_curriculum_index(self):
+        base_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'curriculum')
+        cm = CurriculumManager(base_dir)
+        cm.load()
+        search_index = cm.get_search_index()
+        assert cm.get_search_index() is search_index
+        results = search_index.search("print")
+        assert results
+        assert results[0].title == "Print Fonksiyonu"
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Yük Testi Aracı Testleri (tools/load_test.py)
+"""
+import os
+import sys
+import random
+import collections
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools'))
+
+from curriculum_manager import CurriculumManager
+import load_test
+
+
+@pytest.fixture(scope="module")
+def lessons():
+    cm = CurriculumManager(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'curriculum'))
+    cm.load()
+    return cm.lessons
+
+
+def test_parse_mix_normalizes():
+    assert load_test.parse_mix("solution=3,infinite=1") == {"solution": 0.75, "infinite": 0.25}
+    with pytest.raises(ValueError):
+        load_test.parse_mix("bilinmeyen=1")
+    with pytest.raises(ValueError):
+        load_test.parse_mix("solution=0")
+
+
+def test_build_jobs_follows_mix_and_seed(lessons):
+    mix = {"solution": 0.5, "broken": 0.3, "infinite": 0.2}
+    jobs = load_test.build_jobs(lessons, 100, mix, seed=7)
+    counts = collections.Counter(kind for kind, _, _ in jobs)
+    assert counts == {"solution": 50, "broken": 30, "infinite": 20}
+    assert [code for _, _, code in jobs] == [code for _, _, code in load_test.build_jobs(lessons, 100, mix, seed=7)]
+    for kind, lesson, code in jobs:
+        if kind == "solution":
+            assert code == lesson.solution_code
+        elif kind == "broken":
+            assert code != lesson.solution_code
+        else:
+            assert code == load_test.INFINITE_LOOP
+
+
+def test_break_code_changes_code():
+    rng = random.Random(1)
+    code = "x = 1\nprint(x)\n"
+    for _ in range(20):
+        assert load_test.break_code(code, rng) != code
+
+
+def test_percentiles():
+    ordered = list(range(1, 101))
+    assert load_test.percentile(ordered, 50) == 50
+    assert load_test.percentile(ordered, 99) == 99
+    assert load_test.percentile([], 50) is None
+    assert load_test.latency_summary([0.001, 0.002]) == {"p50": 1.0, "p95": 2.0, "p99": 2.0, "max": 2.0}
+
+
+def test_run_load_report(lessons):
+    jobs = load_test.build_jobs(lessons, 20, {"solution": 0.5, "broken": 0.25, "infinite": 0.25}, seed=3)
+
+    def execute(kind, lesson, code, n):
+        if kind == "infinite":
+            return {"is_valid": False, "error_message": "⏳ Zaman Aşımı (5.0s)", "limit_hit": True}
+        return {"is_valid": kind == "solution", "error_message": "", "limit_hit": False}
+
+    report = load_test.run_load(jobs, execute, rate=1000, concurrency=4, sample_interval=0.01)
+    assert report["count"] == 20
+    assert report["by_kind"]["infinite"]["timeouts"] == 5
+    assert report["by_kind"]["solution"]["passed"] == 10
+    assert report["solution_failures"] == 0
+    assert report["throughput_per_sec"] > 0
+    assert set(report["latency_ms"]) == {"p50", "p95", "p99", "max"}
+    assert "samples" in report["worker_rss"]
+    assert load_test.check_thresholds(report) == []
+    assert load_test.check_thresholds(report, min_throughput=10 ** 9)
+
+
+def test_failing_solutions_are_threshold_failures(lessons):
+    jobs = load_test.build_jobs(lessons, 4, {"solution": 1.0}, seed=0)
+    report = load_test.run_load(jobs, lambda *a: {"is_valid": False}, rate=1000, concurrency=2)
+    assert report["solution_failures"] == 4
+    assert load_test.check_thresholds(report)
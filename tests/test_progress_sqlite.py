@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the SQLite progress backend.
+"""
+import pytest
+import sys
+import os
+import threading
+
+# Ensure project root is in path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress_store import JournalProgressStore, ProgressWriter, apply_event, get_default_progress
+from progress_sqlite import SqliteProgressBackend, lesson_stats
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "progress.db")
+
+
+def _write(backend, *events):
+    state = get_default_progress()
+    backend.write_batch(list(events), state)
+    return state
+
+
+def test_round_trip_matches_json_semantics(db_path):
+    """load() reproduces the same ordered lists apply_event builds in memory."""
+    backend = SqliteProgressBackend(db_path, "ayse")
+    assert backend.load() == get_default_progress()
+    
+    state = _write(
+        backend,
+        {"op": "skip", "uuid": "u-2"},
+        {"op": "complete", "uuid": "u-1"},
+        {"op": "code", "uuid": "u-3", "code": "print(3)"},
+        {"op": "skip", "uuid": "u-3"},
+        {"op": "complete", "uuid": "u-2"},
+        {"op": "nav", "step": "u-4"},
+    )
+    backend.close()
+    
+    loaded = SqliteProgressBackend(db_path, "ayse").load()
+    assert loaded == state
+    assert loaded["completed_tasks"] == ["u-1", "u-2"]
+    assert loaded["skipped_tasks"] == ["u-3"]
+
+
+def test_learners_are_isolated_and_reset(db_path):
+    ayse = SqliteProgressBackend(db_path, "ayse")
+    mehmet = SqliteProgressBackend(db_path, "mehmet")
+    ayse.load()
+    mehmet.load()
+    _write(ayse, {"op": "complete", "uuid": "u-1"})
+    _write(mehmet, {"op": "complete", "uuid": "u-1"}, {"op": "reset"})
+    
+    assert ayse.load()["completed_tasks"] == ["u-1"]
+    assert mehmet.load() == get_default_progress()
+
+
+def test_concurrent_writers(db_path):
+    """Many sessions writing at once all land (WAL + BEGIN IMMEDIATE)."""
+    errors = []
+    
+    def session(user):
+        try:
+            backend = SqliteProgressBackend(db_path, user)
+            backend.load()
+            for i in range(20):
+                backend.append({"op": "complete", "uuid": f"u-{i}"})
+            backend.close()
+        except Exception as e:  # pragma: no cover - surfaced below
+            errors.append(e)
+    
+    threads = [threading.Thread(target=session, args=(f"learner-{n}",)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert errors == []
+    stats = lesson_stats(db_path)
+    assert stats["u-0"]["completed"] == 8
+    assert len(stats) == 20
+
+
+def test_seed_imports_existing_json_progress(db_path, tmp_path):
+    journal = JournalProgressStore(str(tmp_path / "progress.json"), fsync_interval=0.0)
+    progress = journal.load()
+    for event in ({"op": "complete", "uuid": "u-1"}, {"op": "nav", "step": "u-2"}):
+        apply_event(progress, event)
+        journal.append(event)
+    journal.close(progress)
+    
+    backend = SqliteProgressBackend(db_path, "ayse", seed=journal)
+    assert backend.load() == progress
+    # Second load comes from the database, not the seed
+    backend.seed = None
+    assert backend.load() == progress
+
+
+def test_progress_writer_with_sqlite(db_path):
+    backend = SqliteProgressBackend(db_path, "ayse")
+    writer = ProgressWriter(backend, backend.load(), debounce=0.0)
+    writer.submit({"op": "code", "uuid": "u-1", "code": "x = 1"})
+    writer.submit({"op": "complete", "uuid": "u-1"})
+    writer.close()
+    
+    loaded = SqliteProgressBackend(db_path, "ayse").load()
+    assert loaded["completed_tasks"] == ["u-1"]
+    assert loaded["user_code"] == {"u-1": "x = 1"}
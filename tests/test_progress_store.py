@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the journaled progress store.
+"""
+import pytest
+import sys
+import os
+import json
+
+# Ensure project root is in path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress_store import (JournalProgressStore, ProgressWriter, ProgressState, UuidList,
+                            apply_event, coalesce_events, flush_all, get_default_progress)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JournalProgressStore(
+        str(tmp_path / "progress.json"),
+        backup_path=str(tmp_path / "progress.backup.json"),
+        fsync_interval=0.0
+    )
+
+
+def _record(store, progress, **event):
+    apply_event(progress, event)
+    store.append(event, progress)
+
+
+def test_journal_replay(store):
+    """Events appended to the journal are replayed on load."""
+    progress = store.load()
+    _record(store, progress, op="code", uuid="u-1", code="print(1)")
+    _record(store, progress, op="complete", uuid="u-1")
+    _record(store, progress, op="nav", step="u-2")
+    _record(store, progress, op="skip", uuid="u-2")
+    store.close()
+    
+    assert not os.path.exists(store.snapshot_path)  # No full rewrite happened
+    loaded = JournalProgressStore(store.snapshot_path, journal_path=store.journal_path).load()
+    assert loaded == progress
+    assert loaded["current_step"] == "u-2"
+    assert loaded["completed_tasks"] == ["u-1"]
+    assert loaded["skipped_tasks"] == ["u-2"]
+
+
+def test_torn_tail_is_ignored_and_truncated(store):
+    """A half-written last line (crash) is dropped; earlier events survive."""
+    progress = store.load()
+    _record(store, progress, op="nav", step="u-1")
+    store.close()
+    with open(store.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "op": "nav", "st')
+    
+    reopened = JournalProgressStore(store.snapshot_path, journal_path=store.journal_path, fsync_interval=0.0)
+    loaded = reopened.load()
+    assert loaded["current_step"] == "u-1"
+    
+    # New events continue after the last good line
+    _record(reopened, loaded, op="nav", step="u-3")
+    reopened.close()
+    final = JournalProgressStore(store.snapshot_path, journal_path=store.journal_path).load()
+    assert final["current_step"] == "u-3"
+
+
+def test_compaction_writes_snapshot_and_truncates_journal(tmp_path):
+    store = JournalProgressStore(str(tmp_path / "progress.json"), fsync_interval=0.0, compact_every=3)
+    progress = store.load()
+    for i in range(3):
+        _record(store, progress, op="nav", step=f"u-{i}")
+    
+    assert os.path.getsize(store.journal_path) == 0
+    with open(store.snapshot_path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert snapshot["current_step"] == "u-2"
+    assert snapshot["journal_seq"] == 3
+    assert "journal_seq" not in JournalProgressStore(store.snapshot_path).load()
+
+
+def test_replay_skips_events_already_in_snapshot(store):
+    """Crash after snapshot rename but before journal truncation must not double-apply."""
+    progress = store.load()
+    _record(store, progress, op="skip", uuid="u-1")
+    _record(store, progress, op="complete", uuid="u-1")
+    store.sync()
+    with open(store.journal_path, encoding="utf-8") as f:
+        journal = f.read()
+    store.compact(progress)
+    with open(store.journal_path, "w", encoding="utf-8") as f:
+        f.write(journal)  # Simulate the lost truncation
+    
+    loaded = JournalProgressStore(store.snapshot_path, journal_path=store.journal_path).load()
+    assert loaded["completed_tasks"] == ["u-1"]
+    assert loaded["skipped_tasks"] == []
+
+
+def test_legacy_snapshot_and_backup_fallback(store):
+    """Old progress.json files (no seq) load; a corrupt snapshot falls back to the backup."""
+    legacy = dict(get_default_progress(), current_step="u-9", completed_tasks=["u-8"])
+    with open(store.backup_path, "w", encoding="utf-8") as f:
+        json.dump(legacy, f)
+    with open(store.snapshot_path, "w", encoding="utf-8") as f:
+        f.write("{bozuk")
+    
+    loaded = store.load()
+    assert loaded["current_step"] == "u-9"
+    assert loaded["completed_tasks"] == ["u-8"]
+
+
+def test_reset_event():
+    progress = dict(get_default_progress(), current_step="u-1", completed_tasks=["u-1"])
+    apply_event(progress, {"op": "reset"})
+    assert progress == get_default_progress()
+
+
+def test_coalesce_events():
+    events = [
+        {"op": "nav", "step": "u-1"},
+        {"op": "code", "uuid": "u-1", "code": "a"},
+        {"op": "nav", "step": "u-2"},
+        {"op": "code", "uuid": "u-1", "code": "ab"},
+        {"op": "reset"},
+        {"op": "nav", "step": "u-3"},
+    ]
+    assert coalesce_events(events) == [
+        {"op": "nav", "step": "u-2"},
+        {"op": "code", "uuid": "u-1", "code": "ab"},
+        {"op": "reset"},
+        {"op": "nav", "step": "u-3"},
+    ]
+
+
+def _journal_lines(store):
+    with open(store.journal_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_writer_debounces_off_thread(store):
+    """Rapid navigation collapses into one journal line, written by the worker."""
+    progress = store.load()
+    writer = ProgressWriter(store, progress, debounce=0.5)
+    for i in range(20):
+        event = {"op": "nav", "step": f"u-{i}"}
+        apply_event(progress, event)
+        writer.submit(event)
+    
+    assert writer.flush(timeout=2.0)
+    lines = _journal_lines(store)
+    assert [line["step"] for line in lines] == ["u-19"]
+    
+    writer.close()
+    assert os.path.getsize(store.journal_path) == 0
+    assert JournalProgressStore(store.snapshot_path).load()["current_step"] == "u-19"
+
+
+def test_flush_all_persists_live_writers(store):
+    progress = store.load()
+    writer = ProgressWriter(store, progress, debounce=10.0)
+    writer.submit({"op": "complete", "uuid": "u-1"})
+    
+    flush_all(timeout=2.0)  # Must not wait for the 10s debounce window
+    assert _journal_lines(store)[0]["op"] == "complete"
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit({"op": "nav", "step": None})
+
+
+def test_writer_syncs_after_quiet_period(tmp_path, monkeypatch):
+    """A lone event is fsynced within sync_delay even if nothing follows it."""
+    import time
+    store = JournalProgressStore(str(tmp_path / "progress.json"), fsync_interval=60.0)
+    store.load()
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+    
+    writer = ProgressWriter(store, store.load(), debounce=0.0, sync_delay=0.05)
+    writer.submit({"op": "complete", "uuid": "u-1"})
+    deadline = time.monotonic() + 2.0
+    while not fsyncs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    assert fsyncs  # No further event and no flush/close were needed
+    writer.close()
+
+
+CHAPTERS = {"u-1": "01_temeller", "u-2": "01_temeller", "u-3": "02_stringler"}
+
+
+def test_progress_state_indexes_and_counters():
+    """Set-backed membership and per-chapter counters follow every mutation."""
+    state = ProgressState.from_dict(
+        dict(get_default_progress(), completed_tasks=["u-1", "u-1"], skipped_tasks=["u-3"], theme="dark"),
+        chapter_of=CHAPTERS.get
+    )
+    assert state["completed_tasks"] == ["u-1"]  # Duplicates dropped
+    assert "u-1" in state["completed_tasks"]
+    assert state.chapter_completed == {"01_temeller": 1}
+    assert state.chapter_skipped == {"02_stringler": 1}
+    
+    apply_event(state, {"op": "skip", "uuid": "u-2"})
+    apply_event(state, {"op": "complete", "uuid": "u-2"})
+    apply_event(state, {"op": "complete", "uuid": "u-3"})
+    assert state.chapter_completed == {"01_temeller": 2, "02_stringler": 1}
+    assert state.chapter_skipped == {"01_temeller": 0, "02_stringler": 0}
+    
+    # On-disk format is unchanged (unknown keys preserved)
+    data = state.to_dict()
+    assert data["completed_tasks"] == ["u-1", "u-2", "u-3"]
+    assert data["skipped_tasks"] == []
+    assert data["theme"] == "dark"
+    assert json.loads(json.dumps(data)) == data
+    
+    apply_event(state, {"op": "reset"})
+    assert state == get_default_progress()
+    assert state.chapter_completed == {"01_temeller": 0, "02_stringler": 0}
+
+
+def test_uuid_list_rejects_unindexed_mutation():
+    lst = UuidList(["a"])
+    with pytest.raises(TypeError):
+        lst.insert(0, "b")
+    with pytest.raises(ValueError):
+        lst.remove("b")
+    assert lst.pop() == "a" and "a" not in lst
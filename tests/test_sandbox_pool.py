@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+SandboxPool Testleri
+Önceden başlatılmış tek kullanımlık işlem havuzunun run_safe ile aynı
+sonuçları verdiğini doğrular.
+"""
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sandbox.pool import SandboxPool
+
+
+@pytest.fixture
+def validator_path(tmp_path):
+    path = tmp_path / "validation.py"
+    path.write_text("def validate(scope, output): return 'merhaba' in output", encoding="utf-8")
+    return str(path)
+
+
+def test_pool_runs_jobs_in_parallel(validator_path):
+    """Havuz birden fazla işi çalıştırır ve sonuçları etiketlerle doğru eşler."""
+    jobs = [(i, "print('merhaba')", validator_path) for i in range(3)]
+    jobs.append((3, "print('hoşçakal')", validator_path))
+    with SandboxPool(size=2, timeout=2.0) as pool:
+        results = dict(pool.imap_unordered(jobs))
+    
+    assert [results[i]["is_valid"] for i in range(4)] == [True, True, True, False]
+    assert all("elapsed" in r for r in results.values())
+
+
+def test_pool_timeout_kills_worker(validator_path):
+    """Sonsuz döngü zaman aşımına uğrar; havuz sonraki işleri çalıştırmaya devam eder."""
+    with SandboxPool(size=1) as pool:
+        result = pool.run("while True: pass", validator_path, timeout=0.05)
+        assert not result["is_valid"]
+        assert result["error_message"]
+        
+        assert pool.run("print('merhaba')", validator_path)["is_valid"]
+
+
+def test_pool_reports_syntax_error(validator_path):
+    """Yazım hataları run_safe ile aynı biçimde raporlanır."""
+    with SandboxPool(size=1) as pool:
+        result = pool.run("print(", validator_path)
+    assert not result["success"]
+    assert "Yazım Hatası" in result["error_message"]
+
+
+def test_closed_pool_rejects_jobs(validator_path):
+    pool = SandboxPool(size=1)
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.run("print('merhaba')", validator_path)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RLIMIT_AS yalnızca Linux'ta test edilir")
+def test_allocation_over_budget_fails_in_child(validator_path):
+    """Bütçeyi (100 MB) aşan ayırma run_safe'te ve fork/spawn havuz işlemlerinde reddedilir."""
+    import multiprocessing
+    from sandbox.executor import run_safe
+    over = "x = bytearray(200 * 1024 * 1024)\nprint('merhaba')"
+    under = "x = bytearray(20 * 1024 * 1024)\nprint('merhaba')"
+    
+    assert run_safe(over, validator_path, timeout=5.0)["limit_hit"]
+    assert run_safe(under, validator_path, timeout=5.0)["is_valid"]
+    # fork: göreceli sınır, spawn: mutlak sınır
+    for context in (None, multiprocessing.get_context("spawn")):
+        with SandboxPool(size=1, timeout=5.0, context=context) as pool:
+            assert pool.run(over, validator_path)["limit_hit"]
+            assert pool.run(under, validator_path)["is_valid"]
+
+
+def test_memory_guard_limit_is_absolute_unless_pooled(monkeypatch):
+    """Göreceli sınır yalnızca istenirse uygulanır; adres alanı ölçülemezse mutlak sınıra döner."""
+    from sandbox import guards
+    monkeypatch.setattr(guards, "_current_address_space", lambda: 500 * 1024 * 1024)
+    assert guards.MemoryGuard(100)._address_space_limit() == 100 * 1024 * 1024
+    assert guards.MemoryGuard(100, relative=True)._address_space_limit() == 600 * 1024 * 1024
+    
+    monkeypatch.setattr(guards, "_current_address_space", lambda: None)
+    assert guards.MemoryGuard(100, relative=True)._address_space_limit() == 100 * 1024 * 1024
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Fair-share Sandbox Scheduler Tests
+"""
+import time
+import threading
+
+from sandbox.scheduler import FairScheduler
+
+
+def _ok(user_code, validator_path, validator_code=None):
+    return {"stdout": user_code, "is_valid": True, "error_message": "", "limit_hit": False}
+
+
+class _Recorder:
+    """Çalıştırılan işleri sırayla kaydeder; `gate` açılana kadar bekletir."""
+
+    def __init__(self, hit=()):
+        self.order = []
+        self.gate = threading.Event()
+        self.lock = threading.Lock()
+        self.hit = set(hit)
+        self.running = {}
+        self.max_running = {}
+
+    def __call__(self, user_code, validator_path, validator_code=None):
+        learner = user_code.split(":")[0]
+        with self.lock:
+            self.order.append(user_code)
+            self.running[learner] = self.running.get(learner, 0) + 1
+            self.max_running[learner] = max(self.max_running.get(learner, 0), self.running[learner])
+        self.gate.wait(5)
+        with self.lock:
+            self.running[learner] -= 1
+        return {"stdout": "", "is_valid": True, "error_message": "",
+                "limit_hit": learner in self.hit}
+
+
+def _submit_in_order(scheduler, jobs):
+    """İşleri tek tek kuyruğa sokar (her biri kuyruğa girmeden sonrakine geçmez)."""
+    threads = []
+    for learner, code in jobs:
+        before = scheduler.waiting + scheduler.active
+        t = threading.Thread(target=scheduler.run, args=(learner, f"{learner}:{code}", None))
+        t.start()
+        threads.append(t)
+        deadline = time.monotonic() + 2
+        while scheduler.waiting + scheduler.active == before and time.monotonic() < deadline:
+            time.sleep(0.001)
+    return threads
+
+
+def test_run_returns_executor_result():
+    scheduler = FairScheduler(_ok, workers=2)
+    assert scheduler.run("ayse", "kod", None)["stdout"] == "kod"
+    assert scheduler.stats()["completed"] == 1
+    assert scheduler.active == 0 and scheduler.waiting == 0
+
+
+def test_round_robin_between_learners():
+    rec = _Recorder()
+    scheduler = FairScheduler(rec, workers=1, max_pending=10)
+    threads = _submit_in_order(scheduler, [("x", 0), ("a", 1), ("a", 2), ("a", 3), ("b", 1)])
+    rec.gate.set()
+    for t in threads:
+        t.join()
+    # Sırada ilk A olsa da B, A'nın üç işinin arkasında beklemez
+    assert rec.order == ["x:0", "a:1", "b:1", "a:2", "a:3"]
+
+
+def test_weights_give_more_turns():
+    rec = _Recorder()
+    scheduler = FairScheduler(rec, workers=1, max_pending=10)
+    scheduler.set_weight("a", 2)
+    threads = _submit_in_order(scheduler, [("x", 0), ("a", 1), ("a", 2), ("a", 3), ("b", 1), ("b", 2)])
+    rec.gate.set()
+    for t in threads:
+        t.join()
+    assert rec.order == ["x:0", "a:1", "a:2", "b:1", "a:3", "b:2"]
+
+
+def test_per_learner_concurrency_cap():
+    rec = _Recorder()
+    scheduler = FairScheduler(rec, workers=4, per_learner=1, max_pending=10)
+    threads = _submit_in_order(scheduler, [("a", i) for i in range(3)] + [("b", 0)])
+    # a yalnızca bir işçi tutar; b boşta kalan işçiyi hemen alır
+    assert scheduler.active == 2
+    assert scheduler.waiting == 2
+    rec.gate.set()
+    for t in threads:
+        t.join()
+    assert rec.max_running == {"a": 1, "b": 1}
+
+
+def test_max_pending_rejects_immediately():
+    rec = _Recorder()
+    scheduler = FairScheduler(rec, workers=1, max_pending=1)
+    threads = _submit_in_order(scheduler, [("a", 0), ("a", 1)])
+    result = scheduler.run("a", "a:2", None)
+    assert result["is_valid"] is False and result["limit_hit"] is False
+    assert scheduler.stats()["rejected"] == 1
+    rec.gate.set()
+    for t in threads:
+        t.join()
+
+
+def test_cooldown_after_repeated_limit_hits():
+    rec = _Recorder(hit={"a"})
+    rec.gate.set()
+    scheduler = FairScheduler(rec, workers=1, cooldown_after=3, cooldown_sec=0.3)
+    for i in range(3):
+        scheduler.run("a", f"a:{i}", None)
+    assert scheduler.cooling_down("a")
+
+    started = time.monotonic()
+    waiting = threading.Thread(target=scheduler.run, args=("a", "a:3", None))
+    waiting.start()
+    time.sleep(0.05)
+    assert "a:3" not in rec.order
+    # Ceza süresince diğer öğrenciler işçiyi bekletilmeden kullanır
+    scheduler.run("b", "b:0", None)
+    assert "a:3" not in rec.order
+    waiting.join()
+    assert time.monotonic() - started >= 0.25
+    assert rec.order[-1] == "a:3"
+    assert scheduler.stats()["cooldowns"] == 1
+
+
+def test_successful_job_resets_limit_streak():
+    results = iter([True, True, False, True, True])
+
+    def execute(user_code, validator_path, validator_code=None):
+        return {"is_valid": False, "limit_hit": next(results)}
+
+    scheduler = FairScheduler(execute, workers=1, cooldown_after=3, cooldown_sec=10)
+    for i in range(5):
+        scheduler.run("a", str(i), None)
+    assert not scheduler.cooling_down("a")
+
+
+def test_executor_exception_releases_worker():
+    def boom(user_code, validator_path, validator_code=None):
+        raise RuntimeError("çöktü")
+
+    scheduler = FairScheduler(boom, workers=1)
+    for _ in range(2):
+        try:
+            scheduler.run("a", "x", None)
+        except RuntimeError:
+            pass
+    assert scheduler.active == 0
+    assert scheduler.stats()["limit_hits"] == 2
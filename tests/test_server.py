@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Grading HTTP Service Tests
+"""
+import os
+import json
+import asyncio
+import threading
+
+import pytest
+
+from curriculum_manager import CurriculumManager
+from server import GradingService, LatencyWindow
+
+
+CURRICULUM_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'curriculum')
+
+
+@pytest.fixture(scope="module")
+def curriculum():
+    cm = CurriculumManager(CURRICULUM_DIR)
+    cm.load()
+    return cm
+
+
+def _fake_executor(user_code, validator_path, validator_code=None):
+    ok = "pass" in user_code
+    return {"stdout": "çıktı", "is_valid": ok, "error_message": None if ok else "yanlış"}
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {k.lower(): v.strip() for k, _, v in (l.partition(':') for l in lines[1:])}
+    return status, headers, json.loads(body)
+
+
+def _with_service(curriculum, scenario, **kwargs):
+    async def main():
+        service = GradingService(curriculum, **kwargs)
+        port = await service.start('127.0.0.1', 0)
+        try:
+            return await scenario(service, port)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+
+def test_latency_window_percentiles():
+    window = LatencyWindow(size=100)
+    assert window.percentiles() == {"p50": None, "p95": None, "p99": None}
+    for ms in range(1, 101):
+        window.add(ms / 1000)
+    assert window.percentiles() == {"p50": 50.0, "p95": 95.0, "p99": 99.0}
+
+
+def test_lessons_and_submit(curriculum):
+    first = curriculum.lessons[0]
+
+    async def scenario(service, port):
+        status, _, lessons = await _request(port, "GET", "/lessons")
+        assert status == 200
+        assert lessons["lessons"][0]["uuid"] == first.uuid
+        assert "solution" not in json.dumps(lessons)
+
+        status, _, detail = await _request(port, "GET", f"/lessons/{first.uuid}")
+        assert status == 200 and detail["description"] == first.description
+
+        status, _, ok = await _request(port, "POST", "/submit", {"lesson": first.uuid, "code": "pass"})
+        assert status == 200 and ok["is_valid"] is True and ok["stdout"] == "çıktı"
+
+        status, _, bad = await _request(port, "POST", "/submit", {"lesson": first.uuid, "code": "x"})
+        assert status == 200 and bad["is_valid"] is False
+
+        status, _, metrics = await _request(port, "GET", "/metrics")
+        assert metrics["submissions"] == {"accepted": 2, "rejected": 0, "passed": 1, "failed": 1}
+        assert metrics["latency_samples"] == 2
+        assert metrics["latency_ms"]["p50"] is not None
+
+    _with_service(curriculum, scenario, executor=_fake_executor, workers=2, queue_size=4)
+
+
+def test_bad_requests(curriculum):
+    async def scenario(service, port):
+        assert (await _request(port, "GET", "/nope"))[0] == 404
+        assert (await _request(port, "GET", "/lessons/yok"))[0] == 404
+        assert (await _request(port, "GET", "/submit"))[0] == 405
+        assert (await _request(port, "POST", "/submit", {"code": 1}))[0] == 400
+        assert (await _request(port, "POST", "/submit", {"lesson": "yok", "code": ""}))[0] == 404
+
+    _with_service(curriculum, scenario, executor=_fake_executor, workers=1, queue_size=1)
+
+
+def test_full_queue_returns_429(curriculum):
+    release = threading.Event()
+    first = curriculum.lessons[0].uuid
+
+    def blocking_executor(user_code, validator_path, validator_code=None):
+        release.wait(5)
+        return _fake_executor(user_code, validator_path)
+
+    async def scenario(service, port):
+        submit = {"lesson": first, "code": "pass"}
+        running = asyncio.create_task(_request(port, "POST", "/submit", submit))
+        while service.scheduler.active == 0:
+            await asyncio.sleep(0.01)
+        queued = asyncio.create_task(_request(port, "POST", "/submit", submit))
+        while service.metrics()["queue_depth"] == 0:
+            await asyncio.sleep(0.01)
+
+        status, headers, body = await _request(port, "POST", "/submit", submit)
+        assert status == 429
+        assert int(headers["retry-after"]) >= 1
+
+        release.set()
+        assert (await running)[0] == 200
+        assert (await queued)[0] == 200
+        metrics = (await _request(port, "GET", "/metrics"))[2]
+        assert metrics["submissions"]["rejected"] == 1
+        assert metrics["queue_depth"] == 0
+
+    _with_service(curriculum, scenario, executor=blocking_executor, workers=1, queue_size=1)
+
+
+def test_keep_alive_serves_several_requests(curriculum):
+    async def scenario(service, port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for _ in range(3):
+            writer.write(b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n")
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+            assert json.loads(await reader.readexactly(length)) == {"status": "ok"}
+        writer.close()
+
+    _with_service(curriculum, scenario, executor=_fake_executor, workers=1)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Parça tablosu tabanlı TextBuffer ve geri al / yinele testleri.
+"""
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.text_buffer import TextBuffer
+
+
+def test_reads_like_a_list_of_lines():
+    buf = TextBuffer("a = 1\n\nprint(a)")
+    assert len(buf) == 3
+    assert list(buf) == ["a = 1", "", "print(a)"]
+    assert buf[-1] == "print(a)" and buf[1:] == ["", "print(a)"]
+    assert TextBuffer()[0] == "" and len(TextBuffer()) == 1
+    assert TextBuffer("x\n")[-1] == ""
+
+
+def test_insert_and_delete_by_line_and_column():
+    buf = TextBuffer("def f():\n    pass")
+    assert buf.insert(1, 4, "x = 1\n    ") == (2, 4)
+    assert list(buf) == ["def f():", "    x = 1", "    pass"]
+    # Satır sonunu silmek satırları birleştirir
+    assert buf.delete(0, 8, 1) == "\n"
+    assert buf[0] == "def f():    x = 1"
+    assert buf.get_text() == "def f():    x = 1\n    pass"
+    assert buf.offset(1, 2) == 20 and buf.position(20) == (1, 2)
+
+
+def test_edit_near_top_keeps_rest_of_long_file():
+    lines = [f"satir_{i} = {i}" for i in range(5000)]
+    buf = TextBuffer("\n".join(lines))
+    tail = buf[4000]
+    buf.insert(0, 0, "# baş\n")
+    buf.insert(2, 3, "x")
+    # Sonraki satırlar yeniden oluşturulmaz, yalnızca kayar
+    assert buf[4001] is tail
+    assert buf[0] == "# baş" and buf[2] == "satxir_1 = 1"
+    assert len(buf._pieces) < 10
+
+
+def test_typing_is_one_undo_group_and_redo_restores_it():
+    buf = TextBuffer("print()")
+    for i, ch in enumerate("merhaba"):
+        buf.insert(0, 6 + i, ch)
+    assert buf[0] == "print(merhaba)"
+    assert len(buf._undo) == 1 and buf._undo[0] == [(6, "", "merhaba")]
+    assert buf.undo() == (0, 6)
+    assert buf[0] == "print()"
+    assert buf.undo() is None
+    assert buf.redo() == (0, 13)
+    assert buf[0] == "print(merhaba)"
+
+
+def test_groups_break_on_direction_change_and_explicit_break():
+    buf = TextBuffer("")
+    buf.insert(0, 0, "abc")
+    buf.insert(0, 3, "d")
+    buf.delete(0, 3, 1)          # silme: yeni grup
+    buf.delete(0, 2, 1)          # geri silmeler birleşir
+    buf.break_group()
+    buf.insert(0, 2, "Z")
+    assert buf.get_text() == "abZ"
+    assert buf.undo() == (0, 2) and buf.get_text() == "ab"
+    assert buf.undo() == (0, 4) and buf.get_text() == "abcd"
+    assert buf.undo() == (0, 0) and buf.get_text() == ""
+    # Yeni düzenleme yinele kaydını temizler
+    buf.insert(0, 0, "q")
+    assert buf.redo() is None
+
+
+def test_set_text_is_a_single_undo_step():
+    buf = TextBuffer("eski")
+    buf.set_text("yeni\nkod")
+    assert list(buf) == ["yeni", "kod"]
+    buf.undo()
+    assert list(buf) == ["eski"]
+
+
+def test_random_edits_match_list_model():
+    rng = random.Random(7)
+    text = "ab\ncd\n\nef"
+    buf, model = TextBuffer(text), text
+    buf.COMPACT_PIECES = 16
+    for _ in range(500):
+        lines = model.split("\n")
+        y = rng.randrange(len(lines))
+        x = rng.randint(0, len(lines[y]))
+        offset = sum(len(line) + 1 for line in lines[:y]) + x
+        if rng.random() < 0.55:
+            piece = "".join(rng.choice("xy\n ") for _ in range(rng.randint(1, 3)))
+            buf.insert(y, x, piece)
+            model = model[:offset] + piece + model[offset:]
+        else:
+            n = rng.randint(1, 4)
+            assert buf.delete(y, x, n) == model[offset:offset + n]
+            model = model[:offset] + model[offset + n:]
+        if rng.random() < 0.1:
+            buf.break_group()
+        assert list(buf) == model.split("\n")
+    while buf.undo() is not None:
+        pass
+    assert buf.get_text() == text
+
+
+def test_reported_changes_keep_highlight_states_exact():
+    """take_changes() aralıklarıyla güncellenen durumlar tam taramayla aynıdır."""
+    from tokenizer import HighlightCache
+    rng = random.Random(11)
+    pieces = ["x = 1", "\n", '"""', "'", "\\", "def f():", "\n    y", "#"]
+    buf = TextBuffer("\n".join(f"satir{i} = {i}" for i in range(40)))
+    cache = HighlightCache()
+    cache.update(buf)
+    buf.take_changes()
+    for _ in range(300):
+        for _ in range(rng.randint(1, 3)):  # Kare başına birkaç düzenleme
+            line = rng.randrange(len(buf))
+            col = rng.randint(0, len(buf[line]))
+            if rng.random() < 0.6:
+                buf.insert(line, col, rng.choice(pieces))
+            else:
+                buf.delete(line, col, rng.randint(1, 8))
+        if rng.random() < 0.1:
+            buf.undo()
+        changes = buf.take_changes() or (None, None, 0)
+        assert cache.update(buf, *changes) == HighlightCache().update(list(buf))
+    assert buf.take_changes() is None
+
+
+def test_changes_stay_inside_buffer_after_undo_at_end():
+    """Sondaki satırları silen birleşik değişiklikler tamponun dışını göstermez."""
+    from tokenizer import HighlightCache
+    buf = TextBuffer("x = 1")
+    cache = HighlightCache()
+    cache.update(buf)
+    buf.insert(0, 5, "\nfoo()")
+    buf.insert(1, 4, "a")
+    cache.update(buf, *buf.take_changes())
+    buf.undo()  # Tek grup: önce 'a', sonra "\nfoo()" silinir
+    assert list(buf) == ["x = 1"]
+    first, last, delta = buf.take_changes()
+    assert (first, delta) == (0, -1) and last <= len(buf)
+    assert cache.update(buf, first, last, delta) == HighlightCache().update(list(buf))
+
+    rng = random.Random(5)
+    for _ in range(300):
+        for _ in range(rng.randint(1, 4)):  # Düzenlemeler hep son satırlarda
+            line = max(0, len(buf) - rng.randint(1, 2))
+            col = rng.randint(0, len(buf[line]))
+            if rng.random() < 0.6:
+                buf.insert(line, col, rng.choice(["\n", "ab", "\n(", ")"]))
+            else:
+                buf.delete(line, col, rng.randint(1, 6))
+        if rng.random() < 0.3:
+            buf.undo()
+        changes = buf.take_changes()
+        if changes:
+            assert changes[1] <= len(buf)
+        assert cache.update(buf, *(changes or (None, None, 0))) == HighlightCache().update(list(buf))
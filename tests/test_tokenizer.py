@@ -1,5 +1,8 @@
+import os
+import sys
+import random
 import pytest
-from tokenizer import Tokenizer, TokenType
+from tokenizer import Tokenizer, TokenType, TokenizerState, HighlightCache, RegexTokenizer
 
 def get_clean_tokens(code):
     t = Tokenizer()
@@ -89,3 +92,141 @@ def test_incomplete_string():
     t = Tokenizer()
     tokens, state = t.tokenize("s = 'Not Finished")
     assert state != 0
+
+
+def test_highlight_cache_carries_triple_quote_state():
+    cache = HighlightCache()
+    lines = ['x = """baş', 'orta def', 'son"""', "y = 'a"]
+    states = cache.update(lines)
+    assert states == [TokenizerState.ROOT, TokenizerState.STRING_TRIPLE_D,
+                      TokenizerState.STRING_TRIPLE_D, TokenizerState.ROOT]
+    tokens, _ = cache.tokens(lines[1], states[1])
+    assert tokens == [(TokenType.STRING, 'orta def')]
+    # Tek tırnaklı string satır sonunda kapanır
+    assert cache.update(lines + ['z'], 4, 5, 1)[-1] == TokenizerState.ROOT
+
+
+def test_highlight_cache_retokenizes_only_until_states_converge():
+    cache = HighlightCache()
+    lines = [f"x{i} = {i}" for i in range(200)]
+    cache.update(lines)
+    assert cache.retokenized == 200
+
+    lines[50] = "x50 = 51"
+    cache.update(lines, 50, 51)
+    assert cache.retokenized == 1
+
+    assert cache.update(lines, None) and cache.retokenized == 0
+
+    # Satır ekleme: yalnızca yeni satır taranır
+    lines.insert(10, "yeni = 1")
+    states = cache.update(lines, 10, 11, 1)
+    assert cache.retokenized == 1 and len(states) == 201
+
+    # Satır silme: yalnızca birleşen satır taranır
+    del lines[10]
+    states = cache.update(lines, 10, 10, -1)
+    assert cache.retokenized == 0 and len(states) == 200
+    lines.insert(10, "yeni = 1")
+    cache.update(lines, 10, 11, 1)
+
+    # Açılan üçlü tırnak sonraki satırların durumunu değiştirir ...
+    lines[100] = 's = """'
+    states = cache.update(lines, 100, 101)
+    assert cache.retokenized == 101
+    assert states[150] == TokenizerState.STRING_TRIPLE_D
+    # ... kapatıldığında sonraki satırlar eski ROOT durumlarına döner
+    lines[102] = '"""'
+    states = cache.update(lines, 102, 103)
+    assert cache.retokenized == len(lines) - 102
+    assert states[103] == TokenizerState.ROOT and states[150] == TokenizerState.ROOT
+    # Tam tarama ile aynı sonuç
+    assert states == HighlightCache().update(lines)
+
+
+class _CountingLines(list):
+    """Okunan satır sayısını sayan liste."""
+    reads = 0
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return super().__getitem__(index)
+
+
+def test_highlight_cache_reads_only_edited_lines_of_large_buffer():
+    cache = HighlightCache()
+    lines = _CountingLines(f"x{i} = {i}" for i in range(100_000))
+    cache.update(lines)
+    assert cache.retokenized == 100_000
+
+    # Ortadaki bir düzenleme ve değişmeyen bir kare: tampon boyundan bağımsız
+    for changed in ((60_000, 60_001, 0), (None, None, 0), (5, 6, 0)):
+        if changed[0] is not None:
+            lines[changed[0]] = "degisti = 1"
+        lines.reads = 0
+        cache.update(lines, *changed, limit=100_000)
+        assert lines.reads <= 2
+
+    # Yeni satır ekleme ve görünümü en başa almak da sınırlı
+    lines.insert(70_000, "yeni = 1")
+    lines.reads = 0
+    cache.update(lines, 70_000, 70_001, 1, limit=30)
+    assert lines.reads <= 2  # Görünüm üstte: aradaki satırlar okunmaz
+    cache.update(lines, None)
+    assert lines.reads <= 2
+    assert cache.update(lines, None) == HighlightCache().update(list(lines))
+
+
+def test_highlight_cache_matches_full_tokenize():
+    tokenizer = Tokenizer()
+    lines = ['def f():', '    """Belge', '    satırı"""', "    return 'x'"]
+    cache = HighlightCache(tokenizer)
+    states = cache.update(lines)
+    state = TokenizerState.ROOT
+    for line, cached_state in zip(lines, states):
+        assert cached_state == state
+        tokens, end = tokenizer.tokenize(line, state)
+        assert cache.tokens(line, state)[0] == tokens
+        state = HighlightCache.carry_state(line, end)
+
+
+def _all_states():
+    return [v for k, v in vars(TokenizerState).items() if not k.startswith('_')]
+
+
+def test_regex_tokenizer_matches_reference_on_curriculum():
+    from curriculum_manager import CurriculumManager
+    cm = CurriculumManager(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'curriculum'))
+    cm.load()
+    reference, regex = Tokenizer(), RegexTokenizer()
+    checked = 0
+    for lesson in cm.lessons:
+        code = lesson.solution_code or ""
+        assert regex.tokenize(code) == reference.tokenize(code)
+        state = TokenizerState.ROOT
+        for line in code.splitlines():
+            expected = reference.tokenize(line, state)
+            assert regex.tokenize(line, state) == expected, line
+            state = expected[1]
+            checked += 1
+    assert checked > 100
+
+
+def test_regex_tokenizer_matches_reference_on_fuzzed_input():
+    pieces = list("ab_Z09. \t\n#'\"\\()=:+-{}") + [
+        'def ', 'class ', 'print', 'if', '"""', "'''", '1.5', 'ş', 'İ', 'ğü',
+        '²', '½', '一', '٣', ' ', '→']
+    rng = random.Random(1234)
+    reference, regex = Tokenizer(), RegexTokenizer()
+    for _ in range(3000):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 25)))
+        for state in _all_states():
+            assert regex.tokenize(text, state) == reference.tokenize(text, state), (text, state)
+
+
+def test_bench_tokenizer_reports_speedup():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools'))
+    import bench_tokenizer
+    results = bench_tokenizer.run_benchmark({"kısa": ['x = "a" # b', 'def f(): return 1']}, repeat=1)
+    assert results["kısa"]["lines"] == 2
+    assert results["kısa"]["speedup"] > 0
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Kare modeli (ui/frame.py) ve değişen satır çizimi testleri.
+"""
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from virtual_terminal import VirtualTerminal
+from ui import renderer as renderer_module
+from ui.frame import FrameCanvas
+from ui.footer import FooterState
+
+
+class RecordingTerminal(VirtualTerminal):
+    """Terminale giden yazma çağrılarını sayar."""
+
+    def __init__(self, rows=24, cols=80):
+        super().__init__(rows, cols)
+        self.writes = []
+        self.cleared_rows = []
+        self.erases = 0
+
+    def addstr(self, *args):
+        self.writes.append(args)
+        super().addstr(*args)
+
+    def clrtoeol(self):
+        self.cleared_rows.append(self.cursor_y)
+        super().clrtoeol()
+
+    def erase(self):
+        self.erases += 1
+        super().erase()
+
+    def reset_counters(self):
+        self.writes, self.cleared_rows, self.erases = [], [], 0
+
+
+def _draw(canvas, rows, cursor=(0, 0)):
+    canvas.begin()
+    for y, text in rows.items():
+        canvas.addstr(y, 0, text)
+    canvas.move(*cursor)
+    return canvas.present()
+
+
+def test_first_frame_is_full_then_unchanged_frame_writes_nothing():
+    term = RecordingTerminal()
+    canvas = FrameCanvas(term)
+    assert _draw(canvas, {0: "başlık", 2: "kod"}) == 2
+    assert term.erases == 1
+    assert term.get_line(2) == "kod"
+
+    term.reset_counters()
+    assert _draw(canvas, {0: "başlık", 2: "kod"}) == 0
+    assert term.writes == [] and term.cleared_rows == [] and term.erases == 0
+
+
+def test_only_changed_and_vanished_rows_are_rewritten():
+    term = RecordingTerminal()
+    canvas = FrameCanvas(term)
+    _draw(canvas, {0: "a", 1: "b", 2: "c"})
+    term.reset_counters()
+
+    assert _draw(canvas, {0: "a", 1: "bb"}) == 2
+    assert sorted(term.cleared_rows) == [1, 2]
+    assert term.writes == [(1, 0, "bb", 0)]
+    assert [term.get_line(y) for y in range(3)] == ["a", "bb", ""]
+
+
+def test_attribute_change_repaints_row():
+    term = RecordingTerminal()
+    canvas = FrameCanvas(term)
+    canvas.begin()
+    canvas.addstr(0, 0, "x", 1)
+    canvas.present()
+    term.reset_counters()
+
+    canvas.begin()
+    canvas.addstr(0, 0, "x", 2)
+    assert canvas.present() == 1
+    assert term.attrs[0][0] == 2
+
+
+def test_resize_forces_full_repaint():
+    term = RecordingTerminal()
+    canvas = FrameCanvas(term)
+    _draw(canvas, {0: "a"})
+    term.reset_counters()
+    term.rows = 20
+    _draw(canvas, {0: "a"})
+    assert term.erases == 1 and term.writes == [(0, 0, "a", 0)]
+
+
+def _editor(buffer, cy=0, cx=0):
+    return SimpleNamespace(
+        message="", message_timestamp=None, completed_count=0, skipped_count=0,
+        task_status="", task_info="BÖLÜM: Giriş\nGÖREV 1: Merhaba\n\nSORU: Yazdır.",
+        footer_state=FooterState(), hint_text="", buffer=buffer, cy=cy, cx=cx,
+        is_locked=False, has_skipped=False,
+    )
+
+
+def test_cursor_move_repaints_nothing_but_cursor(mock_curses):
+    term = RecordingTerminal(rows=30, cols=100)
+    editor = _editor(["print(1)", "x = 2", ""])
+    renderer = renderer_module.EditorRenderer(term, editor)
+    renderer.refresh_screen()
+    assert "print" in term.get_content()
+    term.reset_counters()
+
+    editor.cy, editor.cx = 1, 3
+    renderer.refresh_screen()
+    assert term.writes == [] and term.cleared_rows == []
+    assert renderer.canvas.cursor == (term.cursor_y, term.cursor_x)
+    mock_curses.curs_set.assert_not_called()
+
+
+def test_typing_repaints_only_edited_line():
+    term = RecordingTerminal(rows=30, cols=100)
+    editor = _editor(["print(1)", "x = 2", ""])
+    renderer = renderer_module.EditorRenderer(term, editor)
+    renderer.refresh_screen()
+    term.reset_counters()
+
+    editor.buffer[1] = "x = 23"
+    renderer.refresh_screen()
+    assert len(term.cleared_rows) == 1
+    assert "x = 23" in term.get_line(term.cleared_rows[0])
+
+
+def test_highlighter_merges_runs_into_few_writes():
+    term = RecordingTerminal(rows=30, cols=100)
+    line = "    toplam = toplam + sayi * 2  # ara toplam"
+    editor = _editor([line, "x = 1", ""])
+    renderer = renderer_module.EditorRenderer(term, editor)
+    runs = renderer._line_runs(line, renderer.TokenizerState.ROOT)
+    tokens, _ = renderer.highlighter.tokens(line, renderer.TokenizerState.ROOT)
+    assert "".join(text for text, _ in runs) == line
+    assert len(runs) < len(tokens) // 3
+    # Komşu parçalar hiçbir zaman aynı attr'ı taşımaz
+    assert all(a[1] != b[1] for a, b in zip(runs, runs[1:]))
+
+
+def test_fstring_body_is_split_on_braces():
+    from ui.colors import get_token_attrs, FSTRING_BRACE, FSTRING_EXPR
+    from tokenizer import TokenType
+    term = RecordingTerminal(rows=30, cols=100)
+    renderer = renderer_module.EditorRenderer(term, _editor([""]))
+    # Test ortamında curses sahte; attr'ları ayırt edilebilir değerlere çevir
+    renderer.token_attrs = dict(get_token_attrs(), **{
+        TokenType.STRING: 1, TokenType.TEXT: 0, TokenType.OP: 0,
+        FSTRING_BRACE: 2, FSTRING_EXPR: 3})
+    runs = renderer._build_runs(renderer.highlighter.tokens('f"a{b}c"')[0])
+    assert runs == [("f", 0), ('"a', 1), ("{", 2), ("b", 3), ("}", 2), ('c"', 1)]
+
+
+def test_task_layout_is_cached_until_width_content_or_hint_changes(monkeypatch):
+    term = RecordingTerminal(rows=30, cols=100)
+    editor = _editor(["x = 1", ""])
+    editor.task_info = "BÖLÜM: Giriş\nGÖREV 1: " + "uzun açıklama " * 20 + "\n\nSORU: Yazdır."
+    editor.hint_text = "print kullan"
+    renderer = renderer_module.EditorRenderer(term, editor)
+
+    calls = []
+    original = renderer._layout_task_rows
+    monkeypatch.setattr(renderer, "_layout_task_rows", lambda *a: calls.append(a) or original(*a))
+
+    renderer.refresh_screen()
+    for ch in "23":
+        editor.buffer[0] += ch
+        renderer.refresh_screen()
+    assert len(calls) == 1
+
+    editor.footer_state.show_hint = True
+    renderer.refresh_screen()
+    assert len(calls) == 2 and "İPUCU" in term.get_content()
+
+    term.cols = 80
+    renderer.refresh_screen()
+    assert len(calls) == 3
+
+    editor.task_info += " değişti"
+    renderer.refresh_screen()
+    assert len(calls) == 4
+
+
+def test_developer_message_wrapping_is_cached():
+    from ui.dev_message import wrap_message, line_runs
+    wrap_message.cache_clear()
+    text = "Merhaba @brkeyp " * 30 + "\n\nSon satır"
+    first = wrap_message(text, 40)
+    assert wrap_message(text, 40) is first
+    assert wrap_message.cache_info().hits == 1
+    assert all(len(line) <= 40 for line in first)
+    assert line_runs("a @brkeyp b") == (("a ", False), ("@brkeyp", True), (" b", False))
+
+
+def test_viewport_follows_cursor_and_clamps():
+    from ui.viewport import Viewport
+    view = Viewport()
+    assert view.follow_line(25, 10, 100) == 16
+    assert view.follow_line(20, 10, 100) == 16
+    assert view.follow_line(3, 10, 100) == 3
+    # Buffer kısalınca altta boşluk kalmaz
+    view.scroll_y = 50
+    assert view.follow_line(55, 10, 58) == 48
+    assert list(view.visible_range(10, 58)) == list(range(48, 58))
+
+    assert view.follow_column(30, 20) == 19   # sağ kenar: HSCROLL_STEP kadar ileri
+    assert view.follow_column(25, 20) == 19
+    assert view.follow_column(2, 20) == 0
+
+
+def test_long_buffer_draws_only_visible_slice_around_cursor():
+    term = RecordingTerminal(rows=30, cols=100)
+    from ui.text_buffer import TextBuffer
+    lines = [f"x{i} = {i}" for i in range(20000)] + [""]
+    # TextBuffer değişen satırları bildirir (düz listede her kare baştan denetlenir)
+    editor = _editor(TextBuffer("\n".join(lines)), cy=15000, cx=3)
+    renderer = renderer_module.EditorRenderer(term, editor)
+    renderer.refresh_screen()
+
+    content = term.get_content()
+    assert "Satır 15001: x15000 = 15000" in content
+    assert "Satır 1: " not in content
+    y, x = term.cursor_y, term.cursor_x
+    assert term.get_line(y).startswith("Satır 15001: ")
+    # Görünen en büyük numara 5 hane: satır numarası sütunu genişledi
+    assert x == len("Satır 15001: ") + 3
+    drawn = [args for args in term.writes if args[1] == 0 and args[2].startswith("Satır")]
+    assert len(drawn) < 30
+
+    # Görünüm altındaki satırlar tokenize edilmez; kaydırınca yalnızca yeni satır
+    assert renderer.highlighter.retokenized < 15100
+    editor.cy += 30
+    renderer.refresh_screen()
+    assert renderer.highlighter.retokenized == 30
+
+
+def test_frame_cost_depends_on_screen_not_buffer_length():
+    """100 bin satırlık tamponda değişmeyen kare, yazım ve uçlara atlama yalnızca ekrandaki satırları okur."""
+    from ui.text_buffer import TextBuffer
+
+    class CountingBuffer(TextBuffer):
+        reads = 0
+
+        def __getitem__(self, index):
+            result = super().__getitem__(index)
+            self.reads += len(result) if isinstance(index, slice) else 1
+            return result
+
+    rows = 30
+    buffer = CountingBuffer("\n".join(f"x{i} = {i}" for i in range(100_000)))
+    editor = _editor(buffer, cy=99_999, cx=0)
+    renderer = renderer_module.EditorRenderer(RecordingTerminal(rows=rows, cols=100), editor)
+    renderer.refresh_screen()
+
+    def frame():
+        buffer.reads = 0
+        renderer.refresh_screen()
+        return buffer.reads
+
+    assert frame() <= rows
+    buffer.insert(99_999, 0, "a")
+    assert frame() <= rows
+    editor.cy = 0
+    assert frame() <= rows
+    buffer.insert(0, 0, "b = 1\n")
+    assert frame() <= rows
+    editor.cy = len(buffer) - 1
+    assert frame() <= rows
+    assert "Satır 100001: ax99999 = 99999" in renderer.stdscr.get_content()
+
+
+def test_horizontal_scroll_keeps_cursor_on_screen():
+    term = RecordingTerminal(rows=30, cols=60)
+    line = "print(" + "'a' + " * 30 + "'son')"
+    editor = _editor(["x = 1", line, ""], cy=1, cx=len(line))
+    renderer = renderer_module.EditorRenderer(term, editor)
+    renderer.refresh_screen()
+
+    row = term.get_line(term.cursor_y)
+    assert row.startswith("Satır 2: ")
+    assert row.rstrip().endswith("'son')")
+    assert term.cursor_x < 60
+    # Aynı kaydırma tüm satırlara uygulanır
+    assert renderer.viewport.scroll_x > 0
+    assert "x = 1" not in term.get_content()
+
+    editor.cx = 0
+    renderer.refresh_screen()
+    assert renderer.viewport.scroll_x == 0
+    assert term.get_line(term.cursor_y).startswith("Satır 2:    print(")
+
+
+def test_renderer_uses_reference_tokenizer_unless_opted_in(monkeypatch):
+    import config
+    from tokenizer import Tokenizer, RegexTokenizer
+    editor = _editor(["print(1)"])
+    renderer = renderer_module.EditorRenderer(RecordingTerminal(rows=30, cols=100), editor)
+    assert type(renderer.tokenizer) is Tokenizer
+
+    monkeypatch.setattr(config.Layout, "REGEX_TOKENIZER", True)
+    renderer = renderer_module.EditorRenderer(RecordingTerminal(rows=30, cols=100), editor)
+    assert isinstance(renderer.tokenizer, RegexTokenizer)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Zamanlayıcı yığını ve olay güdümlü editör döngüsü testleri.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from virtual_terminal import VirtualTerminal
+from ui.timers import TimerHeap
+from ui.editor import Editor
+from input.api import EventType, InputEvent
+
+
+def test_timer_heap_orders_and_replaces_deadlines():
+    timers = TimerHeap()
+    assert timers.next_deadline() is None and timers.timeout_ms(0) == -1
+    timers.schedule('a', 5.0)
+    timers.schedule('b', 2.0)
+    timers.schedule('a', 1.0)   # öne çekildi
+    assert timers.next_deadline() == 1.0
+    assert timers.timeout_ms(0.5) == 500
+    assert timers.pop_due(1.5) == ['a']
+    assert timers.pop_due(1.5) == []
+    timers.cancel('b')
+    assert timers.next_deadline() is None
+
+
+def test_timer_heap_reschedule_later_fires_once():
+    timers = TimerHeap()
+    timers.schedule('resize', 1.0)
+    timers.schedule('resize', 2.0)
+    assert timers.pop_due(1.5) == []
+    assert timers.pop_due(2.0) == ['resize']
+    assert 'resize' not in timers
+
+
+class ScriptedDriver:
+    """Önceden yazılmış olayları döndürür; istenen zaman aşımlarını kaydeder."""
+
+    def __init__(self, events):
+        self.events = list(events)
+        self.timeouts = []
+
+    def get_event(self, timeout_ms=-1):
+        self.timeouts.append(timeout_ms)
+        if not self.events:
+            return InputEvent(EventType.EXIT)
+        event = self.events.pop(0)
+        if event.type == EventType.TIMEOUT and timeout_ms > 0:
+            time.sleep(timeout_ms / 1000)
+        return event
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def editor():
+    ed = Editor(VirtualTerminal(), task_info="GÖREV 1: Deneme")
+    ed.driver.close()
+    ed.redraws = 0
+    original = ed.renderer.refresh_screen
+
+    def counting_refresh():
+        ed.redraws += 1
+        original()
+
+    ed.renderer.refresh_screen = counting_refresh
+    return ed
+
+
+def _run(editor, events):
+    editor.driver = ScriptedDriver(events)
+    with pytest.raises(KeyboardInterrupt):
+        editor.run()
+    return editor.driver.timeouts
+
+
+def test_idle_editor_blocks_without_timeout(editor):
+    timeouts = _run(editor, [InputEvent(EventType.CHAR, 'x')])
+    assert timeouts == [-1, -1]
+
+
+def test_message_schedules_wakeup(editor):
+    editor.message = "mesaj"
+    editor.message_timestamp = time.time()
+    timeouts = _run(editor, [])
+    assert 2900 <= timeouts[0] <= 3000
+
+
+def test_resize_storm_redraws_once(editor):
+    events = [InputEvent(EventType.RESIZE)] * 5 + [InputEvent(EventType.TIMEOUT)]
+    timeouts = _run(editor, events)
+    # İlk çizim + fırtına sonrası tek çizim
+    assert editor.redraws == 2
+    assert all(0 < t <= 50 for t in timeouts[1:6])
+    assert timeouts[-1] == -1
+
+
+def test_paste_is_one_insertion_and_one_redraw(editor):
+    editor.buffer, editor.cy, editor.cx = ["x = [", ""], 0, 5
+    snippet = "".join(f"\n    {i}," for i in range(200)) + "\n]"
+    _run(editor, [InputEvent(EventType.PASTE, snippet)])
+    # İlk çizim + yapıştırma sonrası tek çizim
+    assert editor.redraws == 2
+    assert editor.buffer[0] == "x = ["
+    assert editor.buffer[1] == "    0,"
+    assert editor.buffer[-2:] == ["]", ""]
+    assert (editor.cy, editor.cx) == (201, 1)
+    # Otomatik parantez kapatma ve ek girinti uygulanmadı
+    assert "\n".join(editor.buffer) == "x = [" + snippet + "\n"
+
+
+def test_undo_and_redo_move_cursor(editor):
+    events = [InputEvent(EventType.CHAR, c) for c in "x = 1"]
+    events += [InputEvent(EventType.ENTER), InputEvent(EventType.CHAR, 'y'),
+               InputEvent(EventType.UNDO), InputEvent(EventType.UNDO), InputEvent(EventType.UNDO)]
+    _run(editor, events)
+    assert list(editor.buffer) == [""] and (editor.cy, editor.cx) == (0, 0)
+
+    _run(editor, [InputEvent(EventType.REDO), InputEvent(EventType.REDO)])
+    assert list(editor.buffer) == ["x = 1", ""] and (editor.cy, editor.cx) == (1, 0)
+    _run(editor, [InputEvent(EventType.REDO), InputEvent(EventType.REDO)])
+    assert list(editor.buffer) == ["x = 1", "y"]
+    assert editor.message == "Yinelenecek değişiklik yok."
@@ -2,6 +2,8 @@
 """
 Lightweight, context-aware Python tokenizer.
 """
+import re
+from collections import OrderedDict
 
 class TokenType:
     TEXT = "TEXT"
@@ -217,3 +219,251 @@ class Tokenizer:
             # safe to leave logic as matches next word.
         
         return tokens, state
+
+
+class RegexTokenizer:
+    """
+    Table-driven variant of Tokenizer built on compiled regexes.
+
+    Produces exactly the same (TokenType, value) tokens and end states as
+    Tokenizer.tokenize, but leaves the scanning to C: in code states
+    (ROOT, DEF_FOUND, CLASS_FOUND) one pattern finds where the code run ends
+    (quote or comment) and one master pattern splits the run into words,
+    numbers and single characters; string bodies are skipped with str.find up
+    to the closing quote listed for the current string state.
+    """
+
+    KEYWORDS = Tokenizer.KEYWORDS
+    BUILTINS = Tokenizer.BUILTINS
+
+    CODE_END = re.compile(r"['\"#]")
+    CODE_PIECES = re.compile(r"[^\W\d]\w*|\d+(?:\.\d+)?|.", re.DOTALL)
+
+    # String states -> closing quote. A single quote closes unless it follows
+    # exactly one backslash (the reference tokenizer only looks two characters
+    # back); a triple quote closes unless it follows any backslash.
+    STRING_END = {
+        TokenizerState.STRING_SINGLE: ("'", False),
+        TokenizerState.STRING_DOUBLE: ('"', False),
+        TokenizerState.STRING_TRIPLE_S: ("'''", True),
+        TokenizerState.STRING_TRIPLE_D: ('"""', True),
+    }
+
+    QUOTE_STATES = {
+        "'''": TokenizerState.STRING_TRIPLE_S,
+        '"""': TokenizerState.STRING_TRIPLE_D,
+        "'": TokenizerState.STRING_SINGLE,
+        '"': TokenizerState.STRING_DOUBLE,
+    }
+
+    def __init__(self):
+        # Fallback for the rare lines where regex classes and str.isalpha /
+        # str.isdigit disagree (numeric characters such as '²' or '½').
+        self._reference = Tokenizer()
+
+    @staticmethod
+    def _find_string_end(text, i, quote, triple):
+        """Index of the quote closing the string body that starts at i, or -1."""
+        j = text.find(quote, i)
+        while j > 0 and text[j - 1] == '\\':
+            if not triple and j > 1 and text[j - 2] == '\\':
+                break
+            j = text.find(quote, j + 1)
+        return j
+
+    def tokenize(self, text, start_state=TokenizerState.ROOT):
+        """Same contract as Tokenizer.tokenize: returns (tokens, end_state)."""
+        tokens = []
+        append = tokens.append
+        pieces = self.CODE_PIECES.findall
+        code_end = self.CODE_END.search
+        string_ends = self.STRING_END
+        keywords, builtins = self.KEYWORDS, self.BUILTINS
+        TEXT, OP, KEYWORD, BUILTIN, NUMBER = (TokenType.TEXT, TokenType.OP, TokenType.KEYWORD,
+                                              TokenType.BUILTIN, TokenType.NUMBER)
+        ROOT = TokenizerState.ROOT
+        state = start_state
+        i = 0
+        length = len(text)
+
+        while i < length:
+            string_end = string_ends.get(state)
+            if string_end is not None:
+                quote, triple = string_end
+                j = self._find_string_end(text, i, quote, triple)
+                if j == -1:
+                    append((TokenType.STRING, text[i:]))
+                    break
+                if j > i:
+                    append((TokenType.STRING, text[i:j]))
+                append((TokenType.STRING, quote))
+                state = TokenizerState.ROOT
+                i = j + len(quote)
+                continue
+
+            match = code_end(text, i)
+            end = match.start() if match else length
+            for value in pieces(text, i, end):
+                first = value[0]
+                if first.isalpha() or first == '_':
+                    if state == ROOT:
+                        if value in keywords:
+                            append((KEYWORD, value))
+                            if value == "def":
+                                state = TokenizerState.DEF_FOUND
+                            elif value == "class":
+                                state = TokenizerState.CLASS_FOUND
+                        elif value in builtins:
+                            append((BUILTIN, value))
+                        else:
+                            append((TEXT, value))
+                    elif state == TokenizerState.DEF_FOUND:
+                        append((TokenType.FUNCTION_DEF, value))
+                        state = ROOT
+                    else:  # CLASS_FOUND
+                        append((TokenType.CLASS_DEF, value))
+                        state = ROOT
+                elif first.isspace():
+                    append((TEXT, value))
+                elif first.isdecimal():
+                    append((NUMBER, value))
+                elif first > '\x7f' and first.isnumeric():
+                    # '²', '½': \w / \d and str.isalpha / str.isdigit disagree
+                    return self._reference.tokenize(text, start_state)
+                else:
+                    append((OP, value))
+
+            if end == length:
+                break
+            if text[end] == '#':
+                append((TokenType.COMMENT, text[end:]))
+                break
+            quote = text[end] * 3 if text.startswith(text[end] * 3, end) else text[end]
+            append((TokenType.STRING, quote))
+            state = self.QUOTE_STATES[quote]
+            i = end + len(quote)
+
+        return tokens, state
+
+
+class HighlightCache:
+    """
+    Per-line token cache for a whole buffer.
+
+    Tokens are cached by (line text, entry state), so a line that did not
+    change and starts in the same state is never tokenized again. The entry
+    state of each line is the carried exit state of the previous one, which
+    lets triple-quoted strings span lines.
+
+    Entry states are kept in a list indexed by line. The caller tells update()
+    which lines an edit touched; only those are re-tokenized, and below them
+    only until a line's entry state matches the old one shifted by the edit.
+    No snapshot of the buffer is kept or compared, so the lines read per
+    update depend on the edit (and on how far the view reaches), not on the
+    length of the buffer.
+    """
+
+    # Entries kept beyond one per line with a known state (least recently used go first)
+    SLACK_ENTRIES = 256
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer or Tokenizer()
+        self._entries = OrderedDict()  # (text, entry_state) -> (tokens, exit_state)
+        self._states = []    # entry state of lines 0 .. len-1
+        self._end_state = TokenizerState.ROOT  # entry state of the first line not in _states
+        self.retokenized = 0  # lines re-tokenized by the last update()
+
+    @staticmethod
+    def carry_state(line, state):
+        """State the next line starts in, given this line's exit state."""
+        if state in (TokenizerState.STRING_TRIPLE_S, TokenizerState.STRING_TRIPLE_D):
+            return state
+        # Single-quoted strings and 'def'/'class' headers end with the line
+        # unless it is continued with a backslash.
+        if state != TokenizerState.ROOT and not line.endswith('\\'):
+            return TokenizerState.ROOT
+        return state
+
+    def tokens(self, line, state=TokenizerState.ROOT):
+        """Returns (tokens, carried exit state) for one line, from the cache if possible."""
+        key = (line, state)
+        entry = self._entries.get(key)
+        if entry is None:
+            tokens, end_state = self.tokenizer.tokenize(line, state)
+            entry = (tokens, self.carry_state(line, end_state))
+            self._entries[key] = entry
+            if len(self._entries) > len(self._states) + self.SLACK_ENTRIES:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def next_state(self, line, state=TokenizerState.ROOT):
+        """
+        Entry state of the line after `line`. A line that starts in ROOT and
+        has no quote and no trailing backslash always ends in ROOT; it is not
+        tokenized here (only lines on screen need tokens).
+        """
+        if (state == TokenizerState.ROOT and "'" not in line and '"' not in line
+                and not line.endswith('\\')):
+            return state
+        return self.tokens(line, state)[1]
+
+    def update(self, lines, changed_from=0, changed_to=None, delta=0, limit=None):
+        """
+        Brings entry states in line with `lines` and returns them (list
+        indexed by line, valid until the next update).
+
+        The caller describes the edits since the previous update: lines
+        [changed_from, changed_to) are new or changed, and every line from
+        changed_to on is the old line `i - delta`. changed_from=None means
+        nothing changed; changed_to=None means every line from changed_from
+        on may have changed. The defaults re-check the whole buffer.
+
+        With `limit`, new states are only computed for the first `limit` lines
+        (a line's state depends only on the lines above it), so a view showing
+        the top of a long buffer never reads or tokenizes the rest. Edited
+        lines are always taken in, so the states kept below them stay usable.
+        """
+        states = self._states
+        stop = len(lines) if limit is None else min(len(lines), limit)
+        retokenized = 0
+
+        if changed_to is None and changed_from is not None and changed_from < len(states):
+            # Everything below may have changed: drop it and read it again below
+            self._end_state = states[changed_from]
+            del states[changed_from:]
+        elif changed_from is not None and changed_from <= len(states):
+            start = changed_from
+            state = states[start] if start < len(states) else self._end_state
+            new_states = []
+            i = start
+            while True:
+                j = i - delta  # Same line before the edit
+                if (changed_to is not None and i >= changed_to and 0 <= j <= len(states)
+                        and state == (states[j] if j < len(states) else self._end_state)):
+                    # Converged: old states from here on still hold, shifted by delta
+                    states[start:j] = new_states
+                    break
+                if i >= stop and (changed_to is None or i >= changed_to):
+                    # The edited lines are always taken in; the ripple below only within the view
+                    del states[start:]
+                    states.extend(new_states)
+                    self._end_state = state
+                    break
+                new_states.append(state)
+                state = self.next_state(lines[i], state)
+                retokenized += 1
+                i += 1
+
+        # Lines below the ones seen so far, as far as the view reaches (read as one slice)
+        if len(states) < stop:
+            state = self._end_state
+            for line in lines[len(states):stop]:
+                states.append(state)
+                state = self.next_state(line, state)
+                retokenized += 1
+            self._end_state = state
+
+        self.retokenized = retokenized
+        return states
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tokenizer Karşılaştırma Ölçümü
+Karakter karakter tarayan Tokenizer ile regex tabanlı RegexTokenizer'ı aynı
+girdiler üzerinde ölçer ve önce çıktılarının birebir aynı olduğunu doğrular.
+
+Senaryolar:
+    - uzun satır: müfredat çözümlerinden birleştirilmiş tek bir uzun satır
+    - büyük buffer: tüm çözümler satır satır, durum satırdan satıra taşınarak
+    - string ağırlıklı: uzun string ve yorum içeren satırlar
+
+Editör varsayılan olarak Tokenizer kullanır; RegexTokenizer
+OCAGI_REGEX_TOKENIZER=1 ile açılır.
+
+Örnek:
+    python3 tools/bench_tokenizer.py --repeat 5
+"""
+import os
+import sys
+import time
+import argparse
+
+# Proje kökü (tokenizer, curriculum_manager importları için)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tokenizer import Tokenizer, RegexTokenizer, TokenizerState
+
+
+def load_solution_lines():
+    """Müfredattaki tüm çözüm dosyalarının satırlarını döndürür."""
+    from curriculum_manager import CurriculumManager
+    cm = CurriculumManager(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                        'curriculum'))
+    cm.load()
+    lines = []
+    for lesson in cm.lessons:
+        if lesson.solution_code:
+            lines.extend(lesson.solution_code.splitlines())
+    return lines
+
+
+def build_scenarios(lines):
+    """Senaryo adı -> satır listesi."""
+    long_line = " ; ".join(line.strip() for line in lines if line.strip() and not line.lstrip().startswith('#'))
+    string_heavy = [f"mesaj = f\"{'Merhaba dünya, ' * 20}{{ad}}\"  # {'açıklama ' * 10}"] * 200
+    return {
+        "uzun satır": [long_line],
+        "büyük buffer": lines * 10,
+        "string ağırlıklı": string_heavy,
+    }
+
+
+def tokenize_buffer(tokenizer, lines):
+    """Satırları sırayla tokenize eder; çok satırlı string durumunu taşır."""
+    state = TokenizerState.ROOT
+    out = []
+    for line in lines:
+        tokens, state = tokenizer.tokenize(line, state)
+        out.append(tokens)
+    return out
+
+
+def best_time(func, repeat):
+    """`repeat` denemenin en kısa süresi (saniye)."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_benchmark(scenarios, repeat=5):
+    """Her senaryo için süreleri ve hızlanma oranını döndürür."""
+    reference, regex = Tokenizer(), RegexTokenizer()
+    results = {}
+    for name, lines in scenarios.items():
+        if tokenize_buffer(reference, lines) != tokenize_buffer(regex, lines):
+            raise AssertionError(f"Çıktılar farklı: {name}")
+        ref_time = best_time(lambda: tokenize_buffer(reference, lines), repeat)
+        regex_time = best_time(lambda: tokenize_buffer(regex, lines), repeat)
+        results[name] = {
+            "lines": len(lines),
+            "chars": sum(len(line) for line in lines),
+            "reference_ms": round(ref_time * 1000, 3),
+            "regex_ms": round(regex_time * 1000, 3),
+            "speedup": round(ref_time / regex_time, 2) if regex_time else None,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tokenizer / RegexTokenizer hız karşılaştırması")
+    parser.add_argument("--repeat", type=int, default=5, help="Senaryo başına deneme sayısı")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(build_scenarios(load_solution_lines()), args.repeat)
+    print(f"{'Senaryo':<18} {'Satır':>7} {'Karakter':>9} {'Tokenizer':>11} {'Regex':>9} {'Hızlanma':>9}")
+    for name, r in results.items():
+        print(f"{name:<18} {r['lines']:>7} {r['chars']:>9} {r['reference_ms']:>9.2f}ms "
+              f"{r['regex_ms']:>7.2f}ms {r['speedup']:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Değerlendirme Yük Testi
+Sandbox'ın saniyede kaç gönderim kaldırabildiğini ölçer.
+
+Gönderim karışımı müfredattan üretilir: doğru çözümler (solution.py), bunların
+bilerek bozulmuş türevleri ve sonsuz döngüler. İşler hedef hızda (açık döngü:
+gecikme, işin PLANLANAN başlangıcından ölçülür) seçilen arka uca gönderilir;
+sonuç JSON olarak raporlanır: verim, p50/p95/p99 gecikme, zaman aşımları ve
+zaman içinde sandbox işçi RSS'i.
+
+Örnekler:
+    python3 tools/load_test.py --target pool --rate 20 --duration 30
+    python3 tools/load_test.py --target http --url http://127.0.0.1:8765 --rate 50 --pid <servis pid>
+    python3 tools/load_test.py --rate 10 --max-p99-ms 2000 --output rapor.json   # gerilemede çıkış kodu 1
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+import collections
+import concurrent.futures
+
+# Proje kökü (curriculum_manager, sandbox importları için)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+KINDS = ('solution', 'broken', 'infinite')
+DEFAULT_MIX = {'solution': 0.7, 'broken': 0.25, 'infinite': 0.05}
+INFINITE_LOOP = "while True:\n    pass\n"
+TARGETS = ('pool', 'scheduler', 'run_safe', 'http')
+
+
+# --- gönderim karışımı ---
+
+def break_code(code, rng):
+    """Çözümün doğrulamayı geçmeyecek (ama gerçekçi) bir türevini üretir."""
+    lines = code.rstrip('\n').split('\n') or ['']
+    strategy = rng.randrange(4)
+    if strategy == 0:  # Yazım hatası: satır sonuna fazladan parantez
+        i = rng.randrange(len(lines))
+        lines[i] += '('
+    elif strategy == 1:  # Yarım kalmış çözüm
+        lines = lines[:max(1, len(lines) // 2)]
+        lines.append('pass')
+    elif strategy == 2:  # Çalışma zamanı hatası
+        lines.insert(rng.randrange(len(lines) + 1), 'raise ValueError("hata")')
+    else:  # Yanlış çıktı
+        lines.append('print("yanlış cevap")')
+    return '\n'.join(lines) + '\n'
+
+
+def parse_mix(text):
+    """'solution=0.7,broken=0.25,infinite=0.05' -> normalize edilmiş oranlar."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        kind, _, weight = part.partition('=')
+        if kind not in KINDS:
+            raise ValueError(f"Bilinmeyen tür: {kind} (geçerli: {', '.join(KINDS)})")
+        mix[kind] = float(weight)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Karışım oranlarının toplamı pozitif olmalı")
+    return {kind: weight / total for kind, weight in mix.items()}
+
+
+def build_jobs(lessons, count, mix=None, seed=0):
+    """
+    `count` adet (tür, ders, kod) işi üretir. Tür sırası karıştırılmıştır,
+    aynı seed aynı karışımı verir.
+    """
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    lessons = [l for l in lessons if l.solution_code]
+    if not lessons:
+        raise ValueError("Çözümü olan ders bulunamadı")
+
+    kinds = []
+    for kind, share in mix.items():
+        kinds.extend([kind] * round(count * share))
+    kinds = (kinds + ['solution'] * count)[:count]
+    rng.shuffle(kinds)
+
+    jobs = []
+    for kind in kinds:
+        lesson = rng.choice(lessons)
+        if kind == 'solution':
+            code = lesson.solution_code
+        elif kind == 'broken':
+            code = break_code(lesson.solution_code, rng)
+        else:
+            code = INFINITE_LOOP
+        jobs.append((kind, lesson, code))
+    return jobs
+
+
+# --- ölçüm ---
+
+def percentile(ordered, p):
+    """Sıralı listede en yakın sıra yüzdeliği (boşsa None)."""
+    if not ordered:
+        return None
+    return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+
+
+def latency_summary(seconds):
+    ordered = sorted(seconds)
+    summary = {f"p{p}": percentile(ordered, p) for p in (50, 95, 99)}
+    summary["max"] = ordered[-1] if ordered else None
+    return {k: (round(v * 1000, 2) if v is not None else None) for k, v in summary.items()}
+
+
+def _children(pid):
+    """pid'in doğrudan alt süreçleri (Linux /proc)."""
+    children = []
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # comm parantez içinde boşluk içerebilir: son ')' sonrasını ayrıştır
+                fields = f.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def worker_rss(pid):
+    """pid altındaki tüm alt süreçlerin (sandbox işçileri) sayısı ve toplam RSS'i (MB)."""
+    page = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+    total, count = 0, 0
+    stack = _children(pid)
+    while stack:
+        child = stack.pop()
+        try:
+            with open(f'/proc/{child}/statm') as f:
+                total += int(f.read().split()[1]) * page
+            count += 1
+        except (OSError, IndexError, ValueError):
+            continue
+        stack.extend(_children(child))
+    return count, round(total / (1024 * 1024), 2)
+
+
+class RssSampler:
+    """Arka planda periyodik olarak işçi RSS'ini örnekler."""
+
+    def __init__(self, pid, interval):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._started = time.monotonic()
+
+    def _run(self):
+        while not self._stop.is_set():
+            workers, rss = worker_rss(self.pid)
+            self.samples.append({"t": round(time.monotonic() - self._started, 2),
+                                 "workers": workers, "rss_mb": rss})
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if os.path.isdir('/proc'):
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+# --- arka uçlar ---
+
+def _validator_args(lesson):
+    path = lesson.validator_script
+    if not (path and os.path.exists(path)):
+        path = None
+    return path, lesson.get_validator_code()
+
+
+def make_target(name, workers, timeout, url=None):
+    """
+    (execute(tür, ders, kod, iş_no) -> sonuç sözlüğü, kapatma fonksiyonu) döndürür.
+    """
+    import multiprocessing
+    ctx = multiprocessing.get_context('spawn')  # Uygulamanın kullandığı başlatma yöntemi
+
+    if name in ('pool', 'scheduler'):
+        from sandbox.pool import SandboxPool
+        pool = SandboxPool(workers, timeout=timeout, context=ctx)
+        if name == 'pool':
+            def execute(kind, lesson, code, n):
+                path, validator_code = _validator_args(lesson)
+                return pool.run(code, path, validator_code=validator_code)
+        else:
+            from sandbox.scheduler import FairScheduler
+            scheduler = FairScheduler(
+                lambda c, p, validator_code=None: pool.run(c, p, validator_code=validator_code),
+                workers)
+
+            def execute(kind, lesson, code, n):
+                path, validator_code = _validator_args(lesson)
+                # Sonsuz döngüler tek bir "saldırgan" öğrenciden, gerisi sınıftan
+                learner = 'abuser' if kind == 'infinite' else f'learner{n % (workers * 4)}'
+                return scheduler.run(learner, code, path, validator_code)
+        return execute, pool.close
+
+    if name == 'run_safe':
+        multiprocessing.set_start_method('spawn', force=True)
+        from sandbox.executor import run_safe
+
+        def execute(kind, lesson, code, n):
+            path, validator_code = _validator_args(lesson)
+            return run_safe(code, path, timeout=timeout, validator_code=validator_code)
+        return execute, lambda: None
+
+    if name == 'http':
+        import urllib.request
+        import urllib.error
+        if not url:
+            raise ValueError("--target http için --url gerekli")
+
+        def execute(kind, lesson, code, n):
+            body = json.dumps({"lesson": lesson.uuid, "code": code,
+                               "learner": f"learner{n % 64}"}).encode('utf-8')
+            request = urllib.request.Request(url.rstrip('/') + '/submit', data=body,
+                                             headers={"Content-Type": "application/json"})
+            try:
+                with urllib.request.urlopen(request, timeout=timeout * 4) as response:
+                    return json.loads(response.read())
+            except urllib.error.HTTPError as e:
+                return {"is_valid": False, "rejected": e.code == 429,
+                        "error_message": f"HTTP {e.code}"}
+        return execute, lambda: None
+
+    raise ValueError(f"Bilinmeyen hedef: {name}")
+
+
+def _is_timeout(result):
+    return "Zaman Aşımı" in (result.get("error_message") or "")
+
+
+def run_load(jobs, execute, rate, concurrency, sample_pid=None, sample_interval=1.0):
+    """
+    İşleri `rate` iş/sn hızında planlar ve en fazla `concurrency` eşzamanlı
+    çağrıyla `execute`'a gönderir. Rapor sözlüğü döndürür.
+    """
+    records = []
+    lock = threading.Lock()
+    interval = 1.0 / rate if rate > 0 else 0.0
+    sampler = RssSampler(sample_pid or os.getpid(), sample_interval).start()
+    started = time.monotonic()
+
+    def one(n, kind, lesson, code, scheduled):
+        try:
+            result = execute(kind, lesson, code, n)
+        except Exception as e:
+            result = {"is_valid": False, "error_message": f"İstemci hatası: {e}", "client_error": True}
+        finished = time.monotonic()
+        with lock:
+            records.append((kind, scheduled, finished, result))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for n, (kind, lesson, code) in enumerate(jobs):
+            scheduled = started + n * interval
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(one, n, kind, lesson, code, scheduled)
+    wall = time.monotonic() - started
+    sampler.stop()
+    return build_report(records, wall, sampler.samples)
+
+
+def build_report(records, wall, rss_samples):
+    by_kind = collections.defaultdict(list)
+    for record in records:
+        by_kind[record[0]].append(record)
+
+    def summarize(items):
+        done = [r for r in items if not r[3].get("rejected") and not r[3].get("client_error")]
+        return {
+            "count": len(items),
+            "passed": sum(1 for r in done if r[3].get("is_valid")),
+            "timeouts": sum(1 for r in done if _is_timeout(r[3])),
+            "limit_hits": sum(1 for r in done if r[3].get("limit_hit")),
+            "rejected": sum(1 for r in items if r[3].get("rejected")),
+            "client_errors": sum(1 for r in items if r[3].get("client_error")),
+            "latency_ms": latency_summary([r[2] - r[1] for r in done]),
+        }
+
+    report = summarize(records)
+    report["wall_sec"] = round(wall, 3)
+    report["throughput_per_sec"] = round(len(records) / wall, 2) if wall > 0 else None
+    report["by_kind"] = {kind: summarize(items) for kind, items in sorted(by_kind.items())}
+    # Solution'lar geçmeli: geçmeyen varsa arka uç hatalı demektir
+    report["solution_failures"] = sum(1 for r in by_kind.get('solution', [])
+                                      if not r[3].get("is_valid") and not r[3].get("rejected"))
+    report["worker_rss"] = {
+        "peak_mb": max((s["rss_mb"] for s in rss_samples), default=None),
+        "peak_workers": max((s["workers"] for s in rss_samples), default=None),
+        "samples": rss_samples,
+    }
+    return report
+
+
+def check_thresholds(report, max_p99_ms=None, min_throughput=None):
+    """Eşik ihlallerinin listesi (CI'da gerileme yakalamak için)."""
+    problems = []
+    p99 = report["latency_ms"]["p99"]
+    if max_p99_ms is not None and p99 is not None and p99 > max_p99_ms:
+        problems.append(f"p99 {p99} ms > {max_p99_ms} ms")
+    if min_throughput is not None and (report["throughput_per_sec"] or 0) < min_throughput:
+        problems.append(f"verim {report['throughput_per_sec']}/s < {min_throughput}/s")
+    if report["solution_failures"]:
+        problems.append(f"{report['solution_failures']} doğru çözüm geçemedi")
+    return problems
+
+
+def main(argv=None):
+    import config
+    parser = argparse.ArgumentParser(description="Sandbox değerlendirme yük testi (JSON rapor)")
+    parser.add_argument("--target", choices=TARGETS, default="pool",
+                        help="pool: SandboxPool, scheduler: FairScheduler+havuz, run_safe: işlem başına, http: --serve")
+    parser.add_argument("--url", help="--target http: servis adresi (ör. http://127.0.0.1:8765)")
+    parser.add_argument("--rate", type=float, default=10.0, help="Hedef gönderim hızı (iş/sn)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test süresi (saniye)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Sandbox işçi sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="En fazla eşzamanlı gönderim (varsayılan: işçi sayısının 4 katı)")
+    parser.add_argument("--mix", default="solution=0.7,broken=0.25,infinite=0.05",
+                        help="Gönderim karışımı")
+    parser.add_argument("--timeout", type=float, default=config.Timing.EXECUTION_TIMEOUT,
+                        help="İş başına zaman aşımı (saniye)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pid", type=int, default=None,
+                        help="RSS'i örneklenecek süreç (varsayılan: bu süreç; http için servis pid'i)")
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--output", help="Raporu dosyaya yaz (varsayılan: stdout)")
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="Aşılırsa çıkış kodu 1")
+    parser.add_argument("--min-throughput", type=float, default=None, help="Altına düşerse çıkış kodu 1")
+    args = parser.parse_args(argv)
+
+    import multiprocessing
+    from curriculum_manager import CurriculumManager
+
+    workers = args.workers or multiprocessing.cpu_count()
+    concurrency = args.concurrency or workers * 4
+    cm = CurriculumManager(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                        'curriculum'))
+    cm.load()
+    jobs = build_jobs(cm.lessons, max(1, int(args.rate * args.duration)),
+                      parse_mix(args.mix), args.seed)
+
+    execute, close = make_target(args.target, workers, args.timeout, args.url)
+    print(f"🚀 {len(jobs)} gönderim, {args.rate}/sn, hedef: {args.target}, işçi: {workers}",
+          file=sys.stderr)
+    try:
+        report = run_load(jobs, execute, args.rate, concurrency, args.pid, args.sample_interval)
+    finally:
+        close()
+
+    report["config"] = {"target": args.target, "rate": args.rate, "duration": args.duration,
+                        "workers": workers, "concurrency": concurrency,
+                        "mix": parse_mix(args.mix), "timeout": args.timeout, "seed": args.seed}
+    problems = check_thresholds(report, args.max_p99_ms, args.min_throughput)
+    report["threshold_failures"] = problems
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for problem in problems:
+        print(f"❌ {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Müfredat Paketleme Aracı
+curriculum/ klasörünü (manifest, görevler, marshal edilmiş doğrulayıcılar,
+çözümler) tek bir indeksli arşive yazar: curriculum.pack
+
+CurriculumManager bu dosya varsa onu mmap ile açar; yoksa klasörü okur.
+Not: Paket, derleyen Python sürümüne bağlı marshal kodu içerir. Başka bir
+sürümde açılırsa doğrulayıcılar paketteki kaynaktan yeniden derlenir.
+"""
+import os
+import sys
+import time
+import argparse
+
+# Proje kökü (curriculum_pack importu için)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from curriculum_pack import write_pack
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="curriculum/ klasörünü tek bir arşive paketler")
+    parser.add_argument("--source", default=os.path.join(os.getcwd(), 'curriculum'),
+                        help="Müfredat klasörü (varsayılan: ./curriculum)")
+    parser.add_argument("--output", default=None,
+                        help="Çıktı dosyası (varsayılan: <source>.pack)")
+    args = parser.parse_args(argv)
+    
+    output = args.output or os.path.normpath(args.source) + '.pack'
+    started = time.perf_counter()
+    try:
+        count = write_pack(args.source, output)
+    except (OSError, ValueError, SyntaxError) as e:
+        print(f"❌ Paketleme başarısız: {e}")
+        return 1
+    
+    size_kb = os.path.getsize(output) / 1024
+    print(f"📦 {count} ders paketlendi → {output} ({size_kb:.1f} KB, {time.perf_counter() - started:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,20 @@ import os
 import json
 import sys
 import re
+import time
+import hashlib
+import argparse
+import multiprocessing
+
+# Proje kökü (curriculum_manager, sandbox importları için)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Son yeşil çalıştırmada geçen derslerin içerik özetleri
+CACHE_FILENAME = '.solvability_cache.json'
+HASHED_FILES = ('task.json', 'solution.py', 'validation.py')
+# Medyanın bu katından yavaş (ve en az MIN_OUTLIER_SEC süren) dersler raporlanır
+OUTLIER_FACTOR = 3.0
+MIN_OUTLIER_SEC = 0.25
 
 def validate_curriculum():
     """Müfredat bütünlüğünü doğrular."""
@@ -113,13 +127,158 @@ def validate_curriculum():
     
     if not has_error and not has_warning:
         print("\n✅ Müfredat Bütünlük Kontrolü BAŞARILI!")
-        sys.exit(0)
+        return 0
     elif has_error:
         print("\n❌ Doğrulama BAŞARISIZ - Hatalar düzeltilmeli.")
-        sys.exit(1)
+        return 1
     else:
         print("\n⚠️  Doğrulama UYARILARLA tamamlandı.")
-        sys.exit(0)
+        return 0
+
+
+def lesson_fingerprint(lesson_dir):
+    """task.json + solution.py + validation.py içeriklerinin SHA-256 özeti."""
+    digest = hashlib.sha256()
+    for name in HASHED_FILES:
+        digest.update(name.encode('utf-8') + b'\0')
+        try:
+            with open(os.path.join(lesson_dir, name), 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b'<missing>')
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(path, cache):
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=4, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️  Önbellek yazılamadı: {e}")
+
+
+def find_outliers(timings):
+    """(süre, slug) listesinden medyana göre aşırı yavaş olanları döndürür."""
+    if not timings:
+        return []
+    durations = sorted(t for t, _ in timings)
+    median = durations[len(durations) // 2]
+    threshold = max(median * OUTLIER_FACTOR, MIN_OUTLIER_SEC)
+    return sorted((item for item in timings if item[0] > threshold), reverse=True)
+
+
+def check_solvability(jobs=None, timeout=2.0, use_cache=True):
+    """
+    Tüm çözümleri doğrulayıcılarına karşı paralel olarak çalıştırır.
+    
+    Son yeşil çalıştırmadan beri dosyaları değişmeyen dersler atlanır.
+    """
+    from curriculum_manager import CurriculumManager
+    from sandbox.pool import SandboxPool
+    
+    base_dir = os.path.join(os.getcwd(), 'curriculum')
+    cache_path = os.path.join(os.getcwd(), CACHE_FILENAME)
+    cache = load_cache(cache_path) if use_cache else {}
+    
+    # Her zaman klasörden: paket, diskteki dosyalardan eski olabilir
+    cm = CurriculumManager(base_dir, use_pack=False)
+    cm.load()
+    
+    print(f"🧪 Çözülebilirlik kontrolü: {cm.get_total_lessons()} ders")
+    print("=" * 60)
+    
+    started = time.perf_counter()
+    pending = []
+    skipped = 0
+    for lesson in cm.lessons:
+        key = os.path.relpath(lesson.dir_path, base_dir).replace(os.sep, '/')
+        fingerprint = lesson_fingerprint(lesson.dir_path)
+        if cache.get(key) == fingerprint:
+            skipped += 1
+            continue
+        pending.append((key, fingerprint, lesson))
+    
+    failed = []
+    timings = []
+    new_cache = dict(cache)
+    
+    if pending:
+        runnable = []
+        for key, fingerprint, lesson in pending:
+            new_cache.pop(key, None)
+            if not lesson.solution_code:
+                failed.append((key, "Eksik ya da boş solution.py"))
+                continue
+            runnable.append(((key, fingerprint), lesson.solution_code, lesson.validator_script))
+        
+        if runnable:
+            # Tek ders değiştiyse tek işlem: havuz çekirdek sayısı kadar işlemi boşuna başlatmaz
+            size = min(jobs or multiprocessing.cpu_count(), len(runnable))
+            with SandboxPool(size=size, timeout=timeout) as pool:
+                for (key, fingerprint), result in pool.imap_unordered(runnable):
+                    timings.append((result['elapsed'], key))
+                    if result['is_valid']:
+                        new_cache[key] = fingerprint
+                    else:
+                        failed.append((key, result.get('error_message')))
+    
+    # Silinmiş derslerin kayıtlarını temizle
+    live_keys = {os.path.relpath(l.dir_path, base_dir).replace(os.sep, '/') for l in cm.lessons}
+    new_cache = {k: v for k, v in new_cache.items() if k in live_keys}
+    if use_cache:
+        save_cache(cache_path, new_cache)
+    
+    for key, error in sorted(failed):
+        print(f"❌ {key}: {error}")
+    
+    outliers = find_outliers(timings)
+    if outliers:
+        print("\n🐢 Yavaş dersler:")
+        for duration, key in outliers[:10]:
+            print(f"   {duration:6.2f}s  {key}")
+    
+    elapsed = time.perf_counter() - started
+    print("=" * 60)
+    print(f"📊 Özet: {len(pending)} ders çalıştırıldı, {skipped} ders önbellekten atlandı ({elapsed:.2f}s)")
+    
+    if failed:
+        print(f"\n❌ {len(failed)} ders çözümü doğrulamayı GEÇEMEDİ.")
+        return 1
+    print("\n✅ Tüm çözümler doğrulamayı geçti!")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Müfredat bütünlüğünü (ve isteğe bağlı çözülebilirliği) doğrular")
+    parser.add_argument("--solvability", action="store_true",
+                        help="Tüm solution.py dosyalarını validation.py'ye karşı sandbox'ta çalıştır")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Paralel sandbox işlemi sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--timeout", type=float, default=2.0,
+                        help="Ders başına zaman aşımı (saniye)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Önbelleği yok say, tüm dersleri çalıştır")
+    args = parser.parse_args(argv)
+    
+    status = validate_curriculum()
+    if args.solvability:
+        print()
+        status = max(status, check_solvability(jobs=args.jobs, timeout=args.timeout,
+                                               use_cache=not args.no_cache))
+    return status
+
 
 if __name__ == "__main__":
-    validate_curriculum()
+    sys.exit(main())
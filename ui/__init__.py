@@ -4,15 +4,22 @@ UI Paketi - Terminal arayüz bileşenleri.
 """
 from ui.editor import Editor, run_editor_session
 from ui.renderer import EditorRenderer
+from ui.frame import FrameCanvas
+from ui.text_buffer import TextBuffer
+from ui.viewport import Viewport
 from ui.footer import FooterState, FooterRenderer
 from ui.colors import init_colors, reset_colors
 from ui.utils import suspend_curses, OSUtils
 from ui.dev_message import show_developer_message, DeveloperMessageScreen
+from ui.search_palette import show_lesson_search, LessonSearchPalette
 
 __all__ = [
     'Editor',
     'run_editor_session',
     'EditorRenderer',
+    'FrameCanvas',
+    'TextBuffer',
+    'Viewport',
     'FooterState',
     'FooterRenderer',
     'init_colors',
@@ -21,4 +28,6 @@ __all__ = [
     'OSUtils',
     'show_developer_message',
     'DeveloperMessageScreen',
+    'show_lesson_search',
+    'LessonSearchPalette',
 ]
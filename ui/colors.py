@@ -9,6 +9,13 @@ import config
 
 _initialized = False
 
+# Token tipi -> curses attr tablosu (init_colors içinde bir kez kurulur)
+_token_attrs = {}
+
+# f-string içindeki süslü parantezler ve {} içindeki ifade için tablo anahtarları
+FSTRING_BRACE = "FSTRING_BRACE"
+FSTRING_EXPR = "FSTRING_EXPR"
+
 
 def init_colors():
     """
@@ -27,6 +34,7 @@ def init_colors():
         return
     
     if not curses.has_colors():
+        _build_token_attrs()
         _initialized = True  # Even without colors, mark as initialized
         return
     
@@ -43,12 +51,44 @@ def init_colors():
     curses.init_pair(config.Colors.GREEN, curses.COLOR_GREEN, -1)   # String
     curses.init_pair(config.Colors.BLUE, curses.COLOR_BLUE, -1)     # Number
     
+    _build_token_attrs()
     _initialized = True
 
 
+def _build_token_attrs():
+    """Syntax highlighting için token tipi -> attr tablosunu kurar."""
+    from tokenizer import TokenType
+    _token_attrs.clear()
+    _token_attrs.update({
+        TokenType.TEXT: curses.A_NORMAL,
+        TokenType.OP: curses.A_NORMAL,
+        TokenType.KEYWORD: curses.color_pair(config.Colors.MAGENTA) | curses.A_BOLD,
+        TokenType.BUILTIN: curses.color_pair(config.Colors.CYAN),
+        TokenType.STRING: curses.color_pair(config.Colors.GREEN),
+        TokenType.NUMBER: curses.color_pair(config.Colors.BLUE),
+        TokenType.COMMENT: curses.A_DIM,
+        TokenType.FUNCTION_DEF: curses.color_pair(config.Colors.CYAN) | curses.A_BOLD,
+        TokenType.CLASS_DEF: curses.color_pair(config.Colors.CYAN) | curses.A_BOLD,
+        FSTRING_BRACE: curses.color_pair(config.Colors.YELLOW) | curses.A_BOLD,
+        FSTRING_EXPR: curses.A_NORMAL,
+    })
+
+
+def get_token_attrs():
+    """
+    Token tipi -> attr tablosunu döndürür.
+    
+    init_colors() çağrılmadıysa (ör. testlerde) tablo ilk kullanımda kurulur.
+    """
+    if not _token_attrs:
+        _build_token_attrs()
+    return _token_attrs
+
+
 def reset_colors():
     """
     Renk durumunu sıfırlar (test amaçlı).
     """
     global _initialized
     _initialized = False
+    _token_attrs.clear()
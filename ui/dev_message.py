@@ -7,6 +7,7 @@ Ciddi, sinematik, statik tasarım.
 import os
 import curses
 import textwrap
+import functools
 import config
 from ui.colors import init_colors
 
@@ -23,6 +24,38 @@ def load_developer_message():
         return f"Mesaj yüklenirken hata: {e}"
 
 
+@functools.lru_cache(maxsize=8)
+def wrap_message(text, content_width):
+    """Mesajı satırlara böler; (metin, genişlik) başına bir kez hesaplanır."""
+    wrapped_lines = []
+    for raw_line in text.split('\n'):
+        raw_line = raw_line.rstrip()
+        if raw_line == '':
+            wrapped_lines.append('')
+        else:
+            sub_lines = textwrap.wrap(raw_line, width=content_width,
+                                      break_long_words=False,
+                                      break_on_hyphens=False)
+            if not sub_lines:
+                wrapped_lines.append('')
+            else:
+                wrapped_lines.extend(sub_lines)
+    return tuple(wrapped_lines)
+
+
+@functools.lru_cache(maxsize=1024)
+def line_runs(line):
+    """Satırı (metin, vurgulu mu) parçalarına ayırır: @brkeyp vurgulu, geri kalanı düz."""
+    tag = '@brkeyp'
+    runs = []
+    parts = line.split(tag)
+    for i, part in enumerate(parts):
+        runs.append((part, False))
+        if i < len(parts) - 1:
+            runs.append((tag, True))
+    return tuple(runs)
+
+
 class DeveloperMessageScreen:
     """Geliştirici mesajı ekranı — ciddi, statik tasarım."""
     
@@ -65,42 +98,22 @@ class DeveloperMessageScreen:
     
     def prepare_lines(self, content_width):
         """Mesajı terminale sığacak şekilde satırlara ayırır."""
-        wrapped_lines = []
-        for raw_line in self.raw_message.split('\n'):
-            raw_line = raw_line.rstrip()
-            if raw_line == '':
-                wrapped_lines.append('')
-            else:
-                sub_lines = textwrap.wrap(raw_line, width=content_width,
-                                          break_long_words=False,
-                                          break_on_hyphens=False)
-                if not sub_lines:
-                    wrapped_lines.append('')
-                else:
-                    wrapped_lines.extend(sub_lines)
-        return wrapped_lines
+        return list(wrap_message(self.raw_message, content_width))
     
     def render_line(self, y, x, line, content_width):
         """Beyaz metin, @brkeyp cyan vurgulu."""
         if not line:
             return
+        plain = curses.color_pair(config.Colors.WHITE)
+        tagged = curses.color_pair(config.Colors.CYAN) | curses.A_BOLD
+        col = x
         try:
-            if '@brkeyp' in line:
-                parts = line.split('@brkeyp')
-                col = x
-                for i, part in enumerate(parts):
-                    if col < x + content_width:
-                        self.stdscr.addstr(y, col, part[:x + content_width - col],
-                                           curses.color_pair(config.Colors.WHITE))
-                        col += len(part)
-                    if i < len(parts) - 1 and col < x + content_width:
-                        tag = '@brkeyp'
-                        self.stdscr.addstr(y, col, tag[:x + content_width - col],
-                                           curses.color_pair(config.Colors.CYAN) | curses.A_BOLD)
-                        col += len(tag)
-            else:
-                self.stdscr.addstr(y, x, line[:content_width],
-                                   curses.color_pair(config.Colors.WHITE))
+            for text, is_tag in line_runs(line):
+                if col >= x + content_width:
+                    break
+                if text:
+                    self.stdscr.addstr(y, col, text[:x + content_width - col], tagged if is_tag else plain)
+                    col += len(text)
         except curses.error:
             pass
     
@@ -26,6 +26,8 @@ from ui.utils import OSUtils
 from ui.footer import FooterState
 from ui.renderer import EditorRenderer
 from ui.colors import init_colors
+from ui.timers import TimerHeap
+from ui.text_buffer import TextBuffer
 from input.api import EventType, InputEvent
 from input.curses_driver import CursesInputDriver
 
@@ -34,9 +36,18 @@ class Editor:
     """Curses Tabanlı Çok Satırlı Terminal Editörü"""
     
     def __init__(self, stdscr, task_info="", hint_text="", initial_code="", 
-                 task_status="pending", completed_count=0, skipped_count=0, has_skipped=False):
+                 task_status="pending", completed_count=0, skipped_count=0, has_skipped=False,
+                 reload_check=None, history_recall=None):
         self.stdscr = stdscr
         
+        # F2: history_recall(depth) -> depth'inci en son gönderim ya da None
+        self.history_recall = history_recall
+        self.recall_depth = 0
+        
+        # Hot-reload (ders yazarları için): güncel ActionRenderEditor ya da None döndürür
+        self.reload_check = reload_check
+        self.next_reload_check = time.time() + config.Dev.RELOAD_POLL_SEC
+        
         # Görev durumu ve sayaçlar
         self.task_status = task_status
         self.is_locked = (task_status == "completed")
@@ -46,12 +57,12 @@ class Editor:
         
         # Buffer'ı initial_code ile doldur (varsa)
         if initial_code and initial_code.strip():
-            self.buffer = initial_code.split('\n')
+            self.buffer = TextBuffer(initial_code)
             # Cursor'ı kodun sonuna konumlandır
             self.cy = len(self.buffer) - 1
             self.cx = len(self.buffer[self.cy])
         else:
-            self.buffer = [""]  # Satırlar
+            self.buffer = TextBuffer()  # Satırlar
             self.cy = 0  # Cursor Y (Satır)
             self.cx = 0  # Cursor X (Sütun)
         
@@ -93,43 +104,86 @@ class Editor:
         # Pass the lock to ensure input thread and main thread don't collision on stdscr
         self.driver = CursesInputDriver(stdscr, lock=self.lock)
         self.vao_step = 0
+        
+        # Mesaj/VAO/hot-reload/resize zamanlayıcıları (döngü en yakınına kadar bekler)
+        self.timers = TimerHeap()
+
 
 
+    @property
+    def buffer(self):
+        """Editördeki kod (TextBuffer; satır listesi gibi okunur)."""
+        return self._buffer
+
+    @buffer.setter
+    def buffer(self, lines):
+        # Satır listesi ya da metin verilirse TextBuffer'a çevrilir
+        if not isinstance(lines, TextBuffer):
+            lines = TextBuffer(lines if isinstance(lines, str) else "\n".join(lines))
+        self._buffer = lines
+
+    def _sync_timers(self):
+        """Editör durumundan türeyen zamanlayıcıları günceller."""
+        timers = self.timers
+        if self.message and self.message_timestamp:
+            timers.schedule('message', self.message_timestamp + config.Timing.MSG_AUTOCLEAR_SEC)
+        else:
+            timers.cancel('message')
+        
+        if self.footer_state.vao_expire > 0:
+            timers.schedule('vao', self.footer_state.vao_expire)
+        else:
+            timers.cancel('vao')
+        
+        if self.reload_check:
+            timers.schedule('reload', self.next_reload_check)
+
+    def _on_timer(self, name, now):
+        """Zamanı gelen zamanlayıcıyı işler. Yeniden çizim gerekiyorsa True döner."""
+        if name == 'message':
+            # Message Autoclear
+            if self.message and self.message_timestamp and \
+                    now - self.message_timestamp >= config.Timing.MSG_AUTOCLEAR_SEC:
+                self.message = ""
+                self.message_timestamp = None
+                return True
+        elif name == 'vao':
+            # VAO Expiration
+            self.footer_state.check_expired()
+            if self.footer_state.vao_progress == 0:
+                self.vao_step = 0
+                return True
+        elif name == 'reload':
+            # Hot-reload: görev metnini güncelle, buffer'a dokunma
+            self.next_reload_check = now + config.Dev.RELOAD_POLL_SEC
+            return self._apply_reload(self.reload_check())
+        elif name == 'resize':
+            # Boyutlandırma durdu: terminal içeriği bozulmuş olabilir, tamamen çiz
+            self.renderer.invalidate()
+            return True
+        return False
 
     def run(self):
         """Editörü başlatır ve kodu döndürür."""
         should_redraw = True
         
         while True:
-            # 1. Timer Logic (Message & VAO)
-            current_time = time.time()
-            
-            # Message Autoclear
-            if self.message and self.message_timestamp:
-                if current_time - self.message_timestamp > config.Timing.MSG_AUTOCLEAR_SEC:
-                    self.message = ""
-                    self.message_timestamp = None
+            # 1. Timers (Message, VAO, Hot-reload, Resize)
+            self._sync_timers()
+            for name in self.timers.pop_due(time.time()):
+                if self._on_timer(name, time.time()):
                     should_redraw = True
-
-            # VAO Expiration
-            if self.footer_state.vao_expire > 0:
-                 self.footer_state.check_expired()
-                 if self.footer_state.vao_progress == 0:
-                     self.vao_step = 0
-                     should_redraw = True
             
             # 2. Draw
             if should_redraw:
                 with self.lock:
                     self.renderer.refresh_screen()
                 should_redraw = False
-                
-            # 3. Input Timeout / Animations Update
-            has_active_timer = (self.message is not None and self.message != "") or \
-                               (self.footer_state.vao_progress > 0)
             
-            # Fixed 30 FPS update rate (approx 33ms) to allow background tasks/animations
-            timeout = 33
+            # 3. Bir sonraki girdiye ya da en yakın zamanlayıcıya kadar bekle
+            # (zamanlayıcı yoksa süresiz; boşta CPU harcanmaz)
+            self._sync_timers()
+            timeout = self.timers.timeout_ms(time.time())
             
             # 4. Get Event
             event = self.driver.get_event(timeout)
@@ -169,6 +223,10 @@ class Editor:
                 should_redraw = True
                 continue
                 
+            # Yazma/silme dışındaki her olay geri alma grubunu kapatır
+            if event.type not in (EventType.CHAR, EventType.BACKSPACE, EventType.DELETE, EventType.TAB):
+                self.buffer.break_group()
+                
             # --- EVENT HANDLING ---
             if event.type == EventType.EXIT:
                 raise KeyboardInterrupt
@@ -182,14 +240,34 @@ class Editor:
                  return "NEXT_TASK"
 
             elif event.type == EventType.RESIZE:
-                 # Curses should have updated lines/cols by now if handled in driver
-                 should_redraw = True
+                 # Pencere sürüklenirken art arda gelen resize'lar tek çizimde birleşir:
+                 # her olay zamanlayıcıyı öteler, çizim boyut durulunca yapılır.
+                 self.timers.schedule('resize', time.time() + config.Timing.RESIZE_SETTLE_SEC)
+                 should_redraw = False
                  continue
 
             elif event.type == EventType.SHOW_HINT:
                  self.footer_state.show_hint = not self.footer_state.show_hint
                  continue
 
+            elif event.type == EventType.SEARCH:
+                 self.footer_state.reset_vao()
+                 return "LESSON_SEARCH"
+
+            elif event.type == EventType.RECALL_PREVIOUS:
+                if self.is_locked:
+                    self.message = config.UI.MSG_TASK_COMPLETED
+                elif self.history_recall:
+                    self._recall_previous()
+                self.message_timestamp = time.time()
+
+            elif event.type in (EventType.UNDO, EventType.REDO):
+                if self.is_locked:
+                    self.message = config.UI.MSG_TASK_COMPLETED
+                    self.message_timestamp = time.time()
+                else:
+                    self._handle_undo(redo=(event.type == EventType.REDO))
+
             # --- NAVIGATION ---
             elif event.type == EventType.UP:
                 if self.cy > 0:
@@ -249,7 +327,7 @@ class Editor:
                         conf_event = self.driver.get_event(config.Timing.TIMEOUT_BLOCKING)
                         if conf_event.type == EventType.CHAR and conf_event.value and conf_event.value.lower() == 'e':
                             return "RESET_ALL"
-                        elif conf_event.type in (EventType.CHAR, EventType.ESCAPE, EventType.ENTER, EventType.UP, EventType.DOWN, EventType.LEFT, EventType.RIGHT):
+                        elif conf_event.type in (EventType.CHAR, EventType.PASTE, EventType.ESCAPE, EventType.ENTER, EventType.UP, EventType.DOWN, EventType.LEFT, EventType.RIGHT):
                             self.message = ""
                             should_redraw = True
                             break
@@ -269,7 +347,7 @@ class Editor:
                         if is_buffer_empty:
                             return None 
                         else:
-                            return "\n".join(self.buffer)
+                            return self.buffer.get_text()
                     else:
                         self._handle_newline()
                 else: # pending
@@ -278,7 +356,7 @@ class Editor:
                         if is_buffer_empty:
                             return None 
                         else:
-                            return "\n".join(self.buffer)
+                            return self.buffer.get_text()
                     else:
                         self._handle_newline()
 
@@ -290,6 +368,15 @@ class Editor:
                 else:
                     self._handle_tab()
 
+            # --- PASTE ---
+            # Yapıştırılan metnin tamamı tek seferde eklenir, ardından tek çizim yapılır
+            elif event.type == EventType.PASTE:
+                if self.is_locked:
+                    self.message = config.UI.MSG_TASK_COMPLETED
+                    self.message_timestamp = time.time()
+                else:
+                    self._handle_paste(event.value or "")
+
             # --- CHAR INPUT ---
             elif event.type == EventType.CHAR:
                 if self.is_locked:
@@ -322,15 +409,45 @@ class Editor:
                     if char in ('"', "'") and right_char not in ('', ' ', ')', ']', '}', ':', ','):
                         pass # Sadece tekli ekle
                     else:
-                        self.buffer[self.cy] = line[:self.cx] + char + closing_char + right_char + line[self.cx+1:] if self.cx < len(line) else line[:self.cx] + char + closing_char
+                        self.buffer.insert(self.cy, self.cx, char + closing_char)
                         self.cx += 1
                         continue
                 
-                self.buffer[self.cy] = line[:self.cx] + char + line[self.cx:]
+                self.buffer.insert(self.cy, self.cx, char)
                 self.cx += 1
 
 
 
+    def _recall_previous(self):
+        """Buffer'ı bir önceki gönderimle değiştirir; her basışta bir adım geriye gider."""
+        current = self.buffer.get_text()
+        depth = self.recall_depth
+        while True:
+            depth += 1
+            code = self.history_recall(depth)
+            if code is None:
+                self.message = config.UI.MSG_RECALL_NONE
+                return
+            if code != current:
+                break
+        
+        self.recall_depth = depth
+        self.buffer.set_text(code)  # Ctrl+Z ile geri alınabilir
+        self.cy = len(self.buffer) - 1
+        self.cx = len(self.buffer[self.cy])
+        self.waiting_for_submit = False
+        self.message = config.UI.MSG_RECALL_LOADED.format(depth=depth)
+
+    def _apply_reload(self, action):
+        """Yeniden yüklenen dersin metinlerini editöre uygular."""
+        if action is None:
+            return False
+        self.task_info = action.task_info
+        self.hint_text = action.hint_text
+        self.message = config.UI.MSG_LESSON_RELOADED
+        self.message_timestamp = time.time()
+        return True
+
     def _handle_backspace(self):
         self.waiting_for_submit = False
         self.message = ""
@@ -344,51 +461,73 @@ class Editor:
             if len(left_part) > 0 and len(right_part) > 0:
                 pair = left_part[-1] + right_part[0]
                 if pair in ('()', '[]', '{}', '""', "''"):
-                    self.buffer[self.cy] = left_part[:-1] + right_part[1:]
+                    self.buffer.delete(self.cy, self.cx - 1, 2)
                     self.cx -= 1
                     return
             
             # Smart Backspace Logic
             if left_part.isspace() and len(left_part) > 0:
                 spaces_to_delete = (self.cx % 4) or 4
-                self.buffer[self.cy] = line[:self.cx - spaces_to_delete] + right_part
+                self.buffer.delete(self.cy, self.cx - spaces_to_delete, spaces_to_delete)
                 self.cx -= spaces_to_delete
             else:
-                self.buffer[self.cy] = left_part[:-1] + right_part
+                self.buffer.delete(self.cy, self.cx - 1, 1)
                 self.cx -= 1
         elif self.cy > 0:
-            current_line = self.buffer.pop(self.cy)
+            # Önceki satırın sonundaki satır sonunu sil (satırlar birleşir)
             prev_line_len = len(self.buffer[self.cy-1])
-            self.buffer[self.cy-1] += current_line
+            self.buffer.delete(self.cy - 1, prev_line_len, 1)
             self.cy -= 1
             self.cx = prev_line_len
 
+    def _handle_undo(self, redo=False):
+        """Son değişiklik grubunu geri alır (redo=True: yineler), imleci oraya taşır."""
+        self.waiting_for_submit = False
+        self.message = ""
+        
+        position = self.buffer.redo() if redo else self.buffer.undo()
+        if position is None:
+            self.message = config.UI.MSG_NOTHING_TO_REDO if redo else config.UI.MSG_NOTHING_TO_UNDO
+            self.message_timestamp = time.time()
+            return
+        self.cy, self.cx = position
+
+    def _handle_paste(self, text):
+        """
+        Yapıştırılan metni imleç konumuna olduğu gibi ekler.
+        Otomatik girinti ve parantez kapatma uygulanmaz: metin zaten girintili gelir.
+        """
+        self.waiting_for_submit = False
+        self.message = ""
+        
+        text = text.replace('\t', '    ')
+        text = "".join(ch for ch in text if ch == '\n' or ord(ch) >= 32)
+        if not text:
+            return
+        
+        self.cy, self.cx = self.buffer.insert(self.cy, self.cx, text)
+        self.buffer.break_group()
+
     def _handle_tab(self):
         self.waiting_for_submit = False
         self.message = ""
         
-        line = self.buffer[self.cy]
         spaces_to_add = 4 - (self.cx % 4)
         indent_str = " " * spaces_to_add
         
-        self.buffer[self.cy] = line[:self.cx] + indent_str + line[self.cx:]
+        self.buffer.insert(self.cy, self.cx, indent_str)
         self.cx += spaces_to_add
 
     def _handle_delete(self):
         self.waiting_for_submit = False
         self.message = ""
         
-        if self.cx < len(self.buffer[self.cy]):
-            line = self.buffer[self.cy]
-            self.buffer[self.cy] = line[:self.cx] + line[self.cx+1:]
-        elif self.cy < len(self.buffer) - 1:
-            next_line = self.buffer.pop(self.cy + 1)
-            self.buffer[self.cy] += next_line
+        # Satır sonundaysa sonraki satır bu satıra birleşir
+        self.buffer.delete(self.cy, self.cx, 1)
 
     def _handle_newline(self):
         current_line = self.buffer[self.cy]
         left_part = current_line[:self.cx]
-        right_part = current_line[self.cx:]
         
         # Mevcut satırın girintisini bul
         current_indent = ""
@@ -404,11 +543,8 @@ class Editor:
         # Yeni satırın toplam girintisi
         total_indent = current_indent + extra_indent
         
-        self.buffer[self.cy] = left_part
-        self.buffer.insert(self.cy + 1, total_indent + right_part)
-        
-        self.cy += 1
-        self.cx = len(total_indent)
+        self.cy, self.cx = self.buffer.insert(self.cy, self.cx, "\n" + total_indent)
+        self.buffer.break_group()
         
         self.waiting_for_submit = True
         
@@ -424,12 +560,14 @@ class Editor:
 
 
 def run_editor_session(stdscr, task_info="", hint_text="", initial_code="", 
-                       task_status="pending", completed_count=0, skipped_count=0, has_skipped=False):
+                       task_status="pending", completed_count=0, skipped_count=0, has_skipped=False,
+                       reload_check=None, history_recall=None):
     """Mevcut curses penceresi içinde editörü çalıştırır (Wrapper olmadan)."""
     editor = Editor(stdscr, task_info=task_info, hint_text=hint_text, 
                    initial_code=initial_code, task_status=task_status,
                    completed_count=completed_count, skipped_count=skipped_count,
-                   has_skipped=has_skipped)
+                   has_skipped=has_skipped, reload_check=reload_check,
+                   history_recall=history_recall)
     try:
         return editor.run()
     finally:
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Kare (Frame) Modeli
+Ekrana doğrudan yazmak yerine satır satır çizim komutlarını toplar; bir önceki
+kareyle karşılaştırıp yalnızca değişen satırları terminale gönderir.
+"""
+import curses
+
+
+class FrameCanvas:
+    """
+    stdscr yerine geçen çizim yüzeyi.
+
+    addstr çağrıları satır bazında (x, metin, attr) listesi olarak kaydedilir.
+    present() her satırın listesini önceki kareyle karşılaştırır: aynı kalan
+    satırlara dokunulmaz, değişen satırlar temizlenip aynı sırayla yeniden
+    yazılır. Yalnızca imleç hareket ettiyse terminale sadece imleç gider.
+    """
+
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+        self._rows = {}       # Çizilmekte olan kare: satır -> [(x, metin, attr), ...]
+        self._shown = None    # Ekrandaki kare (None: tamamı yeniden çizilecek)
+        self._size = None
+        self.cursor = None
+        self.repainted_rows = 0
+
+    def getmaxyx(self):
+        return self.stdscr.getmaxyx()
+
+    def begin(self):
+        """Yeni kareye başlar. Terminal boyutu değiştiyse tam çizim ister."""
+        size = self.stdscr.getmaxyx()
+        if size != self._size:
+            self._size = size
+            self._shown = None
+        self._rows = {}
+        self.cursor = None
+        return size
+
+    def invalidate(self):
+        """Ekran dışarıdan bozulduysa (endwin, başka pencere) sonraki kareyi tam çizdirir."""
+        self._shown = None
+
+    def addstr(self, y, x, text, attr=0):
+        if text:
+            self._rows.setdefault(y, []).append((x, text, attr))
+
+    def move(self, y, x):
+        self.cursor = (y, x)
+
+    def noutrefresh(self):
+        """Uyumluluk için; asıl gönderim present() ile yapılır."""
+
+    def present(self):
+        """Değişen satırları yazar, imleci konumlar ve ekranı günceller."""
+        screen = self.stdscr
+        if self._shown is None:
+            screen.erase()
+            dirty = sorted(self._rows)
+        else:
+            previous = self._shown
+            dirty = sorted(y for y in self._rows.keys() | previous.keys()
+                           if self._rows.get(y) != previous.get(y))
+
+        full = self._shown is None
+        for y in dirty:
+            if not full:
+                try:
+                    screen.move(y, 0)
+                    screen.clrtoeol()
+                except curses.error:
+                    continue
+            for x, text, attr in self._rows.get(y, ()):
+                try:
+                    screen.addstr(y, x, text, attr)
+                except curses.error:
+                    # Sağ alt köşeye yazmak curses.error fırlatır ama metin yazılmıştır
+                    pass
+
+        if self.cursor is not None:
+            try:
+                screen.move(*self.cursor)
+            except curses.error:
+                pass
+
+        self._shown = self._rows
+        self.repainted_rows = len(dirty)
+        screen.noutrefresh()
+        curses.doupdate()
+        return self.repainted_rows
@@ -3,7 +3,9 @@
 Editor Renderer Modülü
 Ekran çizimi ve syntax highlighting işlemleri.
 """
+import re
 import textwrap
+import collections
 import curses
 
 import time
@@ -11,6 +13,15 @@ import os
 import config
 
 from ui.footer import FooterRenderer
+from ui.frame import FrameCanvas
+from ui.viewport import Viewport
+from ui.colors import get_token_attrs, FSTRING_BRACE, FSTRING_EXPR
+
+_FSTRING_BRACES = re.compile(r'([{}])')
+
+# Görev alanının önceden hesaplanmış yerleşimi: rows -> parça listeleri (None: boş satır),
+# hint_rows -> ipucu satırları (ipucu kapalıysa None)
+TaskLayout = collections.namedtuple('TaskLayout', ['rows', 'hint_rows'])
 
 
 class EditorRenderer:
@@ -24,12 +35,29 @@ class EditorRenderer:
         """
         self.stdscr = stdscr
         self.editor = editor
-        self.footer_renderer = FooterRenderer(stdscr, editor.footer_state)
+        # Tüm çizimler önce kare modeline gider; terminale yalnızca değişen satırlar yazılır
+        self.canvas = FrameCanvas(stdscr)
+        # Kod alanının kaydırma durumu (yalnızca görünen satırlar çizilir)
+        self.viewport = Viewport()
+        self.footer_renderer = FooterRenderer(self.canvas, editor.footer_state)
         
         # New Tokenizer
-        from tokenizer import Tokenizer, TokenType, TokenizerState
-        self.tokenizer = Tokenizer()
+        from tokenizer import Tokenizer, RegexTokenizer, TokenType, TokenizerState, HighlightCache
+        # RegexTokenizer isteğe bağlı: satır önbelleğinin arkasında kazancı küçük
+        self.tokenizer = RegexTokenizer() if config.Layout.REGEX_TOKENIZER else Tokenizer()
+        # Satır bazlı token önbelleği (çok satırlı string durumunu da taşır)
+        self.highlighter = HighlightCache(self.tokenizer)
+        self._highlight_buffer = None  # highlighter'ın durumlarını tuttuğu buffer
         self.TokenType = TokenType # Shortcut
+        self.TokenizerState = TokenizerState
+        # Token tipi -> attr tablosu (init_colors'ta bir kez kurulur)
+        self.token_attrs = get_token_attrs()
+        self._run_cache = {}
+        # Görev alanı yerleşim önbelleği (tek kayıt: son anahtar)
+        self._layout_key = None
+        self._layout = None
+        self._celebration_key = None
+        self._celebration_rows = None
     
     def refresh_screen(self):
         """Curses ile ekranı yeniden çizer."""
@@ -41,22 +69,12 @@ class EditorRenderer:
                 editor.message = ""
                 editor.message_timestamp = None
         
-        # Windows'ta cursor flashing sorununu önlemek için:
-        # 1. Cursor'ı çizim sırasında gizle
-        # 2. clear() yerine erase() kullan (cursor pozisyonunu korur)
-        try:
-            curses.curs_set(0)  # Cursor'ı gizle
-        except curses.error:
-            pass
-        
-        self.stdscr.erase()  # clear() yerine erase() - daha az flicker
-        height, width = self.stdscr.getmaxyx()
+        height, width = self.canvas.begin()
         
         # 0. Min Viewport Check
         if height < config.Layout.MIN_HEIGHT or width < config.Layout.MIN_WIDTH:
             self._draw_too_small_warning(height, width)
-            self.stdscr.noutrefresh()
-            curses.doupdate()
+            self._present()
             return
         
         row = 0
@@ -80,8 +98,8 @@ class EditorRenderer:
             # Center title
             start_x = max(0, (width - len(display_title)) // 2)
             try:
-                self.stdscr.addstr(row, 0, " " * (width - 1), curses.A_REVERSE) # Arkaplan şeridi
-                self.stdscr.addstr(row, start_x, display_title, curses.A_REVERSE | curses.A_BOLD)
+                self.canvas.addstr(row, 0, " " * (width - 1), curses.A_REVERSE) # Arkaplan şeridi
+                self.canvas.addstr(row, start_x, display_title, curses.A_REVERSE | curses.A_BOLD)
             except curses.error:
                 pass
             
@@ -91,7 +109,7 @@ class EditorRenderer:
                     # Basit sayaç: "✓10 ✗5"
                     counter_text = f"✓{editor.completed_count} ✗{editor.skipped_count}"
                     if len(counter_text) + start_x + len(display_title) < width - 2:
-                        self.stdscr.addstr(row, width - len(counter_text) - 2, counter_text, curses.A_REVERSE)
+                        self.canvas.addstr(row, width - len(counter_text) - 2, counter_text, curses.A_REVERSE)
                 except curses.error:
                     pass
             
@@ -100,19 +118,19 @@ class EditorRenderer:
         else:
             # Normal Header (3 Satır)
             # 1. Üst Çizgi
-            self.stdscr.addstr(row, 0, header_line[:width-1])
+            self.canvas.addstr(row, 0, header_line[:width-1])
             row += 1
             
             # 2. Başlık Satırı (Temizle + Yaz)
             try:
-                self.stdscr.addstr(row, 0, " " * (width - 1))
+                self.canvas.addstr(row, 0, " " * (width - 1))
             except curses.error:
                 pass
                 
             try:
-                self.stdscr.addstr(row, 0, title[:width-1])
+                self.canvas.addstr(row, 0, title[:width-1])
             except curses.error:
-                self.stdscr.addstr(row, 0, config.System.WINDOW_TITLE_FALLBACK[:width-1])
+                self.canvas.addstr(row, 0, config.System.WINDOW_TITLE_FALLBACK[:width-1])
             
             # Sayaç gösterimi (Normal)
             if editor.completed_count > 0 or editor.skipped_count > 0:
@@ -125,15 +143,15 @@ class EditorRenderer:
                     counter_col = width - total_len - 2
                     
                     if counter_col > len(title) + 5:
-                        self.stdscr.addstr(row, counter_col, completed_text, curses.color_pair(config.Colors.SUCCESS) | curses.A_BOLD)
-                        self.stdscr.addstr(row, counter_col + len(completed_text), separator)
-                        self.stdscr.addstr(row, counter_col + len(completed_text) + len(separator), skipped_text, curses.color_pair(config.Colors.RED) | curses.A_BOLD)
+                        self.canvas.addstr(row, counter_col, completed_text, curses.color_pair(config.Colors.SUCCESS) | curses.A_BOLD)
+                        self.canvas.addstr(row, counter_col + len(completed_text), separator)
+                        self.canvas.addstr(row, counter_col + len(completed_text) + len(separator), skipped_text, curses.color_pair(config.Colors.RED) | curses.A_BOLD)
                 except curses.error:
                     pass
             row += 1
             
             # 3. Alt Çizgi
-            self.stdscr.addstr(row, 0, header_line[:width-1])
+            self.canvas.addstr(row, 0, header_line[:width-1])
             row += 1
         
         # Görev Bilgisi
@@ -141,23 +159,34 @@ class EditorRenderer:
         
         # Buffer çizimi (Kod editörü)
         buffer_start_row = row
-        show_line_numbers = len(editor.buffer) > 2 or (len(editor.buffer) == 2 and len(editor.buffer[1]) > 0)
-        gutter_width = config.Layout.GUTTER_WIDTH if show_line_numbers else 0
+        buffer = editor.buffer
+        line_count = len(buffer)
+        show_line_numbers = line_count > 2 or (line_count == 2 and len(buffer[1]) > 0)
         
-        for i, line in enumerate(editor.buffer):
-            if row >= height - 2:
-                break
-            
-            prefix = ""
+        # Yalnızca ekrana sığan dilim çizilir; imleç her zaman görünür kalır
+        viewport = self.viewport
+        visible_rows = height - 2 - buffer_start_row
+        viewport.follow_line(editor.cy, visible_rows, line_count)
+        visible = viewport.visible_range(visible_rows, line_count)
+        
+        # Satır numarası sütunu görünen en büyük numaraya göre genişler
+        gutter_width = 0
+        if show_line_numbers:
+            gutter_width = max(config.Layout.GUTTER_WIDTH, len(f"Satır {visible.stop}: "))
+        scroll_x = viewport.follow_column(editor.cx, width - 1 - gutter_width)
+        
+        line_states = self.highlighter.update(buffer, *self._buffer_changes(buffer), limit=visible.stop)
+        
+        for i in visible:
             if show_line_numbers:
                 prefix = f"Satır {i+1}: ".ljust(gutter_width)
                 try:
-                    self.stdscr.addstr(row, 0, prefix, curses.A_DIM)
+                    self.canvas.addstr(row, 0, prefix, curses.A_DIM)
                 except curses.error:
                     pass
             
             # Syntax highlighting
-            self._draw_colorized_line(row, gutter_width, line, width)
+            self._draw_colorized_line(row, gutter_width, buffer[i], width, line_states[i], skip=scroll_x)
             row += 1
         
         # Footer - İnteraktif renklendirme ile (Unified)
@@ -165,26 +194,34 @@ class EditorRenderer:
         self.footer_renderer.draw(footer_row, width, editor)
         
         # Cursor pozisyonu
-        cursor_row = buffer_start_row + editor.cy
-        cursor_col = gutter_width + editor.cx
+        cursor_row = buffer_start_row + editor.cy - viewport.scroll_y
+        cursor_col = gutter_width + editor.cx - scroll_x
         
         if cursor_row < height - 1 and cursor_col < width:
+            self.canvas.move(cursor_row, cursor_col)
+        
+        self._present()
+
+    def _present(self):
+        """Kareyi terminale gönderir (yalnızca değişen satırlar + imleç)."""
+        # Windows konsolunda çizim sırasında cursor titriyor; orada gizle.
+        # Unix'te her karede curs_set çağırmak SSH üzerinde fazladan kaçış dizisi demek.
+        if os.name == 'nt':
             try:
-                self.stdscr.move(cursor_row, cursor_col)
+                curses.curs_set(0)
+            except curses.error:
+                pass
+        self.canvas.present()
+        if os.name == 'nt':
+            try:
+                curses.curs_set(1)
             except curses.error:
                 pass
-        
-        # Optimized refresh: noutrefresh + doupdate for less flicker
-        self.stdscr.noutrefresh()
-        curses.doupdate()
-        
-        # Cursor'ı tekrar göster
-        try:
-            curses.curs_set(1)
-        except curses.error:
-            pass
 
-    
+    def invalidate(self):
+        """Ekran curses dışında değiştiyse bir sonraki karenin tamamen çizilmesini sağlar."""
+        self.canvas.invalidate()
+
     def _draw_task_info(self, row, width, height, header_line):
         """Özel içerik mod kontrolü. Celebration modunda özel ekran gösterir."""
         editor = self.editor
@@ -196,16 +233,68 @@ class EditorRenderer:
         if not editor.task_info:
             return row
         
-        raw_lines = editor.task_info.split('\n')
+        layout = self._task_layout(width)
+        limit = height - config.Layout.BOTTOM_MARGIN
+        
+        for segments in layout.rows:
+            if segments is None:
+                # Boş satır
+                row += 1
+                if row >= limit:
+                    break
+                continue
+            if row >= limit:
+                continue
+            self._draw_segments(row, segments)
+            row += 1
+        
+        # İpucu
+        if layout.hint_rows is not None:
+            row += 1
+            for segments in layout.hint_rows:
+                if row >= limit:
+                    break
+                self._draw_segments(row, segments)
+                row += 1
+        
+        self.canvas.addstr(row, 0, header_line[:width-1])
+        row += 1
+        
+        return row
+
+    def _draw_segments(self, row, segments):
+        for col, text, attr in segments:
+            self.canvas.addstr(row, col, text, attr)
+
+    def _task_layout(self, width):
+        """
+        Görev metninin sarılmış ve renklendirilmiş satırlarını döndürür.
+        
+        Sonuç (metin, genişlik, ipucu görünürlüğü) anahtarıyla saklanır; yazarken
+        üst alan için textwrap yeniden çalışmaz, yalnızca boyut veya içerik
+        değişince yeniden hesaplanır.
+        """
+        editor = self.editor
+        hint = editor.hint_text if editor.footer_state.show_hint and editor.hint_text else None
+        key = (editor.task_info, width, hint)
+        if self._layout_key != key:
+            self._layout = TaskLayout(self._layout_task_rows(editor.task_info, width),
+                                      self._layout_hint_rows(hint, width) if hint else None)
+            self._layout_key = key
+        return self._layout
+
+    def _layout_task_rows(self, task_info, width):
+        """Görev metnini satır parçalarına böler. Boş satırlar None ile gösterilir."""
+        header_line = "-" * (width - 1)
+        rows = []
+        raw_lines = task_info.split('\n')
         in_soru_block = False  # SORU içeriğini takip için
         
         for line in raw_lines:
             if not line.strip():
                 # Boş satır - SORU bloğunu bitir
                 in_soru_block = False
-                row += 1
-                if row >= height - config.Layout.BOTTOM_MARGIN:
-                    break
+                rows.append(None)
                 continue
             
             # Renklendirme ve Wrapping hazırlığı
@@ -259,156 +348,178 @@ class EditorRenderer:
                      wrapped = textwrap.wrap(line, width - 1)
 
             for w_line in wrapped:
-                if row >= height - config.Layout.BOTTOM_MARGIN:
-                    break
-                
                 # Renklendirme: BÖLÜM/GÖREV kırmızı etiket + turkuvaz içerik
-                try:
-                    if w_line.startswith(config.UI.LABEL_SECTION):
-                        # "BÖLÜM:" kırmızı, geri kalanı turkuvaz (12 karakter hizalama)
-                        raw_label = config.UI.LABEL_SECTION
+                segments = []
+                if w_line.startswith(config.UI.LABEL_SECTION):
+                    # "BÖLÜM:" kırmızı, geri kalanı turkuvaz (12 karakter hizalama)
+                    raw_label = config.UI.LABEL_SECTION
+                    label = raw_label.ljust(config.Layout.LABEL_WIDTH)
+                    content = w_line[len(raw_label):].lstrip()
+                    segments.append((0, label, curses.color_pair(config.Colors.RED) | curses.A_BOLD))
+                    segments.append((len(label), content[:width-1-len(label)], curses.color_pair(config.Colors.CYAN) | curses.A_BOLD))
+                elif w_line.startswith(config.UI.LABEL_TASK):
+                    # "GÖREV XXX:" kısmını bul, kırmızı yap, gerisini turkuvaz (12 karakter hizalama)
+                    # Damga varsa renklendir: BAŞARILDI=yeşil, ATLANDI=kırmızı
+                    colon_idx = w_line.find(":")
+                    if colon_idx != -1:
+                        raw_label = w_line[:colon_idx+1]
                         label = raw_label.ljust(config.Layout.LABEL_WIDTH)
-                        content = w_line[len(raw_label):].lstrip()
-                        self.stdscr.addstr(row, 0, label, curses.color_pair(config.Colors.RED) | curses.A_BOLD)
-                        self.stdscr.addstr(row, len(label), content[:width-1-len(label)], curses.color_pair(config.Colors.CYAN) | curses.A_BOLD)
-                    elif w_line.startswith(config.UI.LABEL_TASK):
-                        # "GÖREV XXX:" kısmını bul, kırmızı yap, gerisini turkuvaz (12 karakter hizalama)
-                        # Damga varsa renklendir: BAŞARILDI=yeşil, ATLANDI=kırmızı
-                        colon_idx = w_line.find(":")
-                        if colon_idx != -1:
-                            raw_label = w_line[:colon_idx+1]
-                            label = raw_label.ljust(config.Layout.LABEL_WIDTH)
-                            content = w_line[colon_idx+1:].lstrip()
-                            self.stdscr.addstr(row, 0, label, curses.color_pair(config.Colors.RED) | curses.A_BOLD)
-                            
-                            # Damga kontrolü
-                            if config.UI.BADGE_SUCCESS in content:
-                                # İçeriği damgadan ayır
-                                badge_idx = content.find(config.UI.BADGE_SUCCESS)
-                                main_content = content[:badge_idx]
-                                badge = config.UI.BADGE_SUCCESS
-                                self.stdscr.addstr(row, len(label), main_content[:width-1-len(label)], curses.color_pair(config.Colors.CYAN) | curses.A_BOLD)
-                                badge_col = len(label) + len(main_content)
-                                if badge_col + len(badge) < width:
-                                    self.stdscr.addstr(row, badge_col, badge, curses.color_pair(config.Colors.SUCCESS) | curses.A_BOLD)
-                            elif config.UI.BADGE_SKIPPED in content:
-                                # İçeriği damgadan ayır
-                                badge_idx = content.find(config.UI.BADGE_SKIPPED)
-                                main_content = content[:badge_idx]
-                                badge = config.UI.BADGE_SKIPPED
-                                self.stdscr.addstr(row, len(label), main_content[:width-1-len(label)], curses.color_pair(config.Colors.CYAN) | curses.A_BOLD)
-                                badge_col = len(label) + len(main_content)
-                                if badge_col + len(badge) < width:
-                                    self.stdscr.addstr(row, badge_col, badge, curses.color_pair(config.Colors.RED) | curses.A_BOLD)
-                            else:
-                                self.stdscr.addstr(row, len(label), content[:width-1-len(label)], curses.color_pair(config.Colors.CYAN) | curses.A_BOLD)
+                        content = w_line[colon_idx+1:].lstrip()
+                        segments.append((0, label, curses.color_pair(config.Colors.RED) | curses.A_BOLD))
+                        
+                        # Damga kontrolü
+                        badge = None
+                        if config.UI.BADGE_SUCCESS in content:
+                            badge, badge_attr = config.UI.BADGE_SUCCESS, curses.color_pair(config.Colors.SUCCESS) | curses.A_BOLD
+                        elif config.UI.BADGE_SKIPPED in content:
+                            badge, badge_attr = config.UI.BADGE_SKIPPED, curses.color_pair(config.Colors.RED) | curses.A_BOLD
+                        
+                        if badge:
+                            # İçeriği damgadan ayır
+                            main_content = content[:content.find(badge)]
+                            segments.append((len(label), main_content[:width-1-len(label)], curses.color_pair(config.Colors.CYAN) | curses.A_BOLD))
+                            badge_col = len(label) + len(main_content)
+                            if badge_col + len(badge) < width:
+                                segments.append((badge_col, badge, badge_attr))
                         else:
-                            self.stdscr.addstr(row, 0, w_line[:width-1], curses.color_pair(config.Colors.RED) | curses.A_BOLD)
-                    elif w_line.startswith(config.UI.LABEL_QUESTION):
-                        # SORU öncesi separator çizgisi
-                        self.stdscr.addstr(row, 0, header_line[:width-1])
-                        row += 1
-                        if row >= height - config.Layout.BOTTOM_MARGIN:
-                            break
-                        # "SORU:" kırmızı, içerik beyaz (12 karakter hizalama)
-                        raw_label = config.UI.LABEL_QUESTION
-                        label = raw_label.ljust(config.Layout.LABEL_WIDTH)
-                        content = w_line[len(raw_label):].lstrip()
-                        self.stdscr.addstr(row, 0, label, curses.color_pair(config.Colors.RED) | curses.A_BOLD)
-                        self.stdscr.addstr(row, len(label), content[:width-1-len(label)], curses.color_pair(config.Colors.WHITE))
-                        in_soru_block = True
-                    elif in_soru_block:
-                        # SORU devam satırları - beyaz (12 karakter hizalama)
-                        indent = " " * config.Layout.LABEL_WIDTH
-                        self.stdscr.addstr(row, 0, indent + w_line[:width-1-config.Layout.LABEL_WIDTH], curses.color_pair(config.Colors.WHITE))
+                            segments.append((len(label), content[:width-1-len(label)], curses.color_pair(config.Colors.CYAN) | curses.A_BOLD))
                     else:
-                        # Diğer satırlar turkuvaz
-                        self.stdscr.addstr(row, 0, w_line[:width-1], curses.color_pair(config.Colors.CYAN))
-                except curses.error:
-                    pass
-                row += 1
-        
-        # İpucu
-        if editor.footer_state.show_hint and editor.hint_text:
-            row += 1
-            hint_text = f"{config.UI.LABEL_HINT} {editor.hint_text}"
-            wrapped = textwrap.wrap(hint_text, width - 1)
-            for h_line in wrapped:
-                if row >= height - config.Layout.BOTTOM_MARGIN:
-                    break
-                try:
-                    self.stdscr.addstr(row, 0, h_line[:width-1], curses.color_pair(config.Colors.YELLOW))
-                except curses.error:
-                    pass
-                row += 1
-        
-        self.stdscr.addstr(row, 0, header_line[:width-1])
-        row += 1
+                        segments.append((0, w_line[:width-1], curses.color_pair(config.Colors.RED) | curses.A_BOLD))
+                elif w_line.startswith(config.UI.LABEL_QUESTION):
+                    # SORU öncesi separator çizgisi
+                    rows.append([(0, header_line, curses.A_NORMAL)])
+                    # "SORU:" kırmızı, içerik beyaz (12 karakter hizalama)
+                    raw_label = config.UI.LABEL_QUESTION
+                    label = raw_label.ljust(config.Layout.LABEL_WIDTH)
+                    content = w_line[len(raw_label):].lstrip()
+                    segments.append((0, label, curses.color_pair(config.Colors.RED) | curses.A_BOLD))
+                    segments.append((len(label), content[:width-1-len(label)], curses.color_pair(config.Colors.WHITE)))
+                    in_soru_block = True
+                elif in_soru_block:
+                    # SORU devam satırları - beyaz (12 karakter hizalama)
+                    indent = " " * config.Layout.LABEL_WIDTH
+                    segments.append((0, indent + w_line[:width-1-config.Layout.LABEL_WIDTH], curses.color_pair(config.Colors.WHITE)))
+                else:
+                    # Diğer satırlar turkuvaz
+                    segments.append((0, w_line[:width-1], curses.color_pair(config.Colors.CYAN)))
+                rows.append(segments)
         
-        return row
+        return rows
+
+    def _buffer_changes(self, buffer):
+        """
+        Son çizimden beri değişen satırlar (ilk, son, kayma), highlighter için.
+        Buffer değiştiyse ya da değişiklik bildirmiyorsa (düz liste) tümü.
+        """
+        take_changes = getattr(buffer, 'take_changes', None)
+        changes = take_changes() if take_changes else None
+        if buffer is not self._highlight_buffer or take_changes is None:
+            self._highlight_buffer = buffer
+            return 0, None, 0
+        return changes or (None, None, 0)
 
-    def _draw_colorized_line(self, row, col_start, line, max_width):
-        """Syntax highlighting ile satırı çizer (Tokenizer kullanarak)."""
-        # Tokenize line
-        tokens, _ = self.tokenizer.tokenize(line)
+    def _layout_hint_rows(self, hint, width):
+        hint_text = f"{config.UI.LABEL_HINT} {hint}"
+        return [[(0, h_line[:width-1], curses.color_pair(config.Colors.YELLOW))]
+                for h_line in textwrap.wrap(hint_text, width - 1)]
+    
+    def _draw_colorized_line(self, row, col_start, line, max_width, state=None, skip=0):
+        """
+        Syntax highlighting ile satırı çizer (aynı attr'lı token'lar tek addstr).
+        skip: yatay kaydırmada satırın baştan atlanan karakter sayısı.
+        """
+        if state is None:
+            state = self.TokenizerState.ROOT
         
         col = col_start
-        prev_value = ""
-        for token_type, value in tokens:
-            if col >= max_width - 1:
+        limit = max_width - 1
+        for text, attr in self._line_runs(line, state):
+            if col >= limit:
                 break
-            
-            remaining = max_width - 1 - col
-            display_part = value[:remaining]
-            
-            if not display_part:
-                continue
+            if skip:
+                if len(text) <= skip:
+                    skip -= len(text)
+                    continue
+                text, skip = text[skip:], 0
+            display_part = text[:limit - col]
+            self.canvas.addstr(row, col, display_part, attr)
+            col += len(display_part)
 
-            attr = curses.A_NORMAL
-            
-            try:
-                # --- YAMA: F-String ---
-                if token_type == self.TokenType.STRING and prev_value.lower() == 'f':
-                    in_bracket = False
-                    for char in display_part:
-                        if char == '{':
+    def _line_runs(self, line, state):
+        """Satırın (metin, attr) parçalarını döndürür; (satır, durum) başına önbellekli."""
+        key = (line, state)
+        runs = self._run_cache.get(key)
+        if runs is None:
+            if len(self._run_cache) > config.Layout.HIGHLIGHT_CACHE_SIZE:
+                self._run_cache.clear()
+            tokens, _ = self.highlighter.tokens(line, state)
+            runs = self._run_cache[key] = self._build_runs(tokens)
+        return runs
+
+    def _build_runs(self, tokens):
+        """
+        Token akışını ardışık aynı attr'lı parçalara birleştirir.
+        
+        f-string gövdesi süslü parantezlerden bölünür: '{' ve '}' sarı,
+        {} içindeki ifade normal, geri kalanı string rengi.
+        """
+        attrs = self.token_attrs
+        string_type = self.TokenType.STRING
+        runs = []
+        
+        def add(text, attr):
+            if runs and runs[-1][1] == attr:
+                runs[-1] = (runs[-1][0] + text, attr)
+            else:
+                runs.append((text, attr))
+        
+        prev_value = ""
+        fstring_quote = None  # Açık f-string'in tırnağı
+        in_bracket = False
+        for token_type, value in tokens:
+            if token_type == string_type and fstring_quote is not None:
+                if value == fstring_quote:
+                    fstring_quote = None
+                    add(value, attrs[string_type])
+                else:
+                    for part in _FSTRING_BRACES.split(value):
+                        if part == '{':
                             in_bracket = True
-                            self.stdscr.addstr(row, col, char, curses.color_pair(config.Colors.YELLOW) | curses.A_BOLD)
-                        elif char == '}':
+                            add(part, attrs[FSTRING_BRACE])
+                        elif part == '}':
                             in_bracket = False
-                            self.stdscr.addstr(row, col, char, curses.color_pair(config.Colors.YELLOW) | curses.A_BOLD)
-                        else:
-                            c_attr = curses.A_NORMAL if in_bracket else curses.color_pair(config.Colors.GREEN)
-                            self.stdscr.addstr(row, col, char, c_attr)
-                        col += 1
-                    prev_value = value
-                    continue
-                # --- YAMA SONU ---
-                
-                if token_type == self.TokenType.KEYWORD:
-                    attr = curses.color_pair(config.Colors.MAGENTA) | curses.A_BOLD
-                elif token_type == self.TokenType.BUILTIN:
-                    attr = curses.color_pair(config.Colors.CYAN)
-                elif token_type == self.TokenType.STRING:
-                    attr = curses.color_pair(config.Colors.GREEN)
-                elif token_type == self.TokenType.NUMBER:
-                    attr = curses.color_pair(config.Colors.BLUE)
-                elif token_type == self.TokenType.COMMENT:
-                    attr = curses.A_DIM
-                elif token_type == self.TokenType.FUNCTION_DEF or token_type == self.TokenType.CLASS_DEF:
-                     # Make function definitions distinct (e.g. Cyan + Bold or White + Bold)
-                     attr = curses.color_pair(config.Colors.CYAN) | curses.A_BOLD
-                
-                self.stdscr.addstr(row, col, display_part, attr)
-            except curses.error:
-                pass
-            
-            col += len(display_part)
+                            add(part, attrs[FSTRING_BRACE])
+                        elif part:
+                            add(part, attrs[FSTRING_EXPR] if in_bracket else attrs[string_type])
+            else:
+                if token_type == string_type and prev_value.lower() == 'f':
+                    fstring_quote = value
+                    in_bracket = False
+                add(value, attrs.get(token_type, curses.A_NORMAL))
             prev_value = value
+        return runs
     
     def _draw_celebration_screen(self, row, width, height, header_line):
         """Tebrikler ekranını çizer."""
+        for segments in self._celebration_layout(width):
+            if row >= height - config.Layout.BOTTOM_MARGIN:
+                break
+            self._draw_segments(row, segments)
+            row += 1
+        
+        # Separator çizgisi
+        row += 1
+        self.canvas.addstr(row, 0, header_line[:width-1])
+        row += 1
+        
+        return row
+
+    def _celebration_layout(self, width):
+        """Tebrik mesajlarının renklendirilmiş satırları ((atlanan var mı, genişlik) başına saklanır)."""
         editor = self.editor
+        key = (editor.has_skipped, width)
+        if self._celebration_key == key:
+            return self._celebration_rows
         
         # Tebrik mesajları
         messages = [
@@ -426,28 +537,21 @@ class EditorRenderer:
         else:
             messages.append(config.UI.CELEBRATION_PERFECT)
         
+        rows = []
         for msg in messages:
-            if row >= height - config.Layout.BOTTOM_MARGIN:
-                break
-            try:
-                if "TEBRİKLER" in msg:
-                    self.stdscr.addstr(row, 0, msg[:width-1], curses.color_pair(config.Colors.SUCCESS) | curses.A_BOLD)
-                elif "Not:" in msg:
-                    self.stdscr.addstr(row, 0, msg[:width-1], curses.color_pair(config.Colors.YELLOW))
-                elif "Mükemmel" in msg:
-                    self.stdscr.addstr(row, 0, msg[:width-1], curses.color_pair(config.Colors.SUCCESS) | curses.A_BOLD)
-                else:
-                    self.stdscr.addstr(row, 0, msg[:width-1], curses.color_pair(config.Colors.CYAN))
-            except curses.error:
-                pass
-            row += 1
-        
-        # Separator çizgisi
-        row += 1
-        self.stdscr.addstr(row, 0, header_line[:width-1])
-        row += 1
+            if "TEBRİKLER" in msg:
+                attr = curses.color_pair(config.Colors.SUCCESS) | curses.A_BOLD
+            elif "Not:" in msg:
+                attr = curses.color_pair(config.Colors.YELLOW)
+            elif "Mükemmel" in msg:
+                attr = curses.color_pair(config.Colors.SUCCESS) | curses.A_BOLD
+            else:
+                attr = curses.color_pair(config.Colors.CYAN)
+            rows.append([(0, msg[:width-1], attr)])
         
-        return row
+        self._celebration_key = key
+        self._celebration_rows = rows
+        return rows
     
     def _draw_too_small_warning(self, height, width):
         """Ekran çok küçükse uyarı gösterir."""
@@ -461,18 +565,18 @@ class EditorRenderer:
         try:
             if cy >= 0:
                 cx1 = max(0, (width - len(msg1)) // 2)
-                self.stdscr.addstr(cy, cx1, msg1, curses.color_pair(config.Colors.RED) | curses.A_BOLD)
+                self.canvas.addstr(cy, cx1, msg1, curses.color_pair(config.Colors.RED) | curses.A_BOLD)
                 
             if cy + 1 < height:
                 cx2 = max(0, (width - len(msg2)) // 2)
-                self.stdscr.addstr(cy + 1, cx2, msg2, curses.color_pair(config.Colors.YELLOW))
+                self.canvas.addstr(cy + 1, cx2, msg2, curses.color_pair(config.Colors.YELLOW))
 
             if cy + 2 < height:
                 cx3 = max(0, (width - len(msg3)) // 2)
-                self.stdscr.addstr(cy + 2, cx3, msg3, curses.color_pair(config.Colors.YELLOW))
+                self.canvas.addstr(cy + 2, cx3, msg3, curses.color_pair(config.Colors.YELLOW))
                 
             if cy + 4 < height:
                 cx4 = max(0, (width - len(msg4)) // 2)
-                self.stdscr.addstr(cy + 4, cx4, msg4, curses.color_pair(config.Colors.WHITE))
+                self.canvas.addstr(cy + 4, cx4, msg4, curses.color_pair(config.Colors.WHITE))
         except curses.error:
             pass
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Ders Arama Paleti
+Ctrl+P ile açılan "derse git" ekranı. Sonuçlar her tuşta güncellenir.
+"""
+import threading
+import curses
+import config
+from ui.colors import init_colors
+from input.api import EventType
+from input.curses_driver import CursesInputDriver
+
+
+class LessonSearchPalette:
+    """Arama satırı + sonuç listesi."""
+
+    def __init__(self, stdscr, search_index, driver, lock=None):
+        self.stdscr = stdscr
+        self.index = search_index
+        self.driver = driver
+        # Girdi thread'i ile stdscr çakışmasını önlemek için (Editor ile aynı desen)
+        self.lock = lock if lock else threading.Lock()
+        self.query = ""
+        self.selected = 0
+        self.results = []
+
+    def _max_results(self):
+        height, _ = self.stdscr.getmaxyx()
+        return max(1, height - 3)  # prompt + ayraç + footer
+
+    def update_results(self):
+        """Sorguyu indekste çalıştırır ve seçimi sınırlar içinde tutar."""
+        self.results = self.index.search(self.query, limit=self._max_results())
+        self.selected = max(0, min(self.selected, len(self.results) - 1))
+
+    def handle_event(self, event):
+        """
+        Tek bir olayı işler.
+
+        Returns:
+            (bitti_mi, seçilen_uuid)
+        """
+        if event.type == EventType.EXIT:
+            raise KeyboardInterrupt
+        if event.type in (EventType.ESCAPE, EventType.SEARCH):
+            return True, None
+        if event.type == EventType.ENTER:
+            if self.results:
+                return True, self.results[self.selected].uuid
+            return False, None
+
+        if event.type == EventType.UP:
+            self.selected = max(0, self.selected - 1)
+        elif event.type == EventType.DOWN:
+            self.selected = min(len(self.results) - 1, self.selected + 1) if self.results else 0
+        elif event.type == EventType.BACKSPACE:
+            if self.query:
+                self.query = self.query[:-1]
+                self.selected = 0
+                self.update_results()
+        elif event.type == EventType.CHAR and event.value:
+            self.query += event.value
+            self.selected = 0
+            self.update_results()
+        elif event.type == EventType.RESIZE:
+            self.update_results()
+        return False, None
+
+    def draw(self):
+        """Paleti çizer."""
+        height, width = self.stdscr.getmaxyx()
+        self.stdscr.erase()
+
+        prompt = config.UI.SEARCH_PROMPT
+        try:
+            self.stdscr.addstr(0, 0, prompt, curses.color_pair(config.Colors.YELLOW) | curses.A_BOLD)
+            self.stdscr.addstr(0, len(prompt), self.query[:max(0, width - 1 - len(prompt))], curses.A_BOLD)
+            self.stdscr.addstr(1, 0, "-" * (width - 1))
+        except curses.error:
+            pass
+
+        row = 2
+        if not self.results:
+            try:
+                self.stdscr.addstr(row, 0, config.UI.SEARCH_NO_RESULTS[:width - 1], curses.A_DIM)
+            except curses.error:
+                pass
+
+        for i, lesson in enumerate(self.results):
+            if row >= height - 1:
+                break
+            label = f"{config.UI.LABEL_TASK} {lesson.numeric_id:>3}: {lesson.title}"
+            category = f"  · {lesson.category}"
+            attr = curses.A_REVERSE if i == self.selected else curses.color_pair(config.Colors.CYAN)
+            try:
+                self.stdscr.addstr(row, 0, label[:width - 1], attr)
+                if len(label) + len(category) < width - 1:
+                    self.stdscr.addstr(row, len(label), category, curses.A_DIM)
+            except curses.error:
+                pass
+            row += 1
+
+        try:
+            self.stdscr.addstr(height - 1, 0, config.UI.SEARCH_FOOTER[:width - 1], curses.A_DIM)
+            self.stdscr.move(0, min(width - 1, len(prompt) + len(self.query)))
+        except curses.error:
+            pass
+
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def run(self):
+        """Palet döngüsü. Seçilen dersin UUID'sini ya da None döndürür."""
+        self.update_results()
+        while True:
+            with self.lock:
+                self.draw()
+            event = self.driver.get_event(config.Timing.TIMEOUT_BLOCKING)
+            # Hızlı yazımı tek kareye topla: kuyruktaki olayları çizmeden önce işle
+            while event.type != EventType.TIMEOUT:
+                done, lesson_uuid = self.handle_event(event)
+                if done:
+                    return lesson_uuid
+                event = self.driver.get_event(0)
+
+
+def show_lesson_search(stdscr, search_index):
+    """Arama paletini gösterir ve seçilen dersin UUID'sini döndürür."""
+    init_colors()
+    try:
+        curses.curs_set(1)
+    except curses.error:
+        pass
+    stdscr.keypad(True)
+
+    lock = threading.Lock()
+    driver = CursesInputDriver(stdscr, lock=lock)
+    try:
+        return LessonSearchPalette(stdscr, search_index, driver, lock=lock).run()
+    finally:
+        driver.close()
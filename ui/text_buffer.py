@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""
+Metin Tamponu (Piece Table)
+Editörün kodu satır listesi yerine parça tablosunda tutulur: düzenlemeler
+yalnızca parça listesini değiştirir, satırın ya da dosyanın geri kalanı
+kopyalanmaz. Geri al / yinele için düzenlemeler gruplanarak kaydedilir.
+"""
+import bisect
+
+
+def _newline_positions(text):
+    """`text` içindeki '\\n' konumları (artan sırada)."""
+    positions = []
+    i = text.find('\n')
+    while i != -1:
+        positions.append(i)
+        i = text.find('\n', i + 1)
+    return positions
+
+
+class TextBuffer:
+    """
+    Satırlara indeksle erişilen, parça tablosu tabanlı metin modeli.
+
+    Metin değişmez kaynak stringlerden (ilk metin ve her eklenen parça)
+    alınan (kaynak, başlangıç, bitiş) dilimlerinin sırasıdır. Her parçanın
+    içerdiği satır sonu sayısı ve parçalar boyunca birikimli karakter /
+    satır sonu sayıları tutulur; bir satırın başı bu dizilerde bisect ile
+    bulunur. Satır metinleri okunduklarında oluşturulup önbelleğe alınır.
+
+    Liste gibi okunur (len, indeks, dilim, döngü); değişiklikler
+    insert / delete / set_text ile yapılır. take_changes() son çağrıdan beri
+    değişen satır aralığını ve satır kaymasını verir (sözdizimi renklendirme
+    yalnızca bu satırları yeniden işler).
+
+    Geri alma kaydı (konum, silinen, eklenen) üçlülerinden oluşan gruplardır.
+    Aynı yönde ardışık yazım ya da silme tek üçlüde birleşir; break_group()
+    çağrılana ya da düzenleme türü değişene kadar aynı gruba eklenir.
+    """
+
+    # Ardışık yazımda son eklenen kaynak bu uzunluğa kadar uzatılır (yeni parça açılmaz)
+    EXTEND_LIMIT = 256
+    # Parça sayısı bunu aşınca metin tek kaynakta birleştirilir
+    COMPACT_PIECES = 4096
+    # Saklanan en fazla geri alma grubu
+    UNDO_LIMIT = 1000
+
+    def __init__(self, text=""):
+        self._undo = []          # [[(konum, silinen, eklenen), ...], ...]
+        self._redo = []
+        self._group_open = False
+        self._changes = None     # (ilk, son, kayma): take_changes()'e bakın
+        self._load(text)
+
+    # --- Parça tablosu ---
+
+    def _load(self, text):
+        self._sources = [text]                       # değişmez kaynak metinler
+        self._newlines = [_newline_positions(text)]  # kaynak -> satır sonu konumları
+        self._pieces = [self._piece(0, 0, len(text))] if text else []
+        self._len_cum = []     # parça i'nin sonuna kadar karakter sayısı
+        self._nl_cum = []      # parça i'nin sonuna kadar satır sonu sayısı
+        self._dirty_from = 0   # birikimli diziler bu parçadan itibaren geçersiz (None: güncel)
+        self._line_cache = [None] * (len(self._newlines[0]) + 1)
+
+    def _piece(self, source, start, end):
+        newlines = self._newlines[source]
+        count = bisect.bisect_left(newlines, end) - bisect.bisect_left(newlines, start)
+        return (source, start, end, count)
+
+    def _invalidate(self, index):
+        if self._dirty_from is None or index < self._dirty_from:
+            self._dirty_from = index
+
+    def _reindex(self):
+        """Birikimli dizileri değişen parçadan itibaren yeniden hesaplar."""
+        j = self._dirty_from
+        if j is None:
+            return
+        del self._len_cum[j:]
+        del self._nl_cum[j:]
+        total = self._len_cum[-1] if self._len_cum else 0
+        lines = self._nl_cum[-1] if self._nl_cum else 0
+        len_cum, nl_cum = self._len_cum, self._nl_cum
+        for _, start, end, count in self._pieces[j:]:
+            total += end - start
+            lines += count
+            len_cum.append(total)
+            nl_cum.append(lines)
+        self._dirty_from = None
+
+    def _piece_start(self, index):
+        return self._len_cum[index - 1] if index else 0
+
+    def _split(self, offset):
+        """`offset`'te parça sınırı oluşturur; o sınırdan sonraki ilk parçanın indeksini döndürür."""
+        self._reindex()
+        if offset <= 0:
+            return 0
+        j = bisect.bisect_left(self._len_cum, offset)
+        if j == len(self._pieces) or self._len_cum[j] == offset:
+            return j + 1
+        source, start, end, _ = self._pieces[j]
+        cut = start + offset - self._piece_start(j)
+        self._pieces[j:j + 1] = [self._piece(source, start, cut), self._piece(source, cut, end)]
+        self._invalidate(j)
+        return j + 1
+
+    def _extend(self, index, text):
+        """Son eklenen kaynağın sonunda biten parçayı, kaynağı uzatarak büyütür (yeni parça açmaz)."""
+        source, start, end, _ = self._pieces[index]
+        current = self._sources[source]
+        if (source != len(self._sources) - 1 or end != len(current)
+                or len(current) + len(text) > self.EXTEND_LIMIT):
+            return False
+        base = len(current)
+        self._sources[source] = current + text
+        self._newlines[source].extend(base + i for i in _newline_positions(text))
+        self._pieces[index] = self._piece(source, start, end + len(text))
+        self._invalidate(index)
+        return True
+
+    def _insert_at(self, offset, text):
+        self._reindex()
+        if offset and self._pieces:
+            j = bisect.bisect_left(self._len_cum, offset)
+            if j < len(self._pieces) and self._len_cum[j] == offset and self._extend(j, text):
+                return
+        index = self._split(offset)
+        self._sources.append(text)
+        self._newlines.append(_newline_positions(text))
+        self._pieces.insert(index, self._piece(len(self._sources) - 1, 0, len(text)))
+        self._invalidate(index)
+
+    def _remove_at(self, offset, length):
+        first = self._split(offset)
+        last = self._split(offset + length)
+        sources = self._sources
+        removed = "".join(sources[s][a:b] for s, a, b, _ in self._pieces[first:last])
+        del self._pieces[first:last]
+        self._invalidate(first)
+        return removed
+
+    def _compact(self):
+        """Parçaları tek kaynakta birleştirir (satır önbelleği ve geri alma kaydı korunur)."""
+        cache = self._line_cache
+        self._load(self.get_text())
+        self._line_cache = cache
+
+    def _replace(self, offset, length, text, record=True):
+        """[offset, offset+length) aralığını `text` ile değiştirir; silinen metni döndürür."""
+        line = self.position(offset)[0]
+        removed = self._remove_at(offset, length) if length else ""
+        if text:
+            self._insert_at(offset, text)
+        # Yalnızca değişen satırların önbelleği düşer; sonrakiler kayar
+        old_count, new_count = removed.count('\n') + 1, text.count('\n') + 1
+        self._line_cache[line:line + old_count] = [None] * new_count
+        self._note_change(line, old_count, new_count)
+        if record and (removed or text):
+            self._record(offset, removed, text)
+        if len(self._pieces) > self.COMPACT_PIECES:
+            self._compact()
+        return removed
+
+    def _note_change(self, line, old_count, new_count):
+        """[line, line+old_count) satırları new_count satırla değişti; birikmiş aralığa ekler."""
+        delta = new_count - old_count
+        end = line + new_count
+        if self._changes is not None:
+            first, last, total = self._changes
+            # Önceki aralığın sonu bu düzenlemeden sonraysa o da kayar; silinen
+            # satırların içine düşüyorsa yeni satırların sonuna çekilir
+            if last > line + old_count:
+                last += delta
+            elif last > line:
+                last = end
+            line, end, delta = min(first, line), max(last, end), total + delta
+        self._changes = (line, end, delta)
+
+    def take_changes(self):
+        """
+        Son çağrıdan beri değişen satırlar: (ilk, son, kayma) ya da None.
+
+        [ilk, son) aralığı yeni ya da değişmiş satırlardır; son'dan itibaren
+        her i satırı, önceki çağrıdaki i - kayma satırıdır.
+        """
+        changes, self._changes = self._changes, None
+        return changes
+
+    # --- Satır indeksi ---
+
+    def _char_count(self):
+        self._reindex()
+        return self._len_cum[-1] if self._pieces else 0
+
+    def _line_start(self, line):
+        """`line` satırının ilk karakterinin konumu."""
+        if line <= 0:
+            return 0
+        self._reindex()
+        j = bisect.bisect_left(self._nl_cum, line)
+        source, start, _, _ = self._pieces[j]
+        before = self._nl_cum[j - 1] if j else 0
+        newlines = self._newlines[source]
+        pos = newlines[bisect.bisect_left(newlines, start) + line - before - 1]
+        return self._piece_start(j) + pos - start + 1
+
+    def _line_text(self, line):
+        offset = self._line_start(line)
+        pieces, sources = self._pieces, self._sources
+        j = bisect.bisect_right(self._len_cum, offset)
+        if j == len(pieces):
+            return ""
+        cut = pieces[j][1] + offset - self._piece_start(j)
+        parts = []
+        while j < len(pieces):
+            source, _, end, _ = pieces[j]
+            text = sources[source]
+            newline = text.find('\n', cut, end)
+            if newline != -1:
+                parts.append(text[cut:newline])
+                break
+            parts.append(text[cut:end])
+            j += 1
+            if j < len(pieces):
+                cut = pieces[j][1]
+        return "".join(parts)
+
+    def _lines_between(self, start, stop):
+        """[start, stop) satırları: metin tek seferde kesilip bölünür, önbellek doldurulur."""
+        cache = self._line_cache
+        if None not in cache[start:stop]:
+            return cache[start:stop]
+        begin = self._line_start(start)
+        end = self._line_start(stop) - 1 if stop < len(cache) else self._char_count()
+        pieces, sources = self._pieces, self._sources
+        j = bisect.bisect_right(self._len_cum, begin)
+        parts = []
+        pos = self._piece_start(j) if j < len(pieces) else begin
+        while j < len(pieces) and pos < end:
+            source, a, b, _ = pieces[j]
+            lo = a + max(0, begin - pos)
+            hi = b - max(0, pos + (b - a) - end)
+            parts.append(sources[source][lo:hi])
+            pos += b - a
+            j += 1
+        lines = "".join(parts).split('\n')
+        cache[start:stop] = lines
+        return lines
+
+    def offset(self, line, col):
+        """(satır, sütun) -> metin içindeki karakter konumu."""
+        return self._line_start(line) + col
+
+    def position(self, offset):
+        """Karakter konumu -> (satır, sütun)."""
+        self._reindex()
+        j = bisect.bisect_right(self._len_cum, offset)
+        if j >= len(self._pieces):
+            line = len(self._line_cache) - 1
+        else:
+            source, start, _, _ = self._pieces[j]
+            cut = start + offset - self._piece_start(j)
+            newlines = self._newlines[source]
+            line = ((self._nl_cum[j - 1] if j else 0)
+                    + bisect.bisect_left(newlines, cut) - bisect.bisect_left(newlines, start))
+        return line, offset - self._line_start(line)
+
+    # --- Liste gibi okuma ---
+
+    def __len__(self):
+        return len(self._line_cache)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1 and stop - start > 1:
+                return self._lines_between(start, stop)
+            return [self[i] for i in range(start, stop, step)]
+        cache = self._line_cache
+        text = cache[index]
+        if text is None:
+            if index < 0:
+                index += len(cache)
+            text = cache[index] = self._line_text(index)
+        return text
+
+    def __iter__(self):
+        for i in range(len(self._line_cache)):
+            yield self[i]
+
+    def get_text(self):
+        """Tüm metin (satırlar '\\n' ile birleşik)."""
+        sources = self._sources
+        return "".join(sources[s][a:b] for s, a, b, _ in self._pieces)
+
+    # --- Düzenleme ---
+
+    def insert(self, line, col, text):
+        """`text`'i (satır, sütun) konumuna ekler; eklenen metnin sonunu (satır, sütun) döndürür."""
+        if text:
+            self._replace(self.offset(line, col), 0, text)
+        newlines = text.count('\n')
+        if not newlines:
+            return line, col + len(text)
+        return line + newlines, len(text) - text.rfind('\n') - 1
+
+    def delete(self, line, col, length):
+        """(satır, sütun)'dan itibaren `length` karakter siler ('\\n' bir karakter); silineni döndürür."""
+        offset = self.offset(line, col)
+        length = min(length, self._char_count() - offset)
+        if length <= 0:
+            return ""
+        return self._replace(offset, length, "")
+
+    def set_text(self, text):
+        """Tüm metni değiştirir; tek adımda geri alınabilir."""
+        self.break_group()
+        self._replace(0, self._char_count(), text)
+        self.break_group()
+
+    # --- Geri al / Yinele ---
+
+    def break_group(self):
+        """Sonraki düzenleme yeni bir geri alma grubu başlatır."""
+        self._group_open = False
+
+    @staticmethod
+    def _kind(removed, inserted):
+        return 'insert' if not removed else 'delete' if not inserted else 'replace'
+
+    def _record(self, offset, removed, inserted):
+        self._redo.clear()
+        kind = self._kind(removed, inserted)
+        if self._group_open and self._undo:
+            group = self._undo[-1]
+            last_offset, last_removed, last_inserted = group[-1]
+            last_kind = self._kind(last_removed, last_inserted)
+            if kind == last_kind == 'insert' and offset == last_offset + len(last_inserted):
+                group[-1] = (last_offset, "", last_inserted + inserted)
+                return
+            if kind == last_kind == 'delete':
+                if offset + len(removed) == last_offset:   # Backspace
+                    group[-1] = (offset, removed + last_removed, "")
+                    return
+                if offset == last_offset:                  # Delete
+                    group[-1] = (offset, last_removed + removed, "")
+                    return
+            if kind == last_kind != 'replace':
+                group.append((offset, removed, inserted))
+                return
+        self._undo.append([(offset, removed, inserted)])
+        self._group_open = True
+        if len(self._undo) > self.UNDO_LIMIT:
+            del self._undo[0]
+
+    def undo(self):
+        """Son grubu geri alır; imlecin gideceği (satır, sütun) ya da None döndürür."""
+        self._group_open = False
+        if not self._undo:
+            return None
+        group = self._undo.pop()
+        for offset, removed, inserted in reversed(group):
+            self._replace(offset, len(inserted), removed, record=False)
+        self._redo.append(group)
+        return self.position(offset + len(removed))
+
+    def redo(self):
+        """Geri alınan son grubu yeniden uygular; imleç konumunu ya da None döndürür."""
+        self._group_open = False
+        if not self._redo:
+            return None
+        group = self._redo.pop()
+        for offset, removed, inserted in group:
+            self._replace(offset, len(removed), inserted, record=False)
+        self._undo.append(group)
+        return self.position(offset + len(inserted))
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Zamanlayıcı Yığını
+Editör döngüsünün bekleyeceği bir sonraki zamanı (mesaj silinmesi, VAO
+sönmesi, hot-reload kontrolü, yeniden boyutlandırma) tek yerde tutar.
+"""
+import heapq
+import math
+
+
+class TimerHeap:
+    """
+    İsimli, tek seferlik zamanlayıcılar için küçük bir min-heap.
+
+    Aynı isimle yeniden `schedule` çağrısı önceki zamanı geçersiz kılar;
+    eski kayıtlar heap'ten hemen silinmez, sırası gelince atlanır.
+    """
+
+    def __init__(self):
+        self._heap = []        # (zaman, sıra, isim)
+        self._deadlines = {}   # isim -> geçerli zaman
+        self._counter = 0
+
+    def schedule(self, name, deadline):
+        """`name` zamanlayıcısını `deadline` (time.time() cinsinden) anına kurar."""
+        if self._deadlines.get(name) == deadline:
+            return
+        self._deadlines[name] = deadline
+        self._counter += 1
+        heapq.heappush(self._heap, (deadline, self._counter, name))
+
+    def cancel(self, name):
+        self._deadlines.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._deadlines
+
+    def _discard_stale(self):
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def next_deadline(self):
+        """En yakın zaman ya da zamanlayıcı yoksa None."""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now):
+        """Zamanı gelmiş zamanlayıcıların isimlerini (zaman sırasıyla) çıkarır."""
+        due = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, _, name = heapq.heappop(self._heap)
+            del self._deadlines[name]
+            due.append(name)
+
+    def timeout_ms(self, now):
+        """
+        Bir sonraki zamana kadar beklenecek süre (ms).
+        Zamanlayıcı yoksa -1 (girdi gelene kadar bekle).
+        """
+        deadline = self.next_deadline()
+        if deadline is None:
+            return -1
+        return max(0, math.ceil((deadline - now) * 1000))
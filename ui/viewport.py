@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Kod Alanı Görünümü
+Buffer'ın ekrana sığan kısmını (ilk görünen satır ve sütun) tutar ve imleç
+her zaman görünür kalacak şekilde kaydırır.
+"""
+import config
+
+
+class Viewport:
+    """
+    Kod alanının kaydırma durumu.
+
+    scroll_y: ekranın en üstündeki buffer satırı
+    scroll_x: her satırın ekrandaki ilk sütunu (yatay kaydırma)
+
+    Dikeyde imleç kenara geldiğinde satır satır kayar. Yatayda her
+    karakterde kaymamak için imleç kenara değince HSCROLL_STEP sütun
+    ileri atlanır.
+    """
+
+    def __init__(self):
+        self.scroll_y = 0
+        self.scroll_x = 0
+
+    def follow_line(self, cy, rows, line_count):
+        """İmleç satırı `rows` satırlık alanda görünecek şekilde scroll_y'yi ayarlar."""
+        if rows <= 0:
+            return self.scroll_y
+        if cy < self.scroll_y:
+            self.scroll_y = cy
+        elif cy >= self.scroll_y + rows:
+            self.scroll_y = cy - rows + 1
+        # Buffer kısaldıysa altta boş alan bırakma
+        self.scroll_y = max(0, min(self.scroll_y, line_count - rows))
+        return self.scroll_y
+
+    def follow_column(self, cx, cols):
+        """İmleç sütunu `cols` genişliğindeki alanda görünecek şekilde scroll_x'i ayarlar."""
+        if cols <= 0:
+            return self.scroll_x
+        step = min(config.Layout.HSCROLL_STEP, cols - 1)
+        if cx < self.scroll_x:
+            self.scroll_x = max(0, cx - step)
+        elif cx >= self.scroll_x + cols:
+            self.scroll_x = cx - cols + 1 + step
+        return self.scroll_x
+
+    def visible_range(self, rows, line_count):
+        """Çizilecek buffer satırları: range(ilk, son)."""
+        return range(self.scroll_y, min(line_count, self.scroll_y + max(0, rows)))